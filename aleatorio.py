@@ -0,0 +1,104 @@
+import numpy as np
+
+TAMANO_BLOQUE = 1024
+
+
+class FlujoAleatorio:
+    """Flujo reproducible de números al azar con la interfaz del módulo `random`
+
+    Usa un generador Philox de NumPy y sortea los uniformes por bloques: cada llamada
+    consume uno de la lista ya sorteada en lugar de pagar una llamada a NumPy.
+    """
+
+    def __init__(self, semilla_seq, tamano_bloque=TAMANO_BLOQUE):
+        self.generador = np.random.Generator(np.random.Philox(semilla_seq))
+        self.tamano_bloque = tamano_bloque
+        self._bloque = []
+        self._i = 0
+
+    def _rellenar(self):
+        self._bloque = self.generador.random(self.tamano_bloque).tolist()
+        self._i = 0
+
+    def random(self):
+        """Uniforme en [0, 1)"""
+        i = self._i
+        if i == len(self._bloque):
+            self._rellenar()
+            i = 0
+        self._i = i + 1
+        return self._bloque[i]
+
+    def randint(self, a, b):
+        """Entero en [a, b], ambos incluidos"""
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, secuencia):
+        return secuencia[int(self.random() * len(secuencia))]
+
+    def getrandbits(self, k):
+        return int(self.generador.integers(0, 1 << k, dtype=np.uint64))
+
+    # Estado (para guardar y restaurar una simulación)
+    def estado(self):
+        return {
+            "bit_generator": self.generador.bit_generator.state,
+            "bloque": np.array(self._bloque[self._i:], dtype=np.float64),
+        }
+
+    def restaurar(self, estado):
+        self.generador.bit_generator.state = estado["bit_generator"]
+        self._bloque = np.asarray(estado["bloque"], dtype=np.float64).tolist()
+        self._i = 0
+
+
+class FlujosSimulacion:
+    """Flujos independientes derivados de una sola semilla, uno por fuente de azar
+
+    Cada fuente (el mundo inicial, la regeneración, los depredadores, el gato) tiene su
+    propio flujo, así que sortear más en una no corre los números de las otras. Con
+    `semilla=None` la semilla sale de la entropía del sistema.
+
+    Los flujos son por fuente y no por entidad: todos los depredadores (y, con persecucion,
+    las presas) sortean del flujo `depredadores`, así que agregar o quitar uno cambia el
+    paseo de los demás, pero no el gato, la regeneración ni el mundo inicial. Un flujo por
+    objeto obligaría a guardar un generador por ObjetoEntorno en los puntos de control y a
+    darles identidad estable a los que aparecen y se consumen, y Persecucion mueve a todos
+    con un solo sorteo vectorizado. Donde sí hace falta azar por entidad (miles de gatos
+    repartidos entre procesos) paralelo.py usa un generador por contador.
+    """
+
+    NOMBRES = ("entorno", "regeneracion", "depredadores", "gato")
+
+    def __init__(self, semilla=None, tamano_bloque=TAMANO_BLOQUE):
+        if isinstance(semilla, np.random.SeedSequence):
+            self.semilla_seq = semilla
+        else:
+            self.semilla_seq = np.random.SeedSequence(semilla)
+        self.tamano_bloque = tamano_bloque
+        for nombre, hijo in zip(self.NOMBRES, self.semilla_seq.spawn(len(self.NOMBRES))):
+            setattr(self, nombre, FlujoAleatorio(hijo, tamano_bloque))
+
+    @property
+    def semilla(self):
+        return self.semilla_seq.entropy
+
+    def derivar(self, n):
+        """Flujos para n procesos o simulaciones paralelas, independientes entre sí"""
+        return [FlujosSimulacion(hijo, self.tamano_bloque) for hijo in self.semilla_seq.spawn(n)]
+
+    def estado(self):
+        estado = {nombre: getattr(self, nombre).estado() for nombre in self.NOMBRES}
+        seq = self.semilla_seq
+        estado["semilla"] = {"entropia": seq.entropy, "clave": list(seq.spawn_key),
+                             "derivados": seq.n_children_spawned}
+        return estado
+
+    def restaurar(self, estado):
+        semilla = estado.get("semilla")
+        if semilla is not None:
+            self.semilla_seq = np.random.SeedSequence(semilla["entropia"],
+                                                      spawn_key=tuple(semilla["clave"]),
+                                                      n_children_spawned=semilla["derivados"])
+        for nombre in self.NOMBRES:
+            getattr(self, nombre).restaurar(estado[nombre])
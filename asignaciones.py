@@ -0,0 +1,278 @@
+import gc
+import sys
+import time
+import tracemalloc
+
+# Métodos medidos como fases: nombre del método -> fase
+FASES_GATO = {
+    "percibir_entorno": "percibir",
+    "tomar_decision": "decidir",
+    "actualizar_necesidades": "necesidades",
+    "interactuar_con_objetos": "interactuar",
+    "actualizar_mapas": "mapas",
+}
+FASES_SIMULACION = {
+    "regenerar_recursos": "regenerar",
+    "mover_animales": "animales",
+    "dibujar": "dibujar",
+}
+# Lo que paso() asigna fuera de las fases (registradores, métricas, olor, publicador)
+RESTO = "resto"
+
+# Colecciones que se vigilan por ventana por si crecen sin límite
+TAMANOS = {
+    "objetos_entorno": lambda sim: len(sim.objetos_entorno),
+    "memoria": lambda sim: len(sim.gato.memoria),
+    "mapa_conocido": lambda sim: len(sim.gato.mapa_conocido),
+    "zonas_exploradas": lambda sim: len(sim.gato.zonas_exploradas),
+    "q_table": lambda sim: len(sim.gato.q_table),
+    "experiencias": lambda sim: len(sim.gato.experiencias),
+}
+RETENIDOS = "bytes_retenidos"
+
+
+class _Fase:
+    __slots__ = ("llamadas", "bytes_netos", "bloques_netos", "pico_total", "pico_maximo",
+                 "recolecciones", "segundos_gc")
+
+    def __init__(self):
+        self.llamadas = 0
+        self.bytes_netos = 0
+        self.bloques_netos = 0
+        self.pico_total = 0
+        self.pico_maximo = 0
+        self.recolecciones = 0
+        self.segundos_gc = 0.0
+
+
+class RastreadorAsignaciones:
+    """Modo de instrumentación: memoria asignada por tick y por fase, y crecimiento por ventana
+
+    `instrumentar(sim)` envuelve, solo en esa simulación, paso() y los métodos de cada fase
+    (FASES_GATO, FASES_SIMULACION). Por fase acumula, con tracemalloc, los bytes y bloques
+    netos (lo que queda asignado al salir) y el pico transitorio (lo máximo asignado a la
+    vez dentro de la fase, que es lo que cuestan los temporales); un callback de gc cuenta
+    las recolecciones y su duración en la fase en curso. CPython no expone la cantidad bruta
+    de asignaciones, así que netos y picos son la medida.
+
+    Cada `ventana` ticks registra la memoria retenida y el tamaño de las colecciones de
+    TAMANOS y compara una foto de tracemalloc con la anterior; lo que crece en
+    `ventanas_crecimiento` ventanas seguidas se informa como crecimiento, con las líneas
+    que más memoria sumaron. tracemalloc hace todo varias veces más lento: es un modo para
+    medir, no para correr.
+    """
+
+    def __init__(self, ventana=1000, ventanas_crecimiento=3, sitios=5, marcos=1):
+        self.ventana = ventana
+        self.ventanas_crecimiento = ventanas_crecimiento
+        self.sitios = sitios
+        self.marcos = marcos
+        self.fases = {}
+        self._tick = _Fase()
+        self.ticks = 0
+        self.ventanas = []
+        self._sim = None
+        self._gato = None
+        self._envueltos = []
+        self._fase_actual = RESTO
+        # Bytes y bloques netos de las fases llamadas directamente desde paso()
+        self._dentro_paso = False
+        self._netos_en_paso = [0, 0]
+        self._inicio_gc = 0.0
+        self._inicio_tracemalloc = False
+        self._foto = None
+        self._sitios_ventana = []
+        self._sobrecosto = (0, 0, 0)
+
+    # Instrumentación
+    def instrumentar(self, sim):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.marcos)
+            self._inicio_tracemalloc = True
+        gc.callbacks.append(self._al_recolectar)
+        self._sobrecosto = self._calibrar()
+        self._sim = sim
+        for metodo, fase in FASES_SIMULACION.items():
+            self._envolver(sim, metodo, fase)
+        self._envolver_paso(sim)
+        self._instrumentar_gato(sim.gato)
+        self._foto = self._tomar_foto()
+        return self
+
+    def retirar(self):
+        """Deshace la instrumentación (la simulación vuelve a sus métodos originales)"""
+        for objeto, metodo in self._envueltos:
+            if metodo in vars(objeto):
+                delattr(objeto, metodo)
+        self._envueltos = []
+        if self._al_recolectar in gc.callbacks:
+            gc.callbacks.remove(self._al_recolectar)
+        if self._inicio_tracemalloc:
+            tracemalloc.stop()
+            self._inicio_tracemalloc = False
+        self._foto = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.retirar()
+
+    def _instrumentar_gato(self, gato):
+        # reiniciar() y los puntos de control crean un gato nuevo
+        self._gato = gato
+        for metodo, fase in FASES_GATO.items():
+            self._envolver(gato, metodo, fase)
+
+    def _calibrar(self, llamadas=32):
+        """Lo que asigna la propia medición (enteros leídos, **kwargs): se descuenta por llamada"""
+        fase = _Fase()
+        medido = self._medidor(lambda: None, fase, RESTO, (0, 0, 0))
+        for _ in range(llamadas):
+            medido()
+        return (fase.bytes_netos / llamadas, fase.bloques_netos / llamadas,
+                fase.pico_total / llamadas)
+
+    def _fase(self, nombre):
+        fase = self.fases.get(nombre)
+        if fase is None:
+            fase = self.fases[nombre] = _Fase()
+        return fase
+
+    def _envolver(self, objeto, metodo, nombre):
+        medido = self._medidor(getattr(objeto, metodo), self._fase(nombre), nombre,
+                               self._sobrecosto)
+        setattr(objeto, metodo, medido)
+        self._envueltos.append((objeto, metodo))
+
+    def _medidor(self, original, fase, nombre, sobrecosto):
+        leer = tracemalloc.get_traced_memory
+        bloques = sys.getallocatedblocks
+        bytes_extra, bloques_extra, pico_extra = sobrecosto
+
+        def medido(*args, **kwargs):
+            anterior = self._fase_actual
+            self._fase_actual = nombre
+            tracemalloc.reset_peak()
+            antes = leer()[0]
+            bloques_antes = bloques()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                actual, pico = leer()
+                netos = actual - antes - bytes_extra
+                bloques_netos = bloques() - bloques_antes - bloques_extra
+                fase.bytes_netos += netos
+                fase.bloques_netos += bloques_netos
+                if self._dentro_paso and anterior == RESTO:
+                    self._netos_en_paso[0] += netos
+                    self._netos_en_paso[1] += bloques_netos
+                pico = max(0, pico - antes - pico_extra)
+                fase.pico_total += pico
+                fase.pico_maximo = max(fase.pico_maximo, pico)
+                fase.llamadas += 1
+                self._fase_actual = anterior
+
+        return medido
+
+    def _envolver_paso(self, sim):
+        # El tick completo se mide como una fase más; RESTO es el tick menos las fases que
+        # corrieron dentro de él (dibujar, por ejemplo, se llama fuera de paso())
+        original = sim.paso
+
+        def tick(*args, **kwargs):
+            self._dentro_paso = True
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self._dentro_paso = False
+
+        medido = self._medidor(tick, self._tick, RESTO, self._sobrecosto)
+
+        def paso(*args, **kwargs):
+            if sim.gato is not self._gato:
+                self._instrumentar_gato(sim.gato)
+            try:
+                return medido(*args, **kwargs)
+            finally:
+                self.ticks += 1
+                if self.ticks % self.ventana == 0:
+                    self._cerrar_ventana()
+
+        setattr(sim, "paso", paso)
+        self._envueltos.append((sim, "paso"))
+
+    def _al_recolectar(self, etapa, info):
+        if etapa == "start":
+            self._inicio_gc = time.perf_counter()
+        else:
+            fase = self._fase(self._fase_actual)
+            fase.recolecciones += 1
+            fase.segundos_gc += time.perf_counter() - self._inicio_gc
+
+    # Ventanas
+    def _tomar_foto(self):
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+
+    def _cerrar_ventana(self):
+        sim = self._sim
+        foto = self._tomar_foto()
+        # Retenido según la foto: sin lo que asignan tracemalloc y el propio rastreador
+        fila = {"tick": self.ticks,
+                RETENIDOS: sum(estadistica.size for estadistica in foto.statistics("filename"))}
+        for nombre, tamano in TAMANOS.items():
+            fila[nombre] = tamano(sim)
+        self.ventanas.append(fila)
+
+        diferencias = foto.compare_to(self._foto, "lineno")
+        self._sitios_ventana = [
+            {"sitio": f"{d.traceback[0].filename}:{d.traceback[0].lineno}",
+             "bytes": d.size_diff, "bloques": d.count_diff}
+            for d in diferencias[:self.sitios] if d.size_diff > 0]
+        self._foto = foto
+
+    def crecimiento(self):
+        """Series que crecieron en cada una de las últimas ventanas: nombre -> por mil ticks"""
+        k = self.ventanas_crecimiento
+        if len(self.ventanas) <= k:
+            return {}
+        ultimas = self.ventanas[-k - 1:]
+        crecen = {}
+        for nombre in [RETENIDOS, *TAMANOS]:
+            valores = [fila[nombre] for fila in ultimas]
+            if all(b > a for a, b in zip(valores, valores[1:])):
+                ticks = ultimas[-1]["tick"] - ultimas[0]["tick"]
+                crecen[nombre] = (valores[-1] - valores[0]) * 1000 / ticks
+        return crecen
+
+    def informe(self):
+        """Por fase, promedios por tick; gc por fase; ventanas, crecimiento y sitios que más crecen"""
+        ticks = max(self.ticks, 1)
+        # Lo que paso() asigna fuera de las fases; su pico no se mide (las fases lo reinician)
+        resto = self._fase(RESTO)
+        resto.llamadas = self._tick.llamadas
+        resto.bytes_netos = self._tick.bytes_netos - self._netos_en_paso[0]
+        resto.bloques_netos = self._tick.bloques_netos - self._netos_en_paso[1]
+        fases = {}
+        for nombre, f in self.fases.items():
+            if not f.llamadas:
+                continue
+            fases[nombre] = {
+                "llamadas_por_tick": f.llamadas / ticks,
+                "bytes_netos_por_tick": f.bytes_netos / ticks,
+                "bloques_netos_por_tick": f.bloques_netos / ticks,
+                "pico_medio": f.pico_total / f.llamadas,
+                "pico_maximo": round(f.pico_maximo),
+                "recolecciones": f.recolecciones,
+                "segundos_gc": f.segundos_gc,
+            }
+        return {
+            "ticks": self.ticks,
+            "fases": fases,
+            "ventanas": self.ventanas,
+            "crecimiento": self.crecimiento(),
+            "sitios": self._sitios_ventana,
+        }
@@ -0,0 +1,144 @@
+import os
+
+# Sin ventana: debe fijarse antes de importar pygame
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import json
+import sys
+import time
+
+from simuOpti import SimulacionGato
+from percepcion import CampoVision
+from olfato import CampoOlor
+from persecucion import Persecucion
+from asignaciones import RastreadorAsignaciones
+
+# Casos medidos: nombre -> opciones de SimulacionGato (una función, para no compartir estado)
+CASOS = {
+    "clasico": lambda: {},
+    "vision": lambda: {"campo_vision": CampoVision()},
+    "olor": lambda: {"campo_olor": CampoOlor()},
+    "persecucion": lambda: {"persecucion": Persecucion()},
+    "pantalla": lambda: {"mostrar": True},
+}
+
+# Medidas con presupuesto, por fase
+MEDIDAS = ("bytes_netos_por_tick", "pico_medio")
+
+# Holgura absoluta (bytes) además del margen relativo, para las fases que casi no asignan
+HOLGURA = 64
+
+
+def _crear(caso, semilla):
+    opciones = CASOS[caso]()
+    opciones.setdefault("mostrar", False)
+    return SimulacionGato(semilla=semilla, **opciones)
+
+
+def _correr(sim, ticks):
+    dibujar = sim.screen is not None
+    for _ in range(ticks):
+        sim.paso()
+        if dibujar:
+            sim.dibujar()
+
+
+def medir(caso, ticks=5000, semilla=0, ventana=1000):
+    """Tiempo por tick (sin instrumentar) y asignaciones por tick y fase de un caso"""
+    sim = _crear(caso, semilla)
+    inicio = time.perf_counter()
+    _correr(sim, ticks)
+    ms_por_tick = (time.perf_counter() - inicio) * 1000 / ticks
+
+    # Misma corrida, ahora con tracemalloc
+    sim = _crear(caso, semilla)
+    with RastreadorAsignaciones(ventana=ventana).instrumentar(sim) as rastreador:
+        _correr(sim, ticks)
+        informe = rastreador.informe()
+    informe["ms_por_tick"] = ms_por_tick
+    return informe
+
+
+def presupuesto_desde(informes, margen=0.25):
+    """Presupuesto a partir de una medición: cada medida con `margen` relativo de tolerancia"""
+    presupuesto = {}
+    for caso, informe in informes.items():
+        presupuesto[caso] = {
+            "fases": {fase: {medida: max(0.0, valores[medida]) * (1 + margen) + HOLGURA
+                             for medida in MEDIDAS}
+                      for fase, valores in informe["fases"].items()},
+            # Crecimientos ya conocidos (p. ej. objetos_entorno) con su tasa tolerada
+            "crecimiento": {nombre: tasa * (1 + margen)
+                            for nombre, tasa in informe["crecimiento"].items()},
+        }
+    return presupuesto
+
+
+def verificar(informes, presupuesto):
+    """Lista de excesos de los informes frente al presupuesto (vacía si se cumple)"""
+    excesos = []
+    for caso, informe in informes.items():
+        limites = presupuesto.get(caso)
+        if limites is None:
+            continue
+        for fase, valores in informe["fases"].items():
+            for medida, limite in limites["fases"].get(fase, {}).items():
+                if valores[medida] > limite:
+                    excesos.append(f"{caso}/{fase}: {medida} {valores[medida]:.0f} > {limite:.0f}")
+        for nombre, tasa in informe["crecimiento"].items():
+            tolerada = limites["crecimiento"].get(nombre)
+            if tolerada is None:
+                excesos.append(f"{caso}: {nombre} crece {tasa:.1f} por mil ticks (no previsto)")
+            elif tasa > tolerada:
+                excesos.append(f"{caso}: {nombre} crece {tasa:.1f} por mil ticks > {tolerada:.1f}")
+    return excesos
+
+
+def _imprimir(caso, informe):
+    print(f"{caso}: {informe['ms_por_tick']:.3f} ms por tick sin instrumentar, {informe['ticks']} ticks")
+    print(f"  {'fase':<12} {'bytes/tick':>11} {'bloques/tick':>13} {'pico medio':>11} "
+          f"{'pico máx':>10} {'gc':>5}")
+    for fase, v in sorted(informe["fases"].items(), key=lambda item: -item[1]["pico_medio"]):
+        print(f"  {fase:<12} {v['bytes_netos_por_tick']:>11.1f} {v['bloques_netos_por_tick']:>13.2f} "
+              f"{v['pico_medio']:>11.0f} {v['pico_maximo']:>10} {v['recolecciones']:>5}")
+    for nombre, tasa in informe["crecimiento"].items():
+        print(f"  crece {nombre}: {tasa:.1f} por mil ticks")
+    if informe["crecimiento"]:
+        for sitio in informe["sitios"]:
+            print(f"    {sitio['sitio']}: +{sitio['bytes']} bytes, +{sitio['bloques']} bloques")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tiempo y asignaciones por tick de la simulación")
+    parser.add_argument("--casos", nargs="+", choices=list(CASOS), default=list(CASOS))
+    parser.add_argument("--ticks", type=int, default=5000)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--ventana", type=int, default=1000, help="Ticks por ventana de crecimiento")
+    parser.add_argument("--presupuesto", default=None,
+                        help="JSON de presupuesto: termina con error si algún caso lo excede")
+    parser.add_argument("--guardar-presupuesto", default=None,
+                        help="Escribe un presupuesto a partir de esta medición")
+    parser.add_argument("--margen", type=float, default=0.25)
+    parser.add_argument("--salida", default=None, help="Archivo JSON con los informes")
+    args = parser.parse_args()
+
+    informes = {}
+    for caso in args.casos:
+        informes[caso] = medir(caso, args.ticks, args.semilla, args.ventana)
+        _imprimir(caso, informes[caso])
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(informes, f, indent=2)
+    if args.guardar_presupuesto:
+        with open(args.guardar_presupuesto, "w", encoding="utf-8") as f:
+            json.dump(presupuesto_desde(informes, args.margen), f, indent=2)
+    if args.presupuesto:
+        with open(args.presupuesto, encoding="utf-8") as f:
+            excesos = verificar(informes, json.load(f))
+        for exceso in excesos:
+            print(f"EXCEDE {exceso}")
+        if excesos:
+            sys.exit(1)
+        print("Presupuesto de asignaciones cumplido")
@@ -0,0 +1,175 @@
+import queue
+import threading
+import time
+from collections import namedtuple
+import pygame
+
+from simuOpti import (SimulacionGato, AgenteGato, ObjetoEntorno,
+                      WINDOW_WIDTH, WINDOW_HEIGHT, INFO_PANEL_WIDTH, GRID_SIZE)
+
+# Foto inmutable del mundo para dibujar: objetos y percibidos como tuplas (x, y, tipo)
+Instantanea = namedtuple("Instantanea", [
+    "tick", "x", "y", "estado",
+    "energia", "hambre", "sed", "estres", "comodidad", "supervivencia",
+    "memoria", "objetos", "percibidos",
+])
+
+
+def tomar_instantanea(sim):
+    """Copia compacta del estado visible de la simulación"""
+    gato = sim.gato
+    return Instantanea(
+        sim.tiempo_simulacion, gato.x, gato.y, gato.estado,
+        gato.energia, gato.hambre, gato.sed, gato.estres, gato.comodidad, gato.supervivencia,
+        len(gato.memoria),
+        tuple((obj.x, obj.y, obj.tipo) for obj in sim.objetos_entorno if obj.activo),
+        tuple((obj.x, obj.y, obj.tipo) for obj in gato.objetos_percibidos),
+    )
+
+
+class DobleBuffer:
+    """Dos ranuras: el productor escribe en la de atrás y la intercambia al terminar"""
+
+    def __init__(self):
+        self._ranuras = [None, None]
+        self._frente = 0
+        self._version = 0
+        self._leida = 0
+        self._lock = threading.Lock()
+
+    def publicar(self, instantanea):
+        atras = 1 - self._frente
+        self._ranuras[atras] = instantanea
+        with self._lock:
+            self._frente = atras
+            self._version += 1
+
+    @property
+    def pendiente(self):
+        """Hay una instantánea publicada que el consumidor todavía no tomó"""
+        return self._version != self._leida
+
+    def tomar(self):
+        """Devuelve la instantánea más nueva, o None si no hay nada nuevo"""
+        with self._lock:
+            if self._version == self._leida:
+                return None
+            self._leida = self._version
+            return self._ranuras[self._frente]
+
+
+class VistaInstantanea(SimulacionGato):
+    """Dibuja instantáneas reutilizando los métodos de dibujo de la simulación"""
+
+    def __init__(self):
+        self.screen = pygame.display.set_mode((WINDOW_WIDTH + INFO_PANEL_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption("Simulación IA: Agente Gato Doméstico")
+        self.font = pygame.font.Font(None, 24)
+        self.small_font = pygame.font.Font(None, 18)
+        # La instantánea no trae los mapas de calor del gato: sin capas
+        self.capas = []
+        self.registrador = None
+        self.gato = AgenteGato(GRID_SIZE//2, GRID_SIZE//2)
+        self.objetos_entorno = []
+        self.tiempo_simulacion = 0
+
+    def cargar(self, inst):
+        gato = self.gato
+        gato.x, gato.y, gato.estado = inst.x, inst.y, inst.estado
+        gato.energia, gato.hambre, gato.sed = inst.energia, inst.hambre, inst.sed
+        gato.estres, gato.comodidad, gato.supervivencia = inst.estres, inst.comodidad, inst.supervivencia
+        # El panel solo usa el tamaño de la memoria
+        gato.memoria = dict.fromkeys(range(inst.memoria))
+        self.objetos_entorno = [ObjetoEntorno(x, y, tipo) for x, y, tipo in inst.objetos]
+        gato.objetos_percibidos = [ObjetoEntorno(x, y, tipo) for x, y, tipo in inst.percibidos]
+        self.tiempo_simulacion = inst.tick
+
+
+class SimulacionConcurrente:
+    """Simula en un hilo de trabajo y dibuja en el hilo principal
+
+    El hilo de trabajo avanza la simulación a `sim.fps` ticks por segundo (sin límite si
+    `sin_limite` es verdadero) y publica instantáneas en un doble buffer; el hilo principal
+    atiende el teclado y dibuja solo la instantánea más nueva, de modo que ninguno espera
+    al otro. Los comandos del teclado se aplican en el hilo de trabajo entre ticks.
+    """
+
+    def __init__(self, sim=None, fps_pantalla=30, sin_limite=False):
+        self.sim = sim if sim is not None else SimulacionGato(mostrar=False)
+        self.vista = VistaInstantanea()
+        self.fps_pantalla = fps_pantalla
+        self.reloj = pygame.time.Clock()
+        self.sin_limite = sin_limite
+        self.buffer = DobleBuffer()
+        self.comandos = queue.SimpleQueue()
+        self.running = True
+
+    def _trabajar(self):
+        sim = self.sim
+        proximo = time.perf_counter()
+        self.buffer.publicar(tomar_instantanea(sim))
+        while self.running and sim.running:
+            cambio = False
+            while True:
+                try:
+                    comando = self.comandos.get_nowait()
+                except queue.Empty:
+                    break
+                sim.aplicar_comando(comando)
+                cambio = True
+            if sim.telemetria is not None:
+                sim.atender_telemetria()
+
+            if sim.paused:
+                if cambio:
+                    self.buffer.publicar(tomar_instantanea(sim))
+                time.sleep(0.01)
+                proximo = time.perf_counter()
+                continue
+
+            sim.paso()
+            # Solo se copia el mundo cuando el hilo principal ya tomó la anterior
+            if cambio or not self.buffer.pendiente:
+                self.buffer.publicar(tomar_instantanea(sim))
+
+            if not self.sin_limite:
+                proximo += 1.0 / sim.fps
+                espera = proximo - time.perf_counter()
+                if espera > 0:
+                    time.sleep(espera)
+                else:
+                    proximo = time.perf_counter()
+        self.running = False
+
+    def manejar_eventos(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    self.comandos.put("pausa")
+                elif event.key == pygame.K_r:
+                    self.comandos.put("reiniciar")
+                elif event.key == pygame.K_ESCAPE:
+                    self.running = False
+
+    def ejecutar(self):
+        trabajador = threading.Thread(target=self._trabajar, name="simulacion", daemon=True)
+        trabajador.start()
+        try:
+            while self.running:
+                self.manejar_eventos()
+                inst = self.buffer.tomar()
+                if inst is not None:
+                    self.vista.cargar(inst)
+                    self.vista.dibujar()
+                    pygame.display.flip()
+                self.reloj.tick(self.fps_pantalla)
+        finally:
+            self.running = False
+            trabajador.join()
+
+
+if __name__ == "__main__":
+    SimulacionConcurrente().ejecutar()
+    pygame.quit()
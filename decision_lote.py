@@ -0,0 +1,219 @@
+import numpy as np
+
+from simuOpti import (AgenteGato, ObjetoEntorno, EstadoMental, TipoObjeto,
+                      evaluar_estados_vectorizado, UMBRALES_BASE)
+from registro import CODIGO_ESTADO, CODIGO_OBJETO, TIPOS_OBJETO
+
+EXPLORANDO = CODIGO_ESTADO[EstadoMental.EXPLORANDO]
+CAZANDO = CODIGO_ESTADO[EstadoMental.CAZANDO]
+DESCANSANDO = CODIGO_ESTADO[EstadoMental.DESCANSANDO]
+HUYENDO = CODIGO_ESTADO[EstadoMental.HUYENDO]
+BUSCANDO_REFUGIO = CODIGO_ESTADO[EstadoMental.BUSCANDO_REFUGIO]
+
+COMIDA = CODIGO_OBJETO[TipoObjeto.COMIDA]
+AGUA = CODIGO_OBJETO[TipoObjeto.AGUA]
+PRESA = CODIGO_OBJETO[TipoObjeto.PRESA]
+REFUGIO = CODIGO_OBJETO[TipoObjeto.REFUGIO]
+DEPREDADOR = CODIGO_OBJETO[TipoObjeto.DEPREDADOR]
+
+# Movimientos de explorar(), en el mismo orden
+MOVIMIENTOS = np.array([(0, 1), (0, -1), (1, 0), (-1, 0)], dtype=np.int64)
+
+NECESIDADES = ("energia", "hambre", "sed", "estres", "comodidad", "supervivencia")
+
+
+class PoblacionGatos:
+    """Estado de N gatos como arreglos (una posición por gato)
+
+    Todos los gatos comparten los mismos `umbrales` de decisión.
+    """
+
+    def __init__(self, n, umbrales=UMBRALES_BASE):
+        self.n = n
+        self.umbrales = umbrales
+        self.x = np.zeros(n, dtype=np.int64)
+        self.y = np.zeros(n, dtype=np.int64)
+        self.energia = np.full(n, 100.0)
+        self.hambre = np.full(n, 50.0)
+        self.sed = np.full(n, 50.0)
+        self.estres = np.full(n, 20.0)
+        self.comodidad = np.full(n, 70.0)
+        self.supervivencia = np.full(n, 100.0)
+        self.estado = np.full(n, EXPLORANDO, dtype=np.uint8)
+        self.tiempo_en_estado = np.zeros(n, dtype=np.int64)
+        self.rango_vision = np.full(n, 5, dtype=np.int64)
+        self.rango_olfato = np.full(n, 3, dtype=np.int64)
+        self.rango_auditivo = np.full(n, 7, dtype=np.int64)
+
+    @classmethod
+    def desde_agentes(cls, gatos):
+        umbrales = {gato.umbrales for gato in gatos}
+        if len(umbrales) > 1:
+            raise ValueError("Los gatos de una población deben tener los mismos umbrales")
+        pob = cls(len(gatos), umbrales.pop() if umbrales else UMBRALES_BASE)
+        for i, gato in enumerate(gatos):
+            pob.x[i], pob.y[i] = gato.x, gato.y
+            for nombre in NECESIDADES:
+                getattr(pob, nombre)[i] = getattr(gato, nombre)
+            pob.estado[i] = CODIGO_ESTADO[gato.estado]
+            pob.tiempo_en_estado[i] = gato.tiempo_en_estado
+            pob.rango_vision[i] = gato.rango_vision
+            pob.rango_olfato[i] = gato.rango_olfato
+            pob.rango_auditivo[i] = gato.rango_auditivo
+        return pob
+
+    def agente(self, i):
+        """Copia escalar del gato i (para comparar con AgenteGato)"""
+        gato = AgenteGato(int(self.x[i]), int(self.y[i]))
+        gato.umbrales = self.umbrales
+        for nombre in NECESIDADES:
+            setattr(gato, nombre, float(getattr(self, nombre)[i]))
+        gato.tiempo_en_estado = int(self.tiempo_en_estado[i])
+        gato.rango_vision = int(self.rango_vision[i])
+        gato.rango_olfato = int(self.rango_olfato[i])
+        gato.rango_auditivo = int(self.rango_auditivo[i])
+        return gato
+
+
+class PercepcionLote:
+    """Percepciones de toda la población frente a los objetos del mundo
+
+    Reproduce percibir_entorno: los objetos se consideran en orden, así que "el primero"
+    de un tipo es el de menor índice. `percibidos` es la matriz N x M de objetos percibidos.
+    """
+
+    def __init__(self, pob, obj_x, obj_y, obj_tipo, obj_activo=None):
+        obj_x = np.asarray(obj_x, dtype=np.int64)
+        obj_y = np.asarray(obj_y, dtype=np.int64)
+        obj_tipo = np.asarray(obj_tipo, dtype=np.uint8)
+        self.obj_x, self.obj_y, self.obj_tipo = obj_x, obj_y, obj_tipo
+
+        dx = obj_x[None, :] - pob.x[:, None]
+        dy = obj_y[None, :] - pob.y[:, None]
+        self.dist2 = dx*dx + dy*dy
+
+        vision = pob.rango_vision[:, None]
+        olfato = np.maximum(vision, pob.rango_olfato[:, None])
+        oido = np.maximum(vision, pob.rango_auditivo[:, None])
+        es_olfato = (obj_tipo == COMIDA) | (obj_tipo == PRESA)
+        es_depredador = obj_tipo == DEPREDADOR
+        rango = np.where(es_olfato[None, :], olfato, np.where(es_depredador[None, :], oido, vision))
+        self.percibidos = self.dist2 <= rango * rango
+        if obj_activo is not None:
+            self.percibidos &= np.asarray(obj_activo, dtype=bool)[None, :]
+
+        self.hay_depredador, self.depredador = self._primero(es_depredador)
+        self.hay_refugio, self.refugio = self._primero(obj_tipo == REFUGIO)
+
+    @classmethod
+    def desde_objetos(cls, pob, objetos_entorno):
+        return cls(pob,
+                   [obj.x for obj in objetos_entorno],
+                   [obj.y for obj in objetos_entorno],
+                   [CODIGO_OBJETO[obj.tipo] for obj in objetos_entorno],
+                   [obj.activo for obj in objetos_entorno])
+
+    def _primero(self, mascara_tipo):
+        mascara = self.percibidos & mascara_tipo[None, :]
+        return mascara.any(axis=1), mascara.argmax(axis=1)
+
+    def objetivo_caza(self, pob):
+        """Recurso más cercano según hambre/sed (como cazar); empates al de menor índice"""
+        tipo = self.obj_tipo[None, :]
+        u = pob.umbrales
+        candidatos = self.percibidos & (
+            ((pob.hambre > u.hambre_caza)[:, None] & ((tipo == COMIDA) | (tipo == PRESA))) |
+            ((pob.sed > u.sed_caza)[:, None] & (tipo == AGUA)))
+        distancias = np.where(candidatos, self.dist2, np.iinfo(np.int64).max)
+        return candidatos.any(axis=1), distancias.argmin(axis=1)
+
+
+def evaluar_estados_lote(pob, hay_depredador):
+    """Versión vectorizada de AgenteGato.evaluar_estado (mismas reglas y prioridades)"""
+    return evaluar_estados_vectorizado(pob.energia, pob.hambre, pob.sed, pob.estres,
+                                       pob.comodidad, pob.supervivencia, hay_depredador,
+                                       pob.umbrales)
+
+
+class MotorDecisionLote:
+    """Estado mental y acción de N gatos a la vez
+
+    Equivale a AgenteGato.tomar_decision para gatos sin memoria: las acciones se agrupan
+    por estado y los movimientos aleatorios de explorar() se sortean en bloque con `rng`.
+    Con `verificar=True` cada llamada compara el resultado con la ruta escalar y lanza
+    AssertionError ante cualquier diferencia.
+    """
+
+    def __init__(self, rng=None, verificar=False):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.verificar = verificar
+
+    def decidir(self, pob, perc):
+        """Actualiza estado y necesidades de la población y devuelve (dx, dy, aleatorios)"""
+        if self.verificar:
+            antes = [pob.agente(i) for i in range(pob.n)]
+
+        estado = evaluar_estados_lote(pob, perc.hay_depredador)
+        pob.estado[:] = estado
+        pob.tiempo_en_estado += 1
+
+        dx = np.zeros(pob.n, dtype=np.int64)
+        dy = np.zeros(pob.n, dtype=np.int64)
+        aleatorios = np.zeros(pob.n, dtype=bool)
+
+        # HUYENDO: dirección opuesta al primer depredador percibido
+        g = estado == HUYENDO
+        dx[g] = np.sign(pob.x[g] - perc.obj_x[perc.depredador[g]])
+        dy[g] = np.sign(pob.y[g] - perc.obj_y[perc.depredador[g]])
+        pob.estres[g] += 5
+
+        # CAZANDO: hacia el recurso más cercano; sin objetivo, explorar
+        g = estado == CAZANDO
+        hay_objetivo, objetivo = perc.objetivo_caza(pob)
+        con = g & hay_objetivo
+        dx[con] = np.sign(perc.obj_x[objetivo[con]] - pob.x[con])
+        dy[con] = np.sign(perc.obj_y[objetivo[con]] - pob.y[con])
+        aleatorios |= g & ~hay_objetivo
+
+        # BUSCANDO_REFUGIO: hacia el primer refugio; si no hay, explorar
+        g = estado == BUSCANDO_REFUGIO
+        con = g & perc.hay_refugio
+        dx[con] = np.sign(perc.obj_x[perc.refugio[con]] - pob.x[con])
+        dy[con] = np.sign(perc.obj_y[perc.refugio[con]] - pob.y[con])
+        aleatorios |= g & ~perc.hay_refugio
+
+        # DESCANSANDO: recuperar y, si hay refugio, moverse hacia él
+        g = estado == DESCANSANDO
+        pob.energia[g] = np.minimum(100, pob.energia[g] + 2)
+        pob.comodidad[g] = np.minimum(100, pob.comodidad[g] + 3)
+        pob.estres[g] = np.maximum(0, pob.estres[g] - 2)
+        con = g & perc.hay_refugio
+        dx[con] = np.sign(perc.obj_x[perc.refugio[con]] - pob.x[con])
+        dy[con] = np.sign(perc.obj_y[perc.refugio[con]] - pob.y[con])
+
+        aleatorios |= estado == EXPLORANDO
+        k = int(aleatorios.sum())
+        if k:
+            movimientos = MOVIMIENTOS[self.rng.integers(0, len(MOVIMIENTOS), size=k)]
+            dx[aleatorios] = movimientos[:, 0]
+            dy[aleatorios] = movimientos[:, 1]
+
+        if self.verificar:
+            self._verificar(antes, pob, perc, dx, dy, aleatorios)
+        return dx, dy, aleatorios
+
+    def _verificar(self, antes, pob, perc, dx, dy, aleatorios):
+        """Compara con tomar_decision escalar (salvo el sorteo de los movimientos aleatorios)"""
+        for i, gato in enumerate(antes):
+            gato.objetos_percibidos = [
+                ObjetoEntorno(int(perc.obj_x[j]), int(perc.obj_y[j]), TIPOS_OBJETO[perc.obj_tipo[j]])
+                for j in np.flatnonzero(perc.percibidos[i])]
+            movimiento = gato.tomar_decision()
+            if CODIGO_ESTADO[gato.estado] != pob.estado[i]:
+                raise AssertionError(f"Gato {i}: estado {gato.estado} != {pob.estado[i]}")
+            if not aleatorios[i] and movimiento != (dx[i], dy[i]):
+                raise AssertionError(f"Gato {i}: acción {movimiento} != {(dx[i], dy[i])}")
+            for nombre in NECESIDADES:
+                if getattr(gato, nombre) != getattr(pob, nombre)[i]:
+                    raise AssertionError(f"Gato {i}: {nombre} {getattr(gato, nombre)} != "
+                                         f"{getattr(pob, nombre)[i]}")
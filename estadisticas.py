@@ -0,0 +1,301 @@
+import argparse
+import math
+import multiprocessing as mp
+import os
+import time
+import numpy as np
+
+from simuOpti import SimulacionGato
+from exportar import iniciar_trabajador
+from registro import ESTADOS, CODIGO_ESTADO
+
+# Necesidades resumidas por tick
+NECESIDADES = ("supervivencia", "energia", "hambre", "sed", "estres", "comodidad")
+
+CUANTILES = (0.05, 0.5, 0.95)
+
+
+class MomentosCorrientes:
+    """Cantidad, media y varianza en una pasada (Welford), combinables entre procesos"""
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+
+    def _sumar(self, n, media, m2):
+        # Combinación de Chan et al.: exacta para dos resúmenes cualesquiera
+        total = self.n + n
+        delta = media - self.media
+        self.media += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+
+    def agregar(self, valor):
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self.m2 += delta * (valor - self.media)
+
+    def agregar_lote(self, valores):
+        if len(valores):
+            media = float(valores.mean())
+            self._sumar(len(valores), media, float(((valores - media) ** 2).sum()))
+
+    def combinar(self, otro):
+        if otro.n:
+            self._sumar(otro.n, otro.media, otro.m2)
+
+    @property
+    def varianza(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def desvio(self):
+        return math.sqrt(self.varianza)
+
+
+class BosquejoKLL:
+    """Cuantiles aproximados en memoria constante (bosquejo KLL), combinables entre procesos
+
+    Los valores entran al nivel 0; cuando un nivel supera su capacidad se ordena y la mitad
+    de sus elementos (los pares o los impares, al azar) sube al nivel siguiente con el doble
+    de peso, y solo se compacta mientras el total supere la suma de las capacidades. Las
+    capacidades decrecen 2/3 por nivel hacia abajo, así que el bosquejo guarda a lo sumo unos
+    3k valores sea cual sea la cantidad vista; el error de rango es del orden de 1/k.
+    Mínimo y máximo son exactos.
+    """
+
+    def __init__(self, k=200, rng=None):
+        self.k = k
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.niveles = [np.empty(0)]
+        self.n = 0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+
+    def capacidad(self, nivel):
+        return max(2, int(math.ceil(self.k * (2 / 3) ** (len(self.niveles) - 1 - nivel))))
+
+    def agregar_lote(self, valores):
+        valores = np.asarray(valores, dtype=np.float64)
+        if not len(valores):
+            return
+        self.n += len(valores)
+        self.minimo = min(self.minimo, float(valores.min()))
+        self.maximo = max(self.maximo, float(valores.max()))
+        self.niveles[0] = np.concatenate((self.niveles[0], valores))
+        self._compactar()
+
+    def _compactar(self):
+        # Compacta, de abajo hacia arriba, solo mientras el total supere la capacidad total
+        while len(self) > sum(self.capacidad(nivel) for nivel in range(len(self.niveles))):
+            nivel = next(nivel for nivel, datos in enumerate(self.niveles)
+                         if len(datos) > self.capacidad(nivel))
+            if nivel + 1 == len(self.niveles):
+                self.niveles.append(np.empty(0))
+            datos = np.sort(self.niveles[nivel])
+            # Con cantidad impar el mayor se queda en este nivel
+            corte = len(datos) - len(datos) % 2
+            sube = datos[int(self.rng.integers(2)):corte:2]
+            self.niveles[nivel] = datos[corte:]
+            self.niveles[nivel + 1] = np.concatenate((self.niveles[nivel + 1], sube))
+
+    def combinar(self, otro):
+        if not otro.n:
+            return
+        while len(self.niveles) < len(otro.niveles):
+            self.niveles.append(np.empty(0))
+        for nivel, datos in enumerate(otro.niveles):
+            self.niveles[nivel] = np.concatenate((self.niveles[nivel], datos))
+        self.n += otro.n
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+        self._compactar()
+
+    def cuantiles(self, qs):
+        """Valores aproximados para las fracciones `qs` (0 y 1 dan mínimo y máximo exactos)"""
+        qs = np.asarray(qs, dtype=np.float64)
+        if not self.n:
+            return np.full(qs.shape, np.nan)
+        valores = np.concatenate(self.niveles)
+        pesos = np.concatenate([np.full(len(datos), 2.0 ** nivel)
+                                for nivel, datos in enumerate(self.niveles)])
+        orden = np.argsort(valores, kind="stable")
+        valores = valores[orden]
+        acumulado = np.cumsum(pesos[orden])
+        indices = np.searchsorted(acumulado, qs * acumulado[-1], side="left")
+        resultado = valores[np.minimum(indices, len(valores) - 1)]
+        resultado = np.where(qs <= 0, self.minimo, resultado)
+        return np.where(qs >= 1, self.maximo, resultado)
+
+    def __len__(self):
+        return sum(len(datos) for datos in self.niveles)
+
+
+class Resumen:
+    """Momentos y bosquejo de una misma serie"""
+
+    def __init__(self, k, rng):
+        self.momentos = MomentosCorrientes()
+        self.bosquejo = BosquejoKLL(k, rng)
+
+    def agregar_lote(self, valores):
+        self.momentos.agregar_lote(valores)
+        self.bosquejo.agregar_lote(valores)
+
+    def combinar(self, otro):
+        self.momentos.combinar(otro.momentos)
+        self.bosquejo.combinar(otro.bosquejo)
+
+    def informe(self, cuantiles=CUANTILES):
+        informe = {"n": self.momentos.n, "media": self.momentos.media, "desvio": self.momentos.desvio}
+        for q, valor in zip(cuantiles, self.bosquejo.cuantiles(cuantiles).tolist()):
+            informe[f"p{q * 100:g}"] = valor
+        return informe
+
+
+class EstadisticasCorrida:
+    """Distribuciones de las necesidades y de la permanencia en cada estado, en memoria constante
+
+    Se conecta como `SimulacionGato(metricas=...)`: por tick acumula las necesidades en
+    buffers por columna y, al llenarse, los vuelca a momentos (media y varianza) y a
+    bosquejos KLL. La permanencia es la cantidad de ticks seguidos en un estado, que se
+    registra al cambiar de estado o al cerrar la corrida. Dos resúmenes se combinan con
+    `combinar`, p. ej. los que devuelven los procesos de `barrido`.
+    """
+
+    def __init__(self, k=200, filas_por_bloque=1 << 14, semilla=None):
+        self.k = k
+        self.filas_por_bloque = filas_por_bloque
+        self.rng = np.random.default_rng(semilla)
+        self.necesidades = {nombre: Resumen(k, self.rng) for nombre in NECESIDADES}
+        self.permanencia = {estado.value: Resumen(k, self.rng) for estado in ESTADOS}
+        self.buffers = {nombre: np.empty(filas_por_bloque) for nombre in NECESIDADES}
+        self.n = 0
+        self.corridas = 0
+        self.ticks = 0
+        self._estado = None
+        self._desde = 0
+        self._estadias = [[] for _ in ESTADOS]
+
+    def registrar(self, sim):
+        gato = sim.gato
+        i = self.n
+        b = self.buffers
+        b["supervivencia"][i] = gato.supervivencia
+        b["energia"][i] = gato.energia
+        b["hambre"][i] = gato.hambre
+        b["sed"][i] = gato.sed
+        b["estres"][i] = gato.estres
+        b["comodidad"][i] = gato.comodidad
+        self.n = i + 1
+
+        estado = CODIGO_ESTADO[gato.estado]
+        if estado != self._estado:
+            self._cerrar_estadia()
+            self._estado = estado
+        self.ticks += 1
+        if self.n == self.filas_por_bloque:
+            self.vaciar()
+
+    def _cerrar_estadia(self):
+        if self._estado is not None:
+            self._estadias[self._estado].append(self.ticks - self._desde)
+        self._estado = None
+        self._desde = self.ticks
+
+    def cerrar_corrida(self):
+        """Registra la estadía en curso (la corrida termina o se reinicia)"""
+        if self._estado is not None:
+            self._cerrar_estadia()
+            self.corridas += 1
+        self.vaciar()
+
+    def nueva_corrida(self):
+        self.cerrar_corrida()
+
+    def vaciar(self):
+        """Pasa lo acumulado en los buffers a los momentos y los bosquejos"""
+        if self.n:
+            for nombre, resumen in self.necesidades.items():
+                resumen.agregar_lote(self.buffers[nombre][:self.n])
+            self.n = 0
+        for codigo, estadias in enumerate(self._estadias):
+            if estadias:
+                self.permanencia[ESTADOS[codigo].value].agregar_lote(np.array(estadias, dtype=np.float64))
+                estadias.clear()
+
+    def combinar(self, otro):
+        self.vaciar()
+        otro.vaciar()
+        for nombre, resumen in self.necesidades.items():
+            resumen.combinar(otro.necesidades[nombre])
+        for nombre, resumen in self.permanencia.items():
+            resumen.combinar(otro.permanencia[nombre])
+        self.corridas += otro.corridas
+        self.ticks += otro.ticks
+        return self
+
+    def informe(self, cuantiles=CUANTILES):
+        """{"necesidades": {nombre: {n, media, desvio, p5, p50, p95}}, "permanencia": {...}}"""
+        self.vaciar()
+        return {
+            "necesidades": {nombre: r.informe(cuantiles) for nombre, r in self.necesidades.items()},
+            "permanencia": {nombre: r.informe(cuantiles) for nombre, r in self.permanencia.items()
+                            if r.momentos.n},
+        }
+
+
+def _correr(trabajo):
+    semilla, ticks, avance_rapido, k = trabajo
+    estadisticas = EstadisticasCorrida(k, semilla=semilla)
+    sim = SimulacionGato(mostrar=False, metricas=estadisticas, semilla=semilla)
+    sim.ejecutar_sin_pantalla(ticks, avance_rapido=avance_rapido)
+    estadisticas.cerrar_corrida()
+    return estadisticas
+
+
+def barrido(semillas, ticks, procesos=None, avance_rapido=True, k=200):
+    """Corre una simulación sin pantalla por semilla en un pool y combina sus estadísticas"""
+    trabajos = [(semilla, ticks, avance_rapido, k) for semilla in semillas]
+    procesos = (os.cpu_count() or 1) if procesos is None else procesos
+    total = EstadisticasCorrida(k)
+    if procesos == 0:
+        for trabajo in trabajos:
+            total.combinar(_correr(trabajo))
+        return total
+    with mp.Pool(procesos, iniciar_trabajador) as pool:
+        for parcial in pool.imap_unordered(_correr, trabajos):
+            total.combinar(parcial)
+        pool.close()
+        pool.join()
+    return total
+
+
+def _imprimir(titulo, informes):
+    print(titulo)
+    for nombre, informe in informes.items():
+        print(f"  {nombre:<18} n={informe['n']:<10} media={informe['media']:8.2f} "
+              f"desvío={informe['desvio']:7.2f}  " +
+              "  ".join(f"{clave}={valor:7.2f}" for clave, valor in informe.items()
+                        if clave.startswith("p")))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distribuciones de supervivencia sobre muchas corridas")
+    parser.add_argument("--corridas", type=int, default=16)
+    parser.add_argument("--ticks", type=int, default=100_000)
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de la primera corrida")
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--k", type=int, default=200, help="Tamaño de los bosquejos")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    estadisticas = barrido(range(args.semilla, args.semilla + args.corridas), args.ticks,
+                           args.procesos, k=args.k)
+    informe = estadisticas.informe()
+    print(f"{estadisticas.corridas} corridas, {estadisticas.ticks} ticks en "
+          f"{time.perf_counter() - inicio:.1f} s")
+    _imprimir("Necesidades", informe["necesidades"])
+    _imprimir("Permanencia por estado (ticks)", informe["permanencia"])
@@ -0,0 +1,159 @@
+import os
+
+# Sin ventana: debe fijarse antes de importar pygame
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import shutil
+import signal
+import subprocess
+import threading
+import time
+import multiprocessing as mp
+import pygame
+
+from simuOpti import SimulacionGato, WINDOW_WIDTH, WINDOW_HEIGHT, INFO_PANEL_WIDTH
+from concurrencia import VistaInstantanea, tomar_instantanea
+
+ANCHO = WINDOW_WIDTH + INFO_PANEL_WIDTH
+ALTO = WINDOW_HEIGHT
+
+# Cuadros en vuelo hacia el pool por proceso (acota la memoria si el pool se atrasa)
+PENDIENTES_POR_PROCESO = 16
+
+_vista = None
+_directorio = None
+
+
+def _crear_vista():
+    """Vista que dibuja en una superficie fuera de pantalla"""
+    vista = VistaInstantanea()
+    vista.screen = pygame.Surface((ANCHO, ALTO))
+    return vista
+
+
+def _preparar(directorio):
+    global _vista, _directorio
+    _vista = _crear_vista()
+    _directorio = directorio
+
+
+def iniciar_trabajador():
+    """Inicializador de los procesos de un mp.Pool que importan pygame
+
+    SDL convierte SIGTERM en un evento de salida; el pool lo necesita para cerrar el proceso.
+    """
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+def _iniciar_trabajador(directorio):
+    iniciar_trabajador()
+    _preparar(directorio)
+
+
+def _renderizar(trabajo):
+    """Dibuja una instantánea; guarda un PNG o devuelve los bytes RGB crudos"""
+    indice, inst = trabajo
+    _vista.cargar(inst)
+    _vista.dibujar()
+    if _directorio is not None:
+        pygame.image.save(_vista.screen, os.path.join(_directorio, f"cuadro_{indice:06d}.png"))
+        return None
+    return pygame.image.tobytes(_vista.screen, "RGB")
+
+
+def comando_ffmpeg(salida, fps):
+    """Comando para codificar RGB crudo por stdin, o None si no hay ffmpeg instalado"""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return None
+    return [ffmpeg, "-loglevel", "error", "-y",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{ANCHO}x{ALTO}", "-r", str(fps),
+            "-i", "-", "-c:v", "libx264", "-pix_fmt", "yuv420p", salida]
+
+
+class ExportadorCuadros:
+    """Exporta una corrida sin ventana, como secuencia PNG o video (RGB por tubería a ffmpeg)
+
+    La simulación avanza en el proceso principal y cada `cada` ticks toma una instantánea;
+    los cuadros se dibujan en superficies fuera de pantalla en un pool de `procesos`
+    procesos (0: en el mismo proceso). Con video los cuadros se escriben en orden.
+    """
+
+    def __init__(self, salida, formato="png", cada=1, procesos=None, fps=30):
+        self.salida = salida
+        self.cada = max(1, cada)
+        self.procesos = (os.cpu_count() or 1) if procesos is None else procesos
+        self.fps = fps
+        self.comando = None
+        if formato == "video":
+            self.comando = comando_ffmpeg(salida, fps)
+            if self.comando is None:
+                self.salida = os.path.splitext(salida)[0]
+                print(f"ffmpeg no está instalado: se exporta una secuencia PNG en {self.salida}")
+        if self.comando is None:
+            os.makedirs(self.salida, exist_ok=True)
+
+    def _instantaneas(self, sim, ticks, cupo=None):
+        """Avanza la simulación y produce (índice, instantánea) cada `cada` ticks"""
+        indice = 0
+        for tick in range(ticks + 1):
+            if tick > 0:
+                sim.paso()
+            if tick % self.cada == 0:
+                if cupo is not None:
+                    cupo.acquire()
+                yield indice, tomar_instantanea(sim)
+                indice += 1
+
+    def exportar(self, sim, ticks):
+        """Exporta `ticks` ticks de la simulación; devuelve la cantidad de cuadros"""
+        directorio = None if self.comando is not None else self.salida
+        codificador = None
+        if self.comando is not None:
+            codificador = subprocess.Popen(self.comando, stdin=subprocess.PIPE)
+
+        cuadros = 0
+        try:
+            if self.procesos == 0:
+                _preparar(directorio)
+                for trabajo in self._instantaneas(sim, ticks):
+                    datos = _renderizar(trabajo)
+                    if codificador is not None:
+                        codificador.stdin.write(datos)
+                    cuadros += 1
+            else:
+                # El pool consume las instantáneas desde su propio hilo; el cupo evita que
+                # la simulación se adelante demasiado a los cuadros ya dibujados
+                cupo = threading.BoundedSemaphore(self.procesos * PENDIENTES_POR_PROCESO)
+                with mp.Pool(self.procesos, _iniciar_trabajador, (directorio,)) as pool:
+                    for datos in pool.imap(_renderizar, self._instantaneas(sim, ticks, cupo), chunksize=4):
+                        cupo.release()
+                        if codificador is not None:
+                            codificador.stdin.write(datos)
+                        cuadros += 1
+                    pool.close()
+                    pool.join()
+        finally:
+            if codificador is not None:
+                codificador.stdin.close()
+                codificador.wait()
+        return cuadros
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta una corrida a cuadros PNG o video")
+    parser.add_argument("salida", help="Directorio de cuadros PNG o archivo de video")
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--cada", type=int, default=1, help="Un cuadro cada N ticks")
+    parser.add_argument("--formato", choices=["png", "video"], default="png")
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--semilla", type=int, default=None)
+    args = parser.parse_args()
+
+    exportador = ExportadorCuadros(args.salida, args.formato, args.cada, args.procesos, args.fps)
+    inicio = time.perf_counter()
+    cuadros = exportador.exportar(SimulacionGato(mostrar=False, semilla=args.semilla), args.ticks)
+    duracion = time.perf_counter() - inicio
+    print(f"{cuadros} cuadros en {duracion:.1f} s ({cuadros / duracion:.1f} cuadros/s)")
@@ -0,0 +1,464 @@
+import argparse
+import resource
+import struct
+import time
+from collections import OrderedDict, deque
+import numpy as np
+
+from simuOpti import SimulacionGato, TipoObjeto, ObjetoEntorno, TIPOS_OBJETO, GRID_SIZE
+from paralelo import DENSIDADES
+
+MAGIA = b"GATOMAPA"
+VERSION_MAPA = 1
+
+# Cabecera: magia, versión, ancho, alto, lado del trozo, inicio del gato (x, y), cantidad de capas
+CABECERA = struct.Struct("<8sIIIIIII")
+# Una entrada por capa: nombre, tipo de NumPy (p. ej. "|u1") y posición en el archivo
+ENTRADA_CAPA = struct.Struct("<16s8sQ")
+# Las capas empiezan en múltiplos de una página
+ALINEACION = 4096
+
+# Capas de un mapa: nombre -> tipo de celda
+CAPAS = {
+    "terreno": "u1",    # LIBRE u OBSTACULO
+    "objetos": "u1",    # VACIO o CODIGO_MAPA del objeto de la celda
+    "aparicion": "u1",  # peso de la celda para regenerar recursos (0: no aparecen)
+}
+LIBRE = 0
+OBSTACULO = 1
+VACIO = 0
+CODIGO_MAPA = {tipo: i + 1 for i, tipo in enumerate(TIPOS_OBJETO)}
+
+# Mapas hechos a mano como texto: una línea por fila (y), un carácter por celda (x)
+SIMBOLOS = {
+    "C": TipoObjeto.COMIDA,
+    "A": TipoObjeto.AGUA,
+    "R": TipoObjeto.REFUGIO,
+    "J": TipoObjeto.JUGUETE,
+    "H": TipoObjeto.HUMANO,
+    "D": TipoObjeto.DEPREDADOR,
+    "P": TipoObjeto.PRESA,
+}
+SIMBOLO_OBSTACULO = "#"
+SIMBOLO_APARICION = "*"
+SIMBOLO_INICIO = "G"
+SIMBOLOS_VACIOS = ". "
+
+MAPAS_GATO = ("mapa_calor_recursos", "mapa_calor_peligros", "mapa_visitas")
+
+
+def _alinear(posicion):
+    return -(-posicion // ALINEACION) * ALINEACION
+
+
+class ArchivoMapa:
+    """Mapa en disco: una cabecera y capas de celdas tipadas, leídas con np.memmap
+
+    Cada capa se guarda trozo por trozo (arreglo (trozos_x, trozos_y, trozo, trozo), índice
+    [x, y] dentro del trozo), así que un trozo ocupa bytes contiguos del archivo y leerlo
+    solo toca esas páginas. Abrir el archivo lee únicamente la cabecera, sea cual sea el
+    tamaño del mapa.
+    """
+
+    def __init__(self, ruta, modo="r"):
+        with open(ruta, "rb") as archivo:
+            cabecera = archivo.read(CABECERA.size)
+            if len(cabecera) < CABECERA.size:
+                raise ValueError(f"{ruta} no es un mapa de la simulación")
+            magia, version, ancho, alto, trozo, inicio_x, inicio_y, n = CABECERA.unpack(cabecera)
+            if magia != MAGIA:
+                raise ValueError(f"{ruta} no es un mapa de la simulación")
+            if version != VERSION_MAPA:
+                raise ValueError(f"Versión de mapa {version} no soportada (se esperaba {VERSION_MAPA})")
+            entradas = [ENTRADA_CAPA.unpack(archivo.read(ENTRADA_CAPA.size)) for _ in range(n)]
+        self.ruta = ruta
+        self.ancho = ancho
+        self.alto = alto
+        self.trozo = trozo
+        self.inicio = (inicio_x, inicio_y)
+        self.trozos_x = -(-ancho // trozo)
+        self.trozos_y = -(-alto // trozo)
+        forma = (self.trozos_x, self.trozos_y, trozo, trozo)
+        self.capas = {}
+        for nombre, tipo, posicion in entradas:
+            self.capas[nombre.rstrip(b"\0").decode()] = np.memmap(
+                ruta, dtype=np.dtype(tipo.rstrip(b"\0").decode()), mode=modo,
+                offset=posicion, shape=forma)
+
+    @classmethod
+    def crear(cls, ruta, ancho, alto, tamano_trozo=64, inicio=None, capas=CAPAS):
+        """Archivo nuevo con todas las celdas en 0, abierto para escribir
+
+        El archivo se extiende sin escribir las celdas (queda disperso donde el sistema de
+        archivos lo permite), así que crear un mapa enorme es inmediato.
+        """
+        if inicio is None:
+            inicio = (ancho // 2, alto // 2)
+        celdas = -(-ancho // tamano_trozo) * -(-alto // tamano_trozo) * tamano_trozo ** 2
+        posicion = _alinear(CABECERA.size + ENTRADA_CAPA.size * len(capas))
+        entradas = []
+        for nombre, tipo in capas.items():
+            entradas.append((nombre, np.dtype(tipo).str, posicion))
+            posicion = _alinear(posicion + celdas * np.dtype(tipo).itemsize)
+        with open(ruta, "wb") as archivo:
+            archivo.write(CABECERA.pack(MAGIA, VERSION_MAPA, ancho, alto, tamano_trozo,
+                                        inicio[0], inicio[1], len(capas)))
+            for nombre, tipo, desplazamiento in entradas:
+                archivo.write(ENTRADA_CAPA.pack(nombre.encode(), tipo.encode(), desplazamiento))
+            archivo.truncate(posicion)
+        return cls(ruta, "r+")
+
+    def leer_trozo(self, cx, cy):
+        """Copia de un trozo de cada capa: nombre -> arreglo (trozo, trozo)"""
+        return {nombre: np.array(capa[cx, cy]) for nombre, capa in self.capas.items()}
+
+    def tramos(self, x0, y0, ancho, alto):
+        """Trozos que cubren una región: (cx, cy, corte en el trozo, corte en la región)"""
+        if x0 < 0 or y0 < 0 or x0 + ancho > self.ancho or y0 + alto > self.alto:
+            raise ValueError(f"La región ({x0}, {y0}, {ancho}, {alto}) sale del mapa "
+                             f"({self.ancho} x {self.alto})")
+        t = self.trozo
+        for cx in range(x0 // t, (x0 + ancho - 1) // t + 1):
+            ax, bx = max(x0, cx * t), min(x0 + ancho, (cx + 1) * t)
+            for cy in range(y0 // t, (y0 + alto - 1) // t + 1):
+                ay, by = max(y0, cy * t), min(y0 + alto, (cy + 1) * t)
+                yield (cx, cy,
+                       (slice(ax - cx * t, bx - cx * t), slice(ay - cy * t, by - cy * t)),
+                       (slice(ax - x0, bx - x0), slice(ay - y0, by - y0)))
+
+    def leer(self, capa, x0, y0, ancho, alto):
+        """Región de una capa como arreglo (ancho, alto)"""
+        datos = self.capas[capa]
+        region = np.empty((ancho, alto), dtype=datos.dtype)
+        for cx, cy, en_trozo, en_region in self.tramos(x0, y0, ancho, alto):
+            region[en_region] = datos[cx, cy][en_trozo]
+        return region
+
+    def escribir(self, capa, x0, y0, valores):
+        """Escribe una región de una capa (el archivo debe estar abierto con modo="r+")"""
+        datos = self.capas[capa]
+        for cx, cy, en_trozo, en_region in self.tramos(x0, y0, *valores.shape):
+            datos[cx, cy][en_trozo] = valores[en_region]
+
+    def vaciar(self):
+        for capa in self.capas.values():
+            capa.flush()
+
+
+def desde_texto(ruta, lineas, tamano_trozo=64):
+    """Escribe en `ruta` un mapa hecho a mano como texto (ver SIMBOLOS) y lo abre"""
+    lineas = [linea.rstrip("\n") for linea in lineas]
+    ancho, alto = max(map(len, lineas)), len(lineas)
+    terreno = np.zeros((ancho, alto), dtype=np.uint8)
+    objetos = np.zeros((ancho, alto), dtype=np.uint8)
+    aparicion = np.zeros((ancho, alto), dtype=np.uint8)
+    inicio = None
+    for y, linea in enumerate(lineas):
+        for x, simbolo in enumerate(linea):
+            if simbolo == SIMBOLO_OBSTACULO:
+                terreno[x, y] = OBSTACULO
+            elif simbolo == SIMBOLO_APARICION:
+                aparicion[x, y] = 1
+            elif simbolo == SIMBOLO_INICIO:
+                inicio = (x, y)
+            elif simbolo in SIMBOLOS:
+                objetos[x, y] = CODIGO_MAPA[SIMBOLOS[simbolo]]
+            elif simbolo not in SIMBOLOS_VACIOS:
+                raise ValueError(f"Símbolo desconocido {simbolo!r} en la fila {y}, columna {x}")
+
+    archivo = ArchivoMapa.crear(ruta, ancho, alto, tamano_trozo, inicio)
+    for nombre, valores in (("terreno", terreno), ("objetos", objetos), ("aparicion", aparicion)):
+        archivo.escribir(nombre, 0, 0, valores)
+    archivo.vaciar()
+    return ArchivoMapa(ruta)
+
+
+def mapa_aleatorio(ruta, ancho, alto, semilla=0, tamano_trozo=64, densidades=DENSIDADES,
+                   lado_zona=8, prob_zona=0.3):
+    """Escribe en `ruta` un mapa al azar, trozo por trozo (nunca entero en memoria), y lo abre
+
+    Cada trozo depende solo de (semilla, cx, cy). Las zonas de aparición son bloques de
+    `lado_zona` celdas, cada uno con probabilidad `prob_zona`.
+    """
+    archivo = ArchivoMapa.crear(ruta, ancho, alto, tamano_trozo)
+    t = tamano_trozo
+    tipos = [tipo for tipo in densidades if tipo != TipoObjeto.OBSTACULO]
+    limites = np.cumsum([densidades[tipo] for tipo in tipos])
+    codigos = np.array([CODIGO_MAPA[tipo] for tipo in tipos] + [VACIO], dtype=np.uint8)
+    prob_obstaculo = densidades.get(TipoObjeto.OBSTACULO, 0.0)
+    zonas = -(-t // lado_zona)
+    terreno, objetos, aparicion = (archivo.capas[nombre] for nombre in CAPAS)
+    for cx in range(archivo.trozos_x):
+        for cy in range(archivo.trozos_y):
+            rng = np.random.default_rng([semilla, cx, cy])
+            sorteo = rng.random((t, t))
+            obstaculo = sorteo < prob_obstaculo
+            terreno[cx, cy] = obstaculo
+            objetos[cx, cy] = np.where(
+                obstaculo, VACIO,
+                codigos[np.searchsorted(limites, sorteo - prob_obstaculo, side="right")])
+            zona = rng.random((zonas, zonas)) < prob_zona
+            zona = np.repeat(np.repeat(zona, lado_zona, axis=0), lado_zona, axis=1)[:t, :t]
+            aparicion[cx, cy] = zona & ~obstaculo
+    archivo.vaciar()
+    return ArchivoMapa(ruta)
+
+
+def _correr(arreglo, dx, dy):
+    """resultado[x, y] = arreglo[x + dx, y + dy], con 0 donde eso cae fuera"""
+    resultado = np.zeros_like(arreglo)
+    ancho, alto = arreglo.shape
+    if abs(dx) < ancho and abs(dy) < alto:
+        resultado[max(0, -dx):ancho - max(0, dx), max(0, -dy):alto - max(0, dy)] = \
+            arreglo[max(0, dx):ancho + min(0, dx), max(0, dy):alto + min(0, dy)]
+    return resultado
+
+
+class VistaMapa:
+    """La grilla de la simulación como una ventana (la cámara) sobre un ArchivoMapa
+
+    Solo los objetos de la vista (GRID_SIZE x GRID_SIZE celdas desde `origen`) existen como
+    ObjetoEntorno. Cuando el gato queda a `margen` celdas de un borde y el mapa sigue, la
+    vista se recentra en el gato en ese eje y todo lo que está en coordenadas de la grilla
+    (gato, objetos, mapas de calor, campos de visión, olor y persecución) se corre con ella.
+
+    Los trozos se leen del archivo recién cuando la vista llega a menos de `precarga` celdas
+    y quedan en una caché LRU de `capacidad` trozos. Lo que la simulación cambia (comida
+    consumida, animales que se movieron, recursos regenerados) se guarda al correr la vista
+    en copias de los trozos tocados, que no salen de memoria; el archivo no se modifica.
+    """
+
+    def __init__(self, archivo, margen=4, capacidad=64, precarga=GRID_SIZE // 2):
+        faltan = set(CAPAS) - set(archivo.capas)
+        if faltan:
+            raise ValueError(f"Al mapa le faltan las capas {sorted(faltan)}")
+        if archivo.ancho < GRID_SIZE or archivo.alto < GRID_SIZE:
+            raise ValueError(f"El mapa ({archivo.ancho} x {archivo.alto}) es más chico que la "
+                             f"grilla ({GRID_SIZE} x {GRID_SIZE})")
+        self.archivo = archivo
+        self.margen = margen
+        self.capacidad = capacidad
+        self.precarga = precarga
+        self.origen = (0, 0)
+        self.lecturas = 0
+        self.desplazamientos = 0
+        self._cache = OrderedDict()
+        self._modificados = {}
+        self._aparicion = None
+
+    # Trozos
+    def _trozo(self, cx, cy):
+        clave = (cx, cy)
+        trozo = self._modificados.get(clave)
+        if trozo is not None:
+            return trozo
+        trozo = self._cache.get(clave)
+        if trozo is None:
+            trozo = self._cache[clave] = self.archivo.leer_trozo(cx, cy)
+            self.lecturas += 1
+            if len(self._cache) > self.capacidad:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(clave)
+        return trozo
+
+    def _region(self, capa):
+        x0, y0 = self.origen
+        region = np.empty((GRID_SIZE, GRID_SIZE), dtype=self.archivo.capas[capa].dtype)
+        for cx, cy, en_trozo, en_region in self.archivo.tramos(x0, y0, GRID_SIZE, GRID_SIZE):
+            region[en_region] = self._trozo(cx, cy)[capa][en_trozo]
+        return region
+
+    def _precargar(self):
+        """Lee por adelantado los trozos a menos de `precarga` celdas de la vista"""
+        p = self.precarga
+        x0, y0 = max(self.origen[0] - p, 0), max(self.origen[1] - p, 0)
+        x1 = min(self.origen[0] + GRID_SIZE + p, self.archivo.ancho)
+        y1 = min(self.origen[1] + GRID_SIZE + p, self.archivo.alto)
+        for cx, cy, _, _ in self.archivo.tramos(x0, y0, x1 - x0, y1 - y0):
+            self._trozo(cx, cy)
+
+    # Vista
+    def _centrar(self, posicion, largo):
+        return min(max(posicion - GRID_SIZE // 2, 0), largo - GRID_SIZE)
+
+    def _objetos(self, celdas):
+        """ObjetoEntorno de las celdas marcadas de la vista (obstáculos primero)"""
+        terreno = self._region("terreno")
+        codigos = self._region("objetos")
+        xs, ys = np.nonzero((terreno == OBSTACULO) & celdas)
+        objetos = [ObjetoEntorno(x, y, TipoObjeto.OBSTACULO) for x, y in zip(xs.tolist(), ys.tolist())]
+        xs, ys = np.nonzero((codigos != VACIO) & celdas)
+        objetos += [ObjetoEntorno(x, y, TIPOS_OBJETO[codigo - 1])
+                    for x, y, codigo in zip(xs.tolist(), ys.tolist(), codigos[xs, ys].tolist())]
+        self._aparicion = np.cumsum(self._region("aparicion"), dtype=np.int64).ravel()
+        return objetos
+
+    def _guardar(self, objetos_entorno):
+        """Pasa a los trozos los objetos activos de la vista (una celda guarda un objeto)"""
+        codigos = np.zeros((GRID_SIZE, GRID_SIZE), dtype=np.uint8)
+        for obj in objetos_entorno:
+            if obj.activo and obj.tipo != TipoObjeto.OBSTACULO:
+                codigos[obj.x, obj.y] = CODIGO_MAPA[obj.tipo]
+        x0, y0 = self.origen
+        for cx, cy, en_trozo, en_region in self.archivo.tramos(x0, y0, GRID_SIZE, GRID_SIZE):
+            trozo = self._trozo(cx, cy)
+            if not np.array_equal(trozo["objetos"][en_trozo], codigos[en_region]):
+                trozo["objetos"][en_trozo] = codigos[en_region]
+                self._modificados[(cx, cy)] = self._cache.pop((cx, cy), trozo)
+
+    def cargar(self, gato):
+        """Objetos de la vista inicial, con el gato en el inicio del mapa (descarta los cambios)"""
+        self._cache.clear()
+        self._modificados.clear()
+        inicio_x, inicio_y = self.archivo.inicio
+        self.origen = (self._centrar(inicio_x, self.archivo.ancho),
+                       self._centrar(inicio_y, self.archivo.alto))
+        gato.x, gato.y = inicio_x - self.origen[0], inicio_y - self.origen[1]
+        self._precargar()
+        return self._objetos(np.ones((GRID_SIZE, GRID_SIZE), dtype=bool))
+
+    def celda_aparicion(self, azar):
+        """Celda de la vista para un recurso regenerado, según los pesos de `aparicion`"""
+        total = self._aparicion[-1]
+        if total == 0:
+            return None
+        celda = int(np.searchsorted(self._aparicion, azar.random() * total, side="right"))
+        return divmod(celda, GRID_SIZE)
+
+    def _eje(self, posicion, origen, largo):
+        if ((posicion < self.margen and origen > 0)
+                or (posicion >= GRID_SIZE - self.margen and origen + GRID_SIZE < largo)):
+            return self._centrar(origen + posicion, largo)
+        return origen
+
+    def seguir(self, sim):
+        """Corre la vista si el gato quedó cerca de un borde y el mapa sigue de ese lado"""
+        gato = sim.gato
+        nuevo = (self._eje(gato.x, self.origen[0], self.archivo.ancho),
+                 self._eje(gato.y, self.origen[1], self.archivo.alto))
+        if nuevo != self.origen:
+            self._desplazar(sim, nuevo)
+
+    def _desplazar(self, sim, nuevo):
+        self._guardar(sim.objetos_entorno)
+        dx, dy = nuevo[0] - self.origen[0], nuevo[1] - self.origen[1]
+        self.origen = nuevo
+        self.desplazamientos += 1
+
+        conservados = []
+        for obj in sim.objetos_entorno:
+            if obj.activo:
+                obj.x -= dx
+                obj.y -= dy
+                if 0 <= obj.x < GRID_SIZE and 0 <= obj.y < GRID_SIZE:
+                    conservados.append(obj)
+        # Solo las celdas que no estaban en la vista anterior se leen de los trozos
+        x, y = np.ogrid[:GRID_SIZE, :GRID_SIZE]
+        nuevas = ~((x + dx >= 0) & (x + dx < GRID_SIZE) & (y + dy >= 0) & (y + dy < GRID_SIZE))
+        sim.objetos_entorno = conservados + self._objetos(nuevas)
+        self._desplazar_gato(sim.gato, dx, dy, {id(obj) for obj in conservados})
+
+        if sim.campo_vision is not None:
+            sim.campo_vision.reconstruir(sim.objetos_entorno)
+        if sim.persecucion is not None:
+            sim.persecucion.reconstruir(sim.objetos_entorno)
+        if sim.campo_olor is not None:
+            olor = _correr(sim.campo_olor.olor, dx, dy)
+            sim.campo_olor.reconstruir(sim.objetos_entorno)
+            sim.campo_olor.olor[:] = olor
+        # Para el registro, la vista nueva es un mundo nuevo (coordenadas de la grilla)
+        if sim.registrador is not None:
+            sim.registrador.registrar_entorno(sim)
+        self._precargar()
+
+    def _desplazar_gato(self, gato, dx, dy, conservados):
+        def dentro(x, y):
+            return 0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE
+
+        gato.x -= dx
+        gato.y -= dy
+        gato.historia_posiciones = deque(
+            ((x - dx, y - dy) for x, y in gato.historia_posiciones if dentro(x - dx, y - dy)),
+            maxlen=gato.historia_posiciones.maxlen)
+        gato.zonas_exploradas = {(x - dx, y - dy) for x, y in gato.zonas_exploradas
+                                 if dentro(x - dx, y - dy)}
+        for nombre in MAPAS_GATO:
+            getattr(gato, nombre)[:] = _correr(getattr(gato, nombre), dx, dy)
+
+        memoria = {}
+        for clave, obj in gato.memoria.items():
+            x, y = (int(v) - d for v, d in zip(clave.split(","), (dx, dy)))
+            if id(obj) in conservados and dentro(x, y):
+                memoria[f"{x},{y}"] = obj
+        gato.memoria = memoria
+        gato.objetos_percibidos = [obj for obj in gato.objetos_percibidos if id(obj) in conservados]
+        # El plan es una lista de movimientos relativos: sigue valiendo si el objetivo sigue
+        if gato.objetivo_actual is not None and id(gato.objetivo_actual) not in conservados:
+            gato.abandonar_objetivo()
+        elif gato.destino_plan is not None:
+            gato.destino_plan = (gato.destino_plan[0] - dx, gato.destino_plan[1] - dy)
+
+    # Puntos de control
+    def cambios(self):
+        """Trozos modificados: (índices (k, 2), capa de objetos (k, trozo, trozo))"""
+        claves = sorted(self._modificados)
+        objetos = np.zeros((len(claves), self.archivo.trozo, self.archivo.trozo), dtype=np.uint8)
+        for i, clave in enumerate(claves):
+            objetos[i] = self._modificados[clave]["objetos"]
+        return np.array(claves, dtype=np.int32).reshape(-1, 2), objetos
+
+    def restaurar(self, origen, claves, objetos):
+        """Vuelve a una vista y a sus trozos modificados (los objetos los pone el llamador)"""
+        self._cache.clear()
+        self._modificados.clear()
+        for (cx, cy), capa in zip(claves.tolist(), objetos):
+            trozo = self.archivo.leer_trozo(cx, cy)
+            trozo["objetos"][:] = capa
+            self._modificados[(cx, cy)] = trozo
+        self.origen = tuple(origen)
+        self._aparicion = np.cumsum(self._region("aparicion"), dtype=np.int64).ravel()
+        self._precargar()
+
+
+def _memoria_residente_mb():
+    # ru_maxrss está en KiB en Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mapas por trozos para mundos grandes")
+    parser.add_argument("accion", choices=["crear", "convertir", "recorrer"],
+                        help="crear: mapa al azar; convertir: desde texto; recorrer: simular en el mapa")
+    parser.add_argument("ruta", help="Archivo del mapa")
+    parser.add_argument("--texto", default=None, help="Mapa en texto (para convertir)")
+    parser.add_argument("--ancho", type=int, default=4096)
+    parser.add_argument("--alto", type=int, default=4096)
+    parser.add_argument("--trozo", type=int, default=64, help="Lado de los trozos en celdas")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--ticks", type=int, default=20_000)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    if args.accion == "crear":
+        mapa = mapa_aleatorio(args.ruta, args.ancho, args.alto, args.semilla, args.trozo)
+        print(f"Mapa de {mapa.ancho} x {mapa.alto} en {mapa.trozos_x * mapa.trozos_y} trozos, "
+              f"{time.perf_counter() - inicio:.1f} s")
+    elif args.accion == "convertir":
+        if args.texto is None:
+            parser.error("convertir necesita --texto")
+        with open(args.texto, encoding="utf-8") as f:
+            mapa = desde_texto(args.ruta, f.readlines(), args.trozo)
+        print(f"Mapa de {mapa.ancho} x {mapa.alto}, gato en {mapa.inicio}")
+    else:
+        vista = VistaMapa(ArchivoMapa(args.ruta))
+        sim = SimulacionGato(mostrar=False, semilla=args.semilla, mapa=vista)
+        print(f"Inicio en {(time.perf_counter() - inicio) * 1000:.1f} ms, "
+              f"{vista.lecturas} trozos leídos")
+        inicio = time.perf_counter()
+        sim.ejecutar_sin_pantalla(args.ticks)
+        segundos = time.perf_counter() - inicio
+        print(f"{args.ticks} ticks en {segundos:.1f} s ({segundos * 1000 / args.ticks:.3f} ms por tick)")
+        print(f"Vista en {vista.origen}: {vista.desplazamientos} desplazamientos, "
+              f"{vista.lecturas} trozos leídos, {len(vista.cambios()[0])} modificados")
+        print(f"Memoria residente máxima: {_memoria_residente_mb():.0f} MB")
@@ -0,0 +1,259 @@
+import argparse
+import json
+import struct
+import time
+from contextlib import contextmanager
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+
+from registro import (REGISTRO_TICK, REGISTRO_OBJETO, CODIGO_ESTADO, CODIGO_OBJETO,
+                      ESTADOS, TIPOS_OBJETO)
+
+MAGIA = b"GATOSHM\0"
+VERSION_MEMORIA = 1
+
+# Cabecera: magia, versión, largo del descriptor JSON, secuencia (seqlock) y tick
+CABECERA = struct.Struct("<8sIIQQ")
+TAMANO_CABECERA = 64
+DESPLAZAMIENTO_SECUENCIA = 16
+ALINEACION = 64
+
+# Estado del gato: una fila de ticks.bin más los tamaños de las listas publicadas
+REGISTRO_ESTADO = np.dtype(REGISTRO_TICK.descr + [
+    ("memoria", "<u4"),
+    ("objetos", "<u4"),
+    ("percibidos", "<u4"),
+    ("pausado", "u1"),
+])
+
+
+# Bloques creados por este proceso (ya registrados en su rastreador de recursos)
+_creados = set()
+
+
+def adjuntar_memoria(nombre, rastrear=False):
+    """Abre un bloque existente sin adueñarse de él
+
+    Antes de Python 3.13 el rastreador de recursos borra al salir todo bloque abierto por
+    el proceso, aunque lo haya creado otro. Los procesos hijos del creador comparten su
+    rastreador y pueden usar `rastrear=True`.
+    """
+    try:
+        return shared_memory.SharedMemory(name=nombre, track=rastrear)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=nombre)
+        if not rastrear and shm._name not in _creados:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _alinear(n):
+    return -(-n // ALINEACION) * ALINEACION
+
+
+class BloqueCompartido:
+    """Arreglos de NumPy en un bloque de memoria compartida con nombre
+
+    El bloque empieza con una cabecera versionada y un descriptor JSON de los campos, así
+    que un lector solo necesita el nombre. La cabecera lleva un contador tipo seqlock: el
+    escritor lo deja impar mientras escribe (ver `escribiendo`) y los lectores repiten la
+    lectura si el contador era impar o cambió, sin bloquear nunca al escritor.
+    """
+
+    def __init__(self, campos, nombre=None, esquema=""):
+        disposicion = []
+        total = 0
+        for clave, (dtype, forma) in campos.items():
+            dtype = np.dtype(dtype)
+            forma = tuple(int(n) for n in forma)
+            disposicion.append([clave, np.lib.format.dtype_to_descr(dtype), list(forma), total])
+            total = _alinear(total + int(np.prod(forma)) * dtype.itemsize)
+        # Los desplazamientos del descriptor se cuentan desde el fin del descriptor
+        descriptor = json.dumps({"esquema": esquema, "campos": disposicion}).encode("utf-8")
+        inicio = _alinear(TAMANO_CABECERA + len(descriptor))
+
+        self.shm = shared_memory.SharedMemory(name=nombre, create=True, size=inicio + max(total, 1))
+        self.propietario = True
+        _creados.add(self.shm._name)
+        self.shm.buf[:CABECERA.size] = CABECERA.pack(MAGIA, VERSION_MEMORIA, len(descriptor), 0, 0)
+        self.shm.buf[TAMANO_CABECERA:TAMANO_CABECERA + len(descriptor)] = descriptor
+        self._mapear(esquema, disposicion, inicio)
+
+    @classmethod
+    def adjuntar(cls, nombre, rastrear=False):
+        """Mapea un bloque creado por otro proceso (sin copiar)"""
+        bloque = cls.__new__(cls)
+        bloque.shm = adjuntar_memoria(nombre, rastrear)
+        bloque.propietario = False
+        magia, version, largo, _, _ = CABECERA.unpack_from(bloque.shm.buf)
+        if magia != MAGIA:
+            bloque.shm.close()
+            raise ValueError(f"{nombre} no es un bloque de memoria de la simulación")
+        if version != VERSION_MEMORIA:
+            bloque.shm.close()
+            raise ValueError(f"Versión de memoria {version} no soportada (se esperaba {VERSION_MEMORIA})")
+        descriptor = json.loads(bytes(bloque.shm.buf[TAMANO_CABECERA:TAMANO_CABECERA + largo]))
+        bloque._mapear(descriptor["esquema"], descriptor["campos"],
+                       _alinear(TAMANO_CABECERA + largo))
+        return bloque
+
+    def _mapear(self, esquema, disposicion, inicio):
+        self.nombre = self.shm.name
+        self.esquema = esquema
+        self._control = np.ndarray((2,), dtype=np.uint64, buffer=self.shm.buf,
+                                   offset=DESPLAZAMIENTO_SECUENCIA)
+        self.arreglos = {
+            clave: np.ndarray(tuple(forma), dtype=np.lib.format.descr_to_dtype(descr),
+                              buffer=self.shm.buf, offset=inicio + desplazamiento)
+            for clave, descr, forma, desplazamiento in disposicion
+        }
+
+    def __getitem__(self, clave):
+        return self.arreglos[clave]
+
+    @property
+    def secuencia(self):
+        return int(self._control[0])
+
+    @property
+    def tick(self):
+        return int(self._control[1])
+
+    # Escritor (un solo proceso)
+    @contextmanager
+    def escribiendo(self, tick=None):
+        """Marca una escritura en curso: contador impar durante el bloque, par al salir"""
+        self._control[0] += 1
+        try:
+            yield self.arreglos
+        finally:
+            if tick is not None:
+                self._control[1] = tick
+            self._control[0] += 1
+
+    # Lectores
+    def vista(self, espera=0.0005):
+        """Espera a que no haya escritura en curso; devuelve (secuencia, arreglos sin copiar)
+
+        Los arreglos son la memoria viva: después de usarlos, `vigente(secuencia)` dice si
+        el escritor los tocó en el medio.
+        """
+        while True:
+            secuencia = self.secuencia
+            if secuencia % 2 == 0:
+                return secuencia, self.arreglos
+            time.sleep(espera)
+
+    def vigente(self, secuencia):
+        return self.secuencia == secuencia
+
+    def leer(self, espera=0.0005):
+        """Copia consistente de todos los campos: (tick, {nombre: copia})"""
+        while True:
+            secuencia, arreglos = self.vista(espera)
+            tick = self.tick
+            copias = {clave: arreglo.copy() for clave, arreglo in arreglos.items()}
+            if self.vigente(secuencia):
+                return tick, copias
+
+    def cerrar(self):
+        # Las vistas deben soltarse antes de cerrar el bloque
+        self.arreglos = {}
+        self._control = None
+        self.shm.close()
+        if self.propietario:
+            _creados.discard(self.shm._name)
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def campos_simulacion(capacidad_objetos):
+    return {
+        "gato": (REGISTRO_ESTADO, (1,)),
+        "objetos": (REGISTRO_OBJETO, (capacidad_objetos,)),
+        "percibidos": (REGISTRO_OBJETO, (capacidad_objetos,)),
+    }
+
+
+class PublicadorEstado:
+    """Publica el gato y los objetos activos de SimulacionGato en un bloque con nombre
+
+    Se conecta con `SimulacionGato(publicador=...)` y publica después de cada tick. Si hay
+    más objetos que `capacidad_objetos` se publican solo los primeros.
+    """
+
+    def __init__(self, nombre="gatoia", capacidad_objetos=4096):
+        self.capacidad = capacidad_objetos
+        self.bloque = BloqueCompartido(campos_simulacion(capacidad_objetos), nombre,
+                                       esquema="simulacion_gato")
+
+    @property
+    def nombre(self):
+        return self.bloque.nombre
+
+    def _llenar(self, destino, objetos):
+        n = min(len(objetos), self.capacidad)
+        if n:
+            destino[:n] = [(obj.x, obj.y, CODIGO_OBJETO[obj.tipo]) for obj in objetos[:n]]
+        return n
+
+    def publicar(self, sim):
+        gato = sim.gato
+        activos = [obj for obj in sim.objetos_entorno if obj.activo]
+        with self.bloque.escribiendo(sim.tiempo_simulacion) as arreglos:
+            fila = arreglos["gato"]
+            fila[0] = (sim.tiempo_simulacion, gato.x, gato.y, CODIGO_ESTADO[gato.estado],
+                       gato.energia, gato.hambre, gato.sed, gato.estres, gato.comodidad,
+                       gato.supervivencia, len(gato.memoria), 0, 0, sim.paused)
+            fila["objetos"] = self._llenar(arreglos["objetos"], activos)
+            fila["percibidos"] = self._llenar(arreglos["percibidos"], gato.objetos_percibidos)
+
+    def cerrar(self):
+        self.bloque.cerrar()
+
+
+class LectorEstado:
+    """Lee desde otro proceso lo que publica PublicadorEstado"""
+
+    def __init__(self, nombre="gatoia"):
+        self.bloque = BloqueCompartido.adjuntar(nombre)
+        if self.bloque.esquema != "simulacion_gato":
+            esquema = self.bloque.esquema
+            self.bloque.cerrar()
+            raise ValueError(f"El bloque {nombre} tiene el esquema {esquema!r}")
+
+    def leer(self):
+        """Copia consistente: (fila del gato, objetos activos, objetos percibidos)"""
+        _, copias = self.bloque.leer()
+        gato = copias["gato"][0]
+        return (gato, copias["objetos"][:int(gato["objetos"])],
+                copias["percibidos"][:int(gato["percibidos"])])
+
+    def cerrar(self):
+        self.bloque.cerrar()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Muestra el estado publicado por una simulación")
+    parser.add_argument("nombre", nargs="?", default="gatoia", help="Nombre del bloque")
+    parser.add_argument("--intervalo", type=float, default=1.0)
+    args = parser.parse_args()
+
+    lector = LectorEstado(args.nombre)
+    try:
+        while True:
+            gato, objetos, percibidos = lector.leer()
+            conteo = np.bincount(objetos["objeto"], minlength=len(TIPOS_OBJETO))
+            resumen = ", ".join(f"{tipo.value}: {n}" for tipo, n in zip(TIPOS_OBJETO, conteo) if n)
+            print(f"Tick {gato['tick']}  ({gato['x']}, {gato['y']})  {ESTADOS[gato['estado']].value}  "
+                  f"supervivencia {gato['supervivencia']:.1f}  percibidos {len(percibidos)}  [{resumen}]")
+            time.sleep(args.intervalo)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        lector.cerrar()
@@ -0,0 +1,129 @@
+import glob
+import os
+import numpy as np
+
+from registro import CODIGO_ESTADO
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Columnas exportadas y su tipo
+COLUMNAS = [
+    ("corrida", np.uint32),
+    ("tick", np.uint64),
+    ("supervivencia", np.float32),
+    ("energia", np.float32),
+    ("hambre", np.float32),
+    ("sed", np.float32),
+    ("estres", np.float32),
+    ("comodidad", np.float32),
+    ("estado", np.uint8),
+    ("recompensa_acumulada", np.float32),
+]
+
+FORMATOS_CSV = {np.uint32: "%d", np.uint64: "%d", np.uint8: "%d", np.float32: "%.4f"}
+
+
+class SumideroMetricas:
+    """Acumula métricas del gato en buffers por columna y las vuelca por bloques a disco"""
+
+    def __init__(self, directorio, intervalo=1, filas_por_bloque=1 << 16,
+                 csv=True, npz=True, parquet=False):
+        if parquet and pa is None:
+            raise ImportError("La exportación a Parquet requiere pyarrow")
+        os.makedirs(directorio, exist_ok=True)
+        self.directorio = directorio
+        self.intervalo = intervalo
+        self.filas_por_bloque = filas_por_bloque
+        self.csv = csv
+        self.npz = npz
+        self.parquet = parquet
+
+        self.buffers = {nombre: np.empty(filas_por_bloque, dtype=tipo) for nombre, tipo in COLUMNAS}
+        self.n = 0
+        self.corrida = 0
+        self.bloques_escritos = 0
+        self._hasta_muestra = 0
+        self._escritor_parquet = None
+
+        if self.csv:
+            with open(self._ruta("metricas.csv"), "w", encoding="utf-8") as f:
+                f.write(",".join(nombre for nombre, _ in COLUMNAS) + "\n")
+
+    def _ruta(self, nombre):
+        return os.path.join(self.directorio, nombre)
+
+    def nueva_corrida(self):
+        """Las filas siguientes se etiquetan con otra corrida"""
+        self.corrida += 1
+        self._hasta_muestra = 0
+
+    def registrar(self, sim):
+        """Toma una muestra cada `intervalo` ticks"""
+        if self._hasta_muestra:
+            self._hasta_muestra -= 1
+            return
+        self._hasta_muestra = self.intervalo - 1
+
+        gato = sim.gato
+        i = self.n
+        b = self.buffers
+        b["corrida"][i] = self.corrida
+        b["tick"][i] = sim.tiempo_simulacion
+        b["supervivencia"][i] = gato.supervivencia
+        b["energia"][i] = gato.energia
+        b["hambre"][i] = gato.hambre
+        b["sed"][i] = gato.sed
+        b["estres"][i] = gato.estres
+        b["comodidad"][i] = gato.comodidad
+        b["estado"][i] = CODIGO_ESTADO[gato.estado]
+        b["recompensa_acumulada"][i] = gato.recompensa_acumulada
+        self.n = i + 1
+        if self.n == self.filas_por_bloque:
+            self.vaciar()
+
+    def vaciar(self):
+        """Escribe las filas acumuladas en todos los formatos activos"""
+        if self.n == 0:
+            return
+        columnas = {nombre: self.buffers[nombre][:self.n] for nombre, _ in COLUMNAS}
+
+        if self.csv:
+            tabla = np.empty(self.n, dtype=[(nombre, tipo) for nombre, tipo in COLUMNAS])
+            for nombre, valores in columnas.items():
+                tabla[nombre] = valores
+            formato = ",".join(FORMATOS_CSV[tipo] for _, tipo in COLUMNAS)
+            with open(self._ruta("metricas.csv"), "a", encoding="utf-8") as f:
+                np.savetxt(f, tabla, fmt=formato)
+
+        if self.npz:
+            np.savez(self._ruta(f"metricas_{self.bloques_escritos:05d}.npz"), **columnas)
+
+        if self.parquet:
+            tabla = pa.table({nombre: pa.array(valores) for nombre, valores in columnas.items()})
+            if self._escritor_parquet is None:
+                self._escritor_parquet = pq.ParquetWriter(self._ruta("metricas.parquet"),
+                                                          tabla.schema)
+            self._escritor_parquet.write_table(tabla)
+
+        self.bloques_escritos += 1
+        self.n = 0
+
+    def cerrar(self):
+        self.vaciar()
+        if self._escritor_parquet is not None:
+            self._escritor_parquet.close()
+            self._escritor_parquet = None
+
+
+def cargar_metricas(directorio):
+    """Concatena los bloques .npz escritos por SumideroMetricas"""
+    partes = sorted(glob.glob(os.path.join(directorio, "metricas_*.npz")))
+    if not partes:
+        return {nombre: np.zeros(0, dtype=tipo) for nombre, tipo in COLUMNAS}
+    bloques = [np.load(parte) for parte in partes]
+    return {nombre: np.concatenate([b[nombre] for b in bloques]) for nombre, _ in COLUMNAS}
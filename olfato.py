@@ -0,0 +1,118 @@
+import math
+import numpy as np
+
+from simuOpti import TipoObjeto, GRID_SIZE
+from percepcion import TIPOS_OLFATO
+
+# Vecinas en orden de preferencia ante un empate
+VECINDAD = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+# Coeficiente de difusión máximo por subpaso (el esquema explícito es estable hasta 0.25)
+ALFA_MAXIMO = 0.2
+
+
+class CampoOlor:
+    """Olor de comida y presas que se difunde y se desvanece por la grilla (índice [x, y])
+
+    Cada tick las fuentes emiten `intensidad`, el olor se difunde con un estencil de cinco
+    puntos en `subpasos` pasos explícitos (coeficiente `difusion` por tick) y se pierde una
+    fracción `decaimiento`. Los obstáculos y los bordes absorben el olor, así que el rastro
+    rodea a los obstáculos. Todo opera en buffers preasignados, sin crear arreglos por tick.
+    El gato lee en O(1) hacia qué vecina sube el olor (`direccion`), sea cual sea la
+    cantidad de fuentes.
+    """
+
+    def __init__(self, ancho=GRID_SIZE, alto=GRID_SIZE, difusion=0.5, decaimiento=0.1,
+                 intensidad=1.0, subpasos=None, umbral=0.01):
+        if difusion <= 0:
+            raise ValueError("difusion debe ser positiva")
+        if subpasos is None:
+            subpasos = max(1, math.ceil(difusion / ALFA_MAXIMO))
+        elif subpasos < 1:
+            raise ValueError("subpasos debe ser al menos 1")
+        if difusion / subpasos > 0.25:
+            raise ValueError(f"difusion={difusion} necesita al menos "
+                             f"{math.ceil(difusion / 0.25)} subpasos para ser estable")
+        self.ancho = ancho
+        self.alto = alto
+        self.difusion = difusion
+        self.decaimiento = decaimiento
+        self.intensidad = intensidad
+        self.subpasos = subpasos
+        self.umbral = umbral
+
+        # El olor vive en el interior de una grilla con un borde de una celda siempre en 0
+        self._relleno = np.zeros((ancho + 2, alto + 2))
+        self.olor = self._relleno[1:-1, 1:-1]
+        self._vecinos = np.empty((ancho, alto))
+        self.emision = np.zeros((ancho, alto))
+        self._obstaculos = np.zeros((ancho, alto), dtype=np.int32)
+        # alfa en las celdas libres, 0 en los obstáculos (ver avanzar)
+        self._alfa = np.full((ancho, alto), difusion / subpasos)
+
+    # Fuentes y obstáculos
+    def reconstruir(self, objetos_entorno):
+        """Vuelve a indexar todos los objetos y borra el olor (al generar el entorno)"""
+        self.olor[:] = 0
+        self.emision[:] = 0
+        self._obstaculos[:] = 0
+        self._alfa[:] = self.difusion / self.subpasos
+        for obj in objetos_entorno:
+            if obj.activo:
+                self._sumar(obj, 1)
+
+    def _sumar(self, obj, signo):
+        if obj.tipo in TIPOS_OLFATO:
+            self.emision[obj.x, obj.y] += signo * self.intensidad
+        elif obj.tipo == TipoObjeto.OBSTACULO:
+            self._obstaculos[obj.x, obj.y] += signo
+            libre = self._obstaculos[obj.x, obj.y] == 0
+            self._alfa[obj.x, obj.y] = self.difusion / self.subpasos if libre else 0
+
+    def agregar(self, obj):
+        self._sumar(obj, 1)
+
+    def quitar(self, obj):
+        """El objeto dejó de estar activo (consumido)"""
+        self._sumar(obj, -1)
+
+    def mover(self, obj, x_ant, y_ant):
+        x, y = obj.x, obj.y
+        obj.x, obj.y = x_ant, y_ant
+        self._sumar(obj, -1)
+        obj.x, obj.y = x, y
+        self._sumar(obj, 1)
+
+    # Dinámica
+    def avanzar(self):
+        """Un tick: difusión en subpasos, absorción en obstáculos, decaimiento y emisión"""
+        p = self._relleno
+        c = self.olor
+        vecinos = self._vecinos
+        alfa = self.difusion / self.subpasos
+        for _ in range(self.subpasos):
+            # c = (1 - 4 alfa) c + alfa * (suma de las 4 vecinas), y 0 en los obstáculos;
+            # fuera de la grilla el olor es 0 (se pierde por los bordes)
+            np.add(p[:-2, 1:-1], p[2:, 1:-1], out=vecinos)
+            vecinos += p[1:-1, :-2]
+            vecinos += p[1:-1, 2:]
+            c *= (1 - 4 * alfa) / alfa
+            c += vecinos
+            c *= self._alfa
+        c *= 1 - self.decaimiento
+        c += self.emision
+
+    # Lectura
+    def direccion(self, x, y):
+        """Movimiento (dx, dy) hacia la vecina con más olor, o None sin rastro o en la fuente"""
+        olor = self.olor
+        mejor = olor[x, y]
+        if mejor < self.umbral:
+            return None
+        movimiento = None
+        for dx, dy in VECINDAD:
+            vx, vy = x + dx, y + dy
+            if 0 <= vx < self.ancho and 0 <= vy < self.alto and olor[vx, vy] > mejor:
+                mejor = olor[vx, vy]
+                movimiento = (dx, dy)
+        return movimiento
@@ -0,0 +1,215 @@
+import argparse
+import json
+import math
+import multiprocessing as mp
+import os
+import time
+import numpy as np
+
+from simuOpti import SimulacionGato, AgenteGato, UMBRALES_BASE
+from exportar import iniciar_trabajador
+
+# Espacio de búsqueda: nombre -> (mínimo, máximo, entero). Los nombres de Umbrales ajustan
+# gato.umbrales; el resto son atributos de AgenteGato
+ESPACIO = {
+    "energia_refugio": (0, 60, False),
+    "supervivencia_refugio": (0, 60, False),
+    "hambre_caza": (30, 95, False),
+    "sed_caza": (30, 95, False),
+    "estres_refugio": (30, 100, False),
+    "comodidad_descanso": (0, 60, False),
+    "hambre_comer": (0, 90, False),
+    "sed_beber": (0, 90, False),
+    "estres_humano": (0, 100, False),
+    "rango_vision": (2, 10, True),
+    "rango_olfato": (1, 10, True),
+    "rango_auditivo": (2, 12, True),
+}
+
+# Fisiología del gato: no entra por defecto, porque bajarla siempre "mejora" la supervivencia
+ESPACIO_TASAS = {
+    "tasa_hambre": (0.1, 1.0, False),
+    "tasa_sed": (0.1, 1.0, False),
+    "tasa_energia": (0.05, 0.6, False),
+}
+
+
+def parametros_base(espacio=ESPACIO):
+    """Valores actuales del agente para los parámetros del espacio"""
+    gato = AgenteGato(0, 0)
+    return {nombre: getattr(UMBRALES_BASE, nombre) if nombre in UMBRALES_BASE._fields
+            else getattr(gato, nombre) for nombre in espacio}
+
+
+def aplicar_parametros(gato, parametros):
+    umbrales = {nombre: valor for nombre, valor in parametros.items()
+                if nombre in UMBRALES_BASE._fields}
+    gato.umbrales = gato.umbrales._replace(**umbrales)
+    for nombre, valor in parametros.items():
+        if nombre not in umbrales:
+            setattr(gato, nombre, valor)
+
+
+class _Aptitud:
+    """Sumidero mínimo (como `metricas=`) que acumula la supervivencia por tick"""
+
+    def __init__(self):
+        self.suma = 0.0
+        self.ticks = 0
+
+    def registrar(self, sim):
+        self.suma += sim.gato.supervivencia
+        self.ticks += 1
+
+    def nueva_corrida(self):
+        pass
+
+
+def evaluar(trabajo):
+    """Supervivencia media de una corrida sin pantalla con los parámetros dados"""
+    parametros, semilla, ticks = trabajo
+    aptitud = _Aptitud()
+    sim = SimulacionGato(mostrar=False, metricas=aptitud, semilla=semilla)
+    aplicar_parametros(sim.gato, parametros)
+    sim.ejecutar_sin_pantalla(ticks, avance_rapido=True)
+    return aptitud.suma / max(aptitud.ticks, 1)
+
+
+class OptimizadorEvolutivo:
+    """Algoritmo genético con corte sucesivo (successive halving) para los parámetros del gato
+
+    Cada generación evalúa la población en escalones de `ticks` crecientes sobre las mismas
+    `semillas` (números comunes para comparar candidatos): tras cada escalón solo sigue la
+    fracción 1/`reduccion` mejor, así que las corridas largas se gastan en los prometedores.
+    Los `elite` mejores del último escalón pasan a la generación siguiente y el resto se
+    obtiene por cruce uniforme y mutación gaussiana; la escala de la mutación crece si la
+    generación mejoró al mejor conocido y se achica si no. Las corridas se reparten en un
+    pool de `procesos` (0: en el mismo proceso).
+    """
+
+    def __init__(self, espacio=ESPACIO, poblacion=16, elite=4, semillas=(0, 1, 2),
+                 ticks=(2000, 8000, 32000), reduccion=2, procesos=None, semilla=None,
+                 mutacion=0.15):
+        self.espacio = espacio
+        self.poblacion = poblacion
+        self.elite = min(elite, poblacion)
+        self.semillas = tuple(semillas)
+        self.ticks = tuple(ticks)
+        self.reduccion = reduccion
+        self.procesos = (os.cpu_count() or 1) if procesos is None else procesos
+        self.rng = np.random.default_rng(semilla)
+        self.mutacion = mutacion
+
+        self.nombres = list(espacio)
+        self.minimos = np.array([espacio[n][0] for n in self.nombres], dtype=np.float64)
+        self.maximos = np.array([espacio[n][1] for n in self.nombres], dtype=np.float64)
+        self.enteros = np.array([espacio[n][2] for n in self.nombres])
+
+        self.mejor = None
+        self.mejor_aptitud = -math.inf
+        self.historial = []
+        self.corridas = 0
+        self.ticks_simulados = 0
+
+    # Representación: vector normalizado a [0, 1] por parámetro
+    def _parametros(self, vector):
+        valores = self.minimos + np.clip(vector, 0, 1) * (self.maximos - self.minimos)
+        return {nombre: (int(round(v)) if entero else float(v))
+                for nombre, v, entero in zip(self.nombres, valores.tolist(), self.enteros)}
+
+    def _vector(self, parametros):
+        valores = np.array([parametros[n] for n in self.nombres], dtype=np.float64)
+        return (valores - self.minimos) / (self.maximos - self.minimos)
+
+    def _poblacion_inicial(self):
+        base = self._vector(parametros_base(self.espacio))
+        resto = self.rng.random((self.poblacion - 1, len(self.nombres)))
+        return np.vstack(([np.clip(base, 0, 1)], resto))
+
+    def _evaluar(self, pool, candidatos, ticks):
+        trabajos = [(self._parametros(v), semilla, ticks) for v in candidatos for semilla in self.semillas]
+        if pool is None:
+            resultados = [evaluar(t) for t in trabajos]
+        else:
+            resultados = pool.map(evaluar, trabajos)
+        self.corridas += len(trabajos)
+        self.ticks_simulados += len(trabajos) * ticks
+        return np.array(resultados).reshape(len(candidatos), len(self.semillas)).mean(axis=1)
+
+    def _generacion(self, pool, candidatos):
+        """Corte sucesivo: devuelve (candidatos del último escalón, aptitudes) ordenados"""
+        vivos = candidatos
+        for i, ticks in enumerate(self.ticks):
+            aptitudes = self._evaluar(pool, vivos, ticks)
+            orden = np.argsort(-aptitudes)
+            vivos, aptitudes = vivos[orden], aptitudes[orden]
+            if i < len(self.ticks) - 1:
+                quedan = max(self.elite, math.ceil(len(vivos) / self.reduccion))
+                vivos = vivos[:quedan]
+        return vivos, aptitudes
+
+    def _descendencia(self, padres, n):
+        a = padres[self.rng.integers(len(padres), size=n)]
+        b = padres[self.rng.integers(len(padres), size=n)]
+        hijos = np.where(self.rng.random(a.shape) < 0.5, a, b)
+        hijos += self.rng.normal(0, self.mutacion, hijos.shape)
+        return np.clip(hijos, 0, 1)
+
+    def evolucionar(self, generaciones, al_terminar_generacion=None):
+        """Corre `generaciones` generaciones; devuelve (mejores parámetros, aptitud)"""
+        candidatos = self._poblacion_inicial()
+        pool = None if self.procesos == 0 else mp.Pool(self.procesos, iniciar_trabajador)
+        try:
+            for generacion in range(generaciones):
+                finalistas, aptitudes = self._generacion(pool, candidatos)
+                mejoro = aptitudes[0] > self.mejor_aptitud
+                if mejoro:
+                    self.mejor = self._parametros(finalistas[0])
+                    self.mejor_aptitud = float(aptitudes[0])
+                # Escala de mutación adaptativa
+                self.mutacion = float(np.clip(self.mutacion * (1.2 if mejoro else 0.8), 0.01, 0.5))
+                self.historial.append({"generacion": generacion, "mejor": float(aptitudes[0]),
+                                       "mutacion": self.mutacion, "corridas": self.corridas})
+                if al_terminar_generacion is not None:
+                    al_terminar_generacion(self)
+
+                padres = finalistas[:self.elite]
+                candidatos = np.vstack((padres, self._descendencia(padres, self.poblacion - len(padres))))
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        return self.mejor, self.mejor_aptitud
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ajusta los umbrales y sensores del gato")
+    parser.add_argument("--generaciones", type=int, default=10)
+    parser.add_argument("--poblacion", type=int, default=16)
+    parser.add_argument("--elite", type=int, default=4)
+    parser.add_argument("--semillas", type=int, default=3, help="Corridas por candidato y escalón")
+    parser.add_argument("--ticks", type=int, nargs="+", default=[2000, 8000, 32000])
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--tasas", action="store_true", help="Incluir también las tasas fisiológicas")
+    parser.add_argument("--salida", default=None, help="Archivo JSON para los mejores parámetros")
+    args = parser.parse_args()
+
+    espacio = dict(ESPACIO, **ESPACIO_TASAS) if args.tasas else ESPACIO
+    optimizador = OptimizadorEvolutivo(espacio, args.poblacion, args.elite, range(args.semillas),
+                                       args.ticks, procesos=args.procesos, semilla=args.semilla)
+    inicio = time.perf_counter()
+
+    def informar(opt):
+        ultimo = opt.historial[-1]
+        print(f"Generación {ultimo['generacion']}: mejor {ultimo['mejor']:.2f} "
+              f"(histórico {opt.mejor_aptitud:.2f}), mutación {ultimo['mutacion']:.3f}, "
+              f"{opt.corridas} corridas, {time.perf_counter() - inicio:.0f} s")
+
+    base = parametros_base(espacio)
+    mejor, aptitud = optimizador.evolucionar(args.generaciones, informar)
+    for nombre in espacio:
+        print(f"  {nombre:<22} {base[nombre]!s:>8} -> {mejor[nombre]}")
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump({"aptitud": aptitud, "parametros": mejor}, f, indent=2)
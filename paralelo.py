@@ -0,0 +1,522 @@
+import os
+import argparse
+import time
+import multiprocessing as mp
+from collections import namedtuple
+import numpy as np
+
+from simuOpti import AgenteGato, TipoObjeto, evaluar_estados_vectorizado, UMBRALES_BASE
+from registro import CODIGO_OBJETO
+from percepcion import tabla_desplazamientos
+from memoria_compartida import BloqueCompartido
+from decision_lote import (EXPLORANDO, CAZANDO, DESCANSANDO, HUYENDO, BUSCANDO_REFUGIO,
+                           COMIDA, AGUA, PRESA, REFUGIO, MOVIMIENTOS)
+
+JUGUETE = CODIGO_OBJETO[TipoObjeto.JUGUETE]
+VACIO = 255
+
+# Objetos fijos por celda al generar el mundo (fracción de celdas) y tipos que reaparecen
+DENSIDADES = {
+    TipoObjeto.OBSTACULO: 0.025,
+    TipoObjeto.COMIDA: 0.02,
+    TipoObjeto.AGUA: 0.0125,
+    TipoObjeto.REFUGIO: 0.0075,
+    TipoObjeto.JUGUETE: 0.01,
+    TipoObjeto.PRESA: 0.0075,
+}
+TIPOS_REGENERACION = np.array([COMIDA, AGUA, PRESA], dtype=np.uint8)
+
+# Flujos del generador por contador (uno por cada sorteo distinto)
+FLUJO_EXPLORAR = 1
+FLUJO_DEPREDADOR = 2
+FLUJO_PASO_DEPREDADOR = 3
+FLUJO_REGENERACION = 4
+FLUJO_TIPO_REGENERACION = 5
+
+# Vecindad para interactuar con objetos (misma que interactuar_con_objetos)
+VECINOS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+ParametrosMundo = namedtuple("ParametrosMundo", [
+    "ancho", "alto", "semilla", "halo",
+    "rango_vision", "rango_olfato", "rango_auditivo",
+    "tasa_hambre", "tasa_sed", "tasa_energia",
+    "prob_depredador", "tasa_regeneracion",
+    "umbrales",
+])
+
+_ORO = np.uint64(0x9E3779B97F4A7C15)
+_M1 = np.uint64(0xBF58476D1CE4E5B9)
+_M2 = np.uint64(0x94D049BB133111EB)
+
+
+def _mezclar(z):
+    """splitmix64 sobre un arreglo uint64 (el desborde es intencional)"""
+    z = z + _ORO
+    z = (z ^ (z >> np.uint64(30))) * _M1
+    z = (z ^ (z >> np.uint64(27))) * _M2
+    return z ^ (z >> np.uint64(31))
+
+
+def aleatorios_contador(semilla, flujo, tick, ids):
+    """Enteros de 64 bits que dependen solo de (semilla, flujo, tick, id)
+
+    Al no haber estado compartido entre procesos, el resultado es el mismo sin importar
+    cuántos procesos o teselas haya ni en qué orden se procesen.
+    """
+    clave = np.array([semilla, (flujo << 40) + tick], dtype=np.uint64)
+    clave = _mezclar(clave[0:1] ^ _mezclar(clave[1:2]))
+    return _mezclar(np.asarray(ids, dtype=np.uint64) ^ clave)
+
+
+def uniformes_contador(semilla, flujo, tick, ids):
+    return (aleatorios_contador(semilla, flujo, tick, ids) >> np.uint64(11)) * (1.0 / (1 << 53))
+
+
+def campos_mundo(ancho, alto, gatos, depredadores):
+    """Arreglos compartidos: nombre -> (dtype, forma)"""
+    return {
+        "control": (np.int64, (2,)),
+        "grilla": (np.uint8, (ancho, alto)),
+        "x": (np.int32, (gatos,)),
+        "y": (np.int32, (gatos,)),
+        "energia": (np.float64, (gatos,)),
+        "hambre": (np.float64, (gatos,)),
+        "sed": (np.float64, (gatos,)),
+        "estres": (np.float64, (gatos,)),
+        "comodidad": (np.float64, (gatos,)),
+        "supervivencia": (np.float64, (gatos,)),
+        "estado": (np.uint8, (gatos,)),
+        "tiempo_en_estado": (np.int64, (gatos,)),
+        "destino_x": (np.int32, (gatos,)),
+        "destino_y": (np.int32, (gatos,)),
+        "reclamo": (np.int64, (gatos,)),
+        "depredador_x": (np.int32, (depredadores,)),
+        "depredador_y": (np.int32, (depredadores,)),
+    }
+
+
+def dividir_teselas(ancho, alto, teselas_x, teselas_y):
+    """Rectángulos (x0, x1, y0, y1) que cubren la grilla sin solaparse"""
+    cortes_x = np.linspace(0, ancho, teselas_x + 1).astype(int)
+    cortes_y = np.linspace(0, alto, teselas_y + 1).astype(int)
+    return [(int(cortes_x[i]), int(cortes_x[i + 1]), int(cortes_y[j]), int(cortes_y[j + 1]))
+            for j in range(teselas_y) for i in range(teselas_x)]
+
+
+class TrabajadorTeselas:
+    """Avanza las teselas asignadas a un proceso
+
+    Cada tick tiene tres fases separadas por barreras, y en cada una los datos que se
+    escriben pertenecen a una sola tesela:
+
+    1. decidir: gatos cuya celda está en la tesela. Copia la tesela con su halo (el
+       margen que ven los sensores) y elige estado y destino.
+    2. aplicar: gatos cuyo destino está en la tesela (así se entregan los gatos que
+       cruzan de tesela). Mueve, actualiza necesidades y reclama un recurso adyacente.
+       También mueve los depredadores que estaban en la tesela en la fase 1.
+    3. consumir: reclamos cuya celda está en la tesela. Gana el gato de menor índice;
+       después reaparecen recursos en las celdas vacías.
+
+    La grilla solo se escribe en la fase 3 y solo dentro de la propia tesela.
+    """
+
+    def __init__(self, memoria, parametros, teselas):
+        self.m = memoria
+        self.p = parametros
+        self.teselas = teselas
+        self._locales = [None] * len(teselas)
+
+        radio = max(parametros.rango_vision, parametros.rango_olfato)
+        desplazamientos = np.array(tabla_desplazamientos(radio), dtype=np.int64)
+        self.off_x = desplazamientos[:, 0]
+        self.off_y = desplazamientos[:, 1]
+        self.off_d2 = self.off_x*self.off_x + self.off_y*self.off_y
+
+    def _en(self, x, y, tesela):
+        x0, x1, y0, y1 = tesela
+        return (x >= x0) & (x < x1) & (y >= y0) & (y < y1)
+
+    # Fase 1
+    def decidir(self, tick):
+        for k, tesela in enumerate(self.teselas):
+            self._locales[k] = self._decidir_tesela(tick, tesela)
+
+    def _decidir_tesela(self, tick, tesela):
+        m, p = self.m, self.p
+        x0, x1, y0, y1 = tesela
+        hx0, hx1 = max(0, x0 - p.halo), min(p.ancho, x1 + p.halo)
+        hy0, hy1 = max(0, y0 - p.halo), min(p.alto, y1 + p.halo)
+        halo = m["grilla"][hx0:hx1, hy0:hy1].copy()
+
+        # Depredadores de la tesela: se mueven en la fase 2 (después de que todos los vieron)
+        depredadores = np.flatnonzero(self._en(m["depredador_x"], m["depredador_y"], tesela))
+        idx = np.flatnonzero(self._en(m["x"], m["y"], tesela))
+        local = (halo, (hx0, hy0), depredadores)
+        if len(idx) == 0:
+            return local
+        x = m["x"][idx].astype(np.int64)
+        y = m["y"][idx].astype(np.int64)
+
+        # Depredadores oídos (dentro del halo) y el más cercano
+        px = m["depredador_x"].astype(np.int64)
+        py = m["depredador_y"].astype(np.int64)
+        cerca = np.flatnonzero((px >= hx0) & (px < hx1) & (py >= hy0) & (py < hy1))
+        oido = max(p.rango_vision, p.rango_auditivo)
+        if len(cerca):
+            d2 = (px[cerca][None, :] - x[:, None])**2 + (py[cerca][None, :] - y[:, None])**2
+            hay_depredador = (d2 <= oido * oido).any(axis=1)
+            cercano = cerca[d2.argmin(axis=1)]
+        else:
+            hay_depredador = np.zeros(len(idx), dtype=bool)
+            cercano = np.zeros(len(idx), dtype=np.int64)
+
+        # Objetos alrededor de cada gato, ordenados por distancia
+        cx = x[:, None] + self.off_x[None, :]
+        cy = y[:, None] + self.off_y[None, :]
+        dentro = (cx >= 0) & (cx < p.ancho) & (cy >= 0) & (cy < p.alto)
+        celdas = np.where(dentro, halo[np.clip(cx - hx0, 0, hx1 - hx0 - 1),
+                                       np.clip(cy - hy0, 0, hy1 - hy0 - 1)], VACIO)
+        en_vision = (self.off_d2 <= p.rango_vision ** 2)[None, :]
+
+        hambre, sed = m["hambre"][idx], m["sed"][idx]
+        estado = evaluar_estados_vectorizado(
+            m["energia"][idx], hambre, sed, m["estres"][idx],
+            m["comodidad"][idx], m["supervivencia"][idx], hay_depredador, p.umbrales)
+
+        dx = np.zeros(len(idx), dtype=np.int64)
+        dy = np.zeros(len(idx), dtype=np.int64)
+        aleatorios = np.zeros(len(idx), dtype=bool)
+
+        g = estado == HUYENDO
+        dx[g] = np.sign(x[g] - px[cercano[g]])
+        dy[g] = np.sign(y[g] - py[cercano[g]])
+        m["estres"][idx[g]] += 5
+
+        g = estado == CAZANDO
+        u = p.umbrales
+        candidatos = (
+            ((hambre > u.hambre_caza)[:, None] & ((celdas == COMIDA) | (celdas == PRESA))) |
+            ((sed > u.sed_caza)[:, None] & (celdas == AGUA) & en_vision))
+        hay_objetivo, objetivo = candidatos.any(axis=1), candidatos.argmax(axis=1)
+        con = g & hay_objetivo
+        dx[con] = np.sign(self.off_x[objetivo[con]])
+        dy[con] = np.sign(self.off_y[objetivo[con]])
+        aleatorios |= g & ~hay_objetivo
+
+        refugios = (celdas == REFUGIO) & en_vision
+        hay_refugio, refugio = refugios.any(axis=1), refugios.argmax(axis=1)
+        g = estado == BUSCANDO_REFUGIO
+        con = g & hay_refugio
+        dx[con] = np.sign(self.off_x[refugio[con]])
+        dy[con] = np.sign(self.off_y[refugio[con]])
+        aleatorios |= g & ~hay_refugio
+
+        g = estado == DESCANSANDO
+        gi = idx[g]
+        m["energia"][gi] = np.minimum(100, m["energia"][gi] + 2)
+        m["comodidad"][gi] = np.minimum(100, m["comodidad"][gi] + 3)
+        m["estres"][gi] = np.maximum(0, m["estres"][gi] - 2)
+        con = g & hay_refugio
+        dx[con] = np.sign(self.off_x[refugio[con]])
+        dy[con] = np.sign(self.off_y[refugio[con]])
+
+        aleatorios |= estado == EXPLORANDO
+        if aleatorios.any():
+            sorteo = aleatorios_contador(p.semilla, FLUJO_EXPLORAR, tick, idx[aleatorios])
+            movimientos = MOVIMIENTOS[(sorteo % np.uint64(len(MOVIMIENTOS))).astype(np.int64)]
+            dx[aleatorios] = movimientos[:, 0]
+            dy[aleatorios] = movimientos[:, 1]
+
+        m["estado"][idx] = estado
+        m["tiempo_en_estado"][idx] += 1
+
+        # Como actualizar(): se paga el movimiento aunque el destino quede fuera de la grilla
+        m["energia"][idx] = np.maximum(0, m["energia"][idx] - np.sqrt(dx*dx + dy*dy) * p.tasa_energia)
+        nueva_x, nueva_y = x + dx, y + dy
+        valido = (nueva_x >= 0) & (nueva_x < p.ancho) & (nueva_y >= 0) & (nueva_y < p.alto)
+        m["destino_x"][idx] = np.where(valido, nueva_x, x)
+        m["destino_y"][idx] = np.where(valido, nueva_y, y)
+        return local
+
+    # Fase 2
+    def aplicar(self, tick):
+        for k, tesela in enumerate(self.teselas):
+            self._aplicar_tesela(tick, tesela, *self._locales[k])
+
+    def _aplicar_tesela(self, tick, tesela, halo, origen, depredadores):
+        m, p = self.m, self.p
+        hx0, hy0 = origen
+
+        if len(depredadores):
+            mueve = uniformes_contador(p.semilla, FLUJO_DEPREDADOR, tick, depredadores) < p.prob_depredador
+            quien = depredadores[mueve]
+            paso = aleatorios_contador(p.semilla, FLUJO_PASO_DEPREDADOR, tick, quien)
+            paso_x = (paso % np.uint64(3)).astype(np.int64) - 1
+            paso_y = ((paso >> np.uint64(32)) % np.uint64(3)).astype(np.int64) - 1
+            m["depredador_x"][quien] = np.clip(m["depredador_x"][quien] + paso_x, 0, p.ancho - 1)
+            m["depredador_y"][quien] = np.clip(m["depredador_y"][quien] + paso_y, 0, p.alto - 1)
+
+        idx = np.flatnonzero(self._en(m["destino_x"], m["destino_y"], tesela))
+        if len(idx) == 0:
+            return
+        x = m["destino_x"][idx].astype(np.int64)
+        y = m["destino_y"][idx].astype(np.int64)
+        m["x"][idx] = x
+        m["y"][idx] = y
+
+        # actualizar_necesidades
+        hambre = np.minimum(100, m["hambre"][idx] + p.tasa_hambre)
+        sed = np.minimum(100, m["sed"][idx] + p.tasa_sed)
+        energia = np.maximum(0, m["energia"][idx] - p.tasa_energia)
+        estres = m["estres"][idx]
+        estres = np.where(m["estado"][idx] == EXPLORANDO, np.maximum(0, estres - 0.2), estres)
+        comodidad = m["comodidad"][idx]
+        m["supervivencia"][idx] = (energia + (100 - hambre) + (100 - sed) + comodidad + (100 - estres)) / 5
+
+        # interactuar_con_objetos: refugios y juguetes vecinos; reclamar el primer recurso
+        reclamo = np.full(len(idx), -1, dtype=np.int64)
+        ancho_h, alto_h = halo.shape
+        for vx, vy in VECINOS:
+            cx, cy = x + vx, y + vy
+            dentro = (cx >= 0) & (cx < p.ancho) & (cy >= 0) & (cy < p.alto)
+            celda = np.where(dentro, halo[np.clip(cx - hx0, 0, ancho_h - 1),
+                                          np.clip(cy - hy0, 0, alto_h - 1)], VACIO)
+            g = celda == REFUGIO
+            comodidad = np.where(g, np.minimum(100, comodidad + 5), comodidad)
+            estres = np.where(g, np.maximum(0, estres - 3), estres)
+            g = celda == JUGUETE
+            estres = np.where(g, np.maximum(0, estres - 2), estres)
+            comodidad = np.where(g, np.minimum(100, comodidad + 2), comodidad)
+            consume = (((celda == COMIDA) & (hambre > p.umbrales.hambre_comer)) |
+                       ((celda == AGUA) & (sed > p.umbrales.sed_beber)))
+            nuevo = consume & (reclamo < 0)
+            reclamo[nuevo] = cx[nuevo] * p.alto + cy[nuevo]
+
+        m["hambre"][idx], m["sed"][idx], m["energia"][idx] = hambre, sed, energia
+        m["estres"][idx], m["comodidad"][idx] = estres, comodidad
+        m["reclamo"][idx] = reclamo
+
+    # Fase 3
+    def consumir(self, tick):
+        for tesela in self.teselas:
+            self._consumir_tesela(tick, tesela)
+
+    def _consumir_tesela(self, tick, tesela):
+        m, p = self.m, self.p
+        x0, x1, y0, y1 = tesela
+        grilla = m["grilla"]
+
+        reclamo = m["reclamo"]
+        rx, ry = reclamo // p.alto, reclamo % p.alto
+        idx = np.flatnonzero((reclamo >= 0) & self._en(rx, ry, tesela))
+        if len(idx):
+            # idx ya está ordenado: el primer reclamo de cada celda es el del menor índice
+            _, primero = np.unique(reclamo[idx], return_index=True)
+            ganadores = idx[primero]
+            gx, gy = rx[ganadores], ry[ganadores]
+            tipo = grilla[gx, gy]
+            g = ganadores[tipo == COMIDA]
+            m["hambre"][g] = np.maximum(0, m["hambre"][g] - 30)
+            m["energia"][g] = np.minimum(100, m["energia"][g] + 20)
+            g = ganadores[tipo == AGUA]
+            m["sed"][g] = np.maximum(0, m["sed"][g] - 30)
+            grilla[gx, gy] = VACIO
+
+        # regenerar_recursos, por celda: la probabilidad depende solo de la celda y el tick
+        bloque = grilla[x0:x1, y0:y1]
+        vacias = np.flatnonzero(bloque == VACIO)
+        if len(vacias) and p.tasa_regeneracion > 0:
+            alto_t = y1 - y0
+            celdas = (x0 + vacias // alto_t) * p.alto + (y0 + vacias % alto_t)
+            nacen = uniformes_contador(p.semilla, FLUJO_REGENERACION, tick, celdas) < p.tasa_regeneracion
+            if nacen.any():
+                sorteo = aleatorios_contador(p.semilla, FLUJO_TIPO_REGENERACION, tick, celdas[nacen])
+                tipos = TIPOS_REGENERACION[(sorteo % np.uint64(len(TIPOS_REGENERACION))).astype(np.int64)]
+                nuevas = vacias[nacen]
+                grilla[x0 + nuevas // alto_t, y0 + nuevas % alto_t] = tipos
+
+
+def _trabajar(nombre, parametros, teselas, inicio, fases):
+    """Bucle de un proceso: espera una orden, avanza `control[1]` ticks y avisa al terminar"""
+    # Los hijos comparten el rastreador de recursos del proceso que creó el bloque
+    memoria = BloqueCompartido.adjuntar(nombre, rastrear=True)
+    trabajador = TrabajadorTeselas(memoria, parametros, teselas)
+    control = memoria["control"]
+    try:
+        while True:
+            inicio.wait()
+            tick0, ticks = int(control[0]), int(control[1])
+            if ticks < 0:
+                break
+            for tick in range(tick0, tick0 + ticks):
+                trabajador.decidir(tick)
+                fases.wait()
+                trabajador.aplicar(tick)
+                fases.wait()
+                trabajador.consumir(tick)
+                fases.wait()
+            inicio.wait()
+    except BaseException:
+        # Rompe las barreras para que el proceso principal no espere para siempre
+        inicio.abort()
+        fases.abort()
+        raise
+    finally:
+        del trabajador, control
+        memoria.cerrar()
+
+
+class MundoParalelo:
+    """Mundo grande con muchos gatos, dividido en teselas que avanzan en varios procesos
+
+    Los arreglos del mundo viven en memoria compartida (`memoria`), cada proceso avanza
+    sus teselas (ver TrabajadorTeselas) y todos se sincronizan con barreras entre fases.
+    Con `nombre`, otros procesos pueden mapear el bloque (BloqueCompartido.adjuntar) y
+    leerlo entre llamadas a `avanzar`.
+    Los sorteos usan un generador por contador, así que para una misma semilla el
+    resultado no depende del número de procesos ni de teselas. Con `procesos=0` todo
+    corre en el proceso actual (útil para comparar).
+
+    Respecto de SimulacionGato: un objeto fijo por celda, sin memoria ni línea de visión,
+    y el refugio y el recurso objetivo son los más cercanos en vez de los primeros en la
+    lista de objetos.
+    """
+
+    def __init__(self, ancho=256, alto=256, gatos=1000, depredadores=20, semilla=0,
+                 teselas=(2, 2), procesos=None, densidades=DENSIDADES,
+                 prob_depredador=0.3, tasa_regeneracion=0.02 / 400, nombre=None,
+                 umbrales=UMBRALES_BASE):
+        plantilla = AgenteGato(0, 0)
+        rango = max(plantilla.rango_vision, plantilla.rango_olfato, plantilla.rango_auditivo)
+        self.parametros = ParametrosMundo(
+            ancho, alto, semilla,
+            # El halo cubre el mayor sensor y la vecindad del destino en la fase 2
+            rango + 2,
+            plantilla.rango_vision, plantilla.rango_olfato, plantilla.rango_auditivo,
+            plantilla.tasa_hambre, plantilla.tasa_sed, plantilla.tasa_energia,
+            prob_depredador, tasa_regeneracion, umbrales,
+        )
+        self.teselas = dividir_teselas(ancho, alto, *teselas)
+        self.tick = 0
+        self.campos = campos_mundo(ancho, alto, gatos, depredadores)
+        self.memoria = BloqueCompartido(self.campos, nombre, esquema="mundo_paralelo")
+        with self.memoria.escribiendo(tick=0):
+            self._generar(gatos, depredadores, densidades, plantilla)
+
+        if procesos is None:
+            procesos = min(os.cpu_count() or 1, len(self.teselas))
+        self.procesos = procesos
+        self._procesos = []
+        if procesos == 0:
+            self._local = TrabajadorTeselas(self.memoria, self.parametros, self.teselas)
+        else:
+            self._iniciar_procesos(procesos)
+
+    def _generar(self, gatos, depredadores, densidades, plantilla):
+        p = self.parametros
+        rng = np.random.default_rng(p.semilla)
+        m = self.memoria
+        grilla = m["grilla"]
+        grilla[:] = VACIO
+        total = p.ancho * p.alto
+        libres = rng.permutation(total)
+        usados = 0
+        for tipo, densidad in densidades.items():
+            n = min(int(round(densidad * total)), total - usados)
+            celdas = libres[usados:usados + n]
+            grilla.reshape(-1)[celdas] = CODIGO_OBJETO[tipo]
+            usados += n
+
+        m["x"][:] = rng.integers(0, p.ancho, size=gatos)
+        m["y"][:] = rng.integers(0, p.alto, size=gatos)
+        m["energia"][:] = plantilla.energia
+        m["hambre"][:] = plantilla.hambre
+        m["sed"][:] = plantilla.sed
+        m["estres"][:] = plantilla.estres
+        m["comodidad"][:] = plantilla.comodidad
+        m["supervivencia"][:] = plantilla.supervivencia
+        m["estado"][:] = EXPLORANDO
+        m["tiempo_en_estado"][:] = 0
+        m["reclamo"][:] = -1
+        m["depredador_x"][:] = rng.integers(0, p.ancho, size=depredadores)
+        m["depredador_y"][:] = rng.integers(0, p.alto, size=depredadores)
+
+    def _iniciar_procesos(self, procesos):
+        self._inicio = mp.Barrier(procesos + 1)
+        self._fases = mp.Barrier(procesos)
+        for i in range(procesos):
+            propias = self.teselas[i::procesos]
+            proceso = mp.Process(target=_trabajar, name=f"teselas-{i}", daemon=True,
+                                 args=(self.memoria.nombre, self.parametros,
+                                       propias, self._inicio, self._fases))
+            proceso.start()
+            self._procesos.append(proceso)
+
+    def __getitem__(self, clave):
+        return self.memoria[clave]
+
+    def avanzar(self, ticks=1):
+        """Avanza `ticks` ticks (los procesos corren todos los ticks sin volver a esperar)"""
+        if ticks <= 0:
+            return
+        with self.memoria.escribiendo(tick=self.tick + ticks):
+            if self.procesos == 0:
+                for tick in range(self.tick, self.tick + ticks):
+                    self._local.decidir(tick)
+                    self._local.aplicar(tick)
+                    self._local.consumir(tick)
+            else:
+                control = self.memoria["control"]
+                control[0], control[1] = self.tick, ticks
+                self._inicio.wait()
+                self._inicio.wait()
+        self.tick += ticks
+
+    def resumen(self):
+        """Gatos por estado y promedios de las necesidades"""
+        m = self.memoria
+        return {
+            "tick": self.tick,
+            "estados": np.bincount(m["estado"], minlength=7).tolist(),
+            "recursos": int(np.isin(m["grilla"], (COMIDA, AGUA, PRESA)).sum()),
+            **{clave: float(m[clave].mean()) for clave in
+               ("energia", "hambre", "sed", "estres", "comodidad", "supervivencia")},
+        }
+
+    def cerrar(self):
+        if self._procesos:
+            self.memoria["control"][1] = -1
+            self._inicio.wait()
+            for proceso in self._procesos:
+                proceso.join()
+            self._procesos = []
+        self._local = None
+        self.memoria.cerrar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mundo grande con teselas en varios procesos")
+    parser.add_argument("--ancho", type=int, default=512)
+    parser.add_argument("--alto", type=int, default=512)
+    parser.add_argument("--gatos", type=int, default=20000)
+    parser.add_argument("--depredadores", type=int, default=200)
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--teselas", type=int, nargs=2, default=(4, 4))
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    with MundoParalelo(args.ancho, args.alto, args.gatos, args.depredadores, args.semilla,
+                       tuple(args.teselas), args.procesos) as mundo:
+        inicio = time.perf_counter()
+        mundo.avanzar(args.ticks)
+        duracion = time.perf_counter() - inicio
+        print(f"{args.ticks} ticks en {duracion:.2f} s con {mundo.procesos} procesos "
+              f"({args.ticks * args.gatos / duracion:,.0f} gatos-tick/s)")
+        print(mundo.resumen())
@@ -0,0 +1,156 @@
+from functools import lru_cache
+
+from simuOpti import TipoObjeto, GRID_SIZE
+
+# Octantes para el sombreado recursivo (multiplicadores xx, xy, yx, yy)
+OCTANTES = [
+    (1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+    (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1),
+]
+
+TIPOS_OLFATO = (TipoObjeto.COMIDA, TipoObjeto.PRESA)
+
+
+@lru_cache(maxsize=None)
+def tabla_desplazamientos(radio):
+    """Desplazamientos (dx, dy) dentro del radio euclídeo, ordenados por distancia"""
+    desplazamientos = [(dx, dy)
+                       for dx in range(-radio, radio + 1)
+                       for dy in range(-radio, radio + 1)
+                       if dx*dx + dy*dy <= radio*radio]
+    desplazamientos.sort(key=lambda d: d[0]*d[0] + d[1]*d[1])
+    return tuple(desplazamientos)
+
+
+class CampoVision:
+    """Ocupación de la grilla y visibilidad con línea de visión
+
+    Los obstáculos bloquean la vista (sombreado recursivo por octantes); la visibilidad se
+    calcula una vez por celda y radio y se invalida solo cuando cambian los obstáculos.
+    El olfato (comida y presas) y el oído (depredadores) no necesitan línea de visión y
+    usan las tablas de desplazamientos por radio.
+    """
+
+    def __init__(self, ancho=GRID_SIZE, alto=GRID_SIZE):
+        self.ancho = ancho
+        self.alto = alto
+        self.ocupacion = {}
+        self.obstaculos = frozenset()
+        self._visibles = {}
+        self._celdas_radio = {}
+
+    # Ocupación
+    def reconstruir(self, objetos_entorno):
+        """Vuelve a indexar todos los objetos (al generar el entorno)"""
+        self.ocupacion = {}
+        for obj in objetos_entorno:
+            self.ocupacion.setdefault((obj.x, obj.y), []).append(obj)
+        obstaculos = frozenset((obj.x, obj.y) for obj in objetos_entorno
+                               if obj.tipo == TipoObjeto.OBSTACULO and obj.activo)
+        if obstaculos != self.obstaculos:
+            self.obstaculos = obstaculos
+            self._visibles.clear()
+
+    def agregar(self, obj):
+        self.ocupacion.setdefault((obj.x, obj.y), []).append(obj)
+        if obj.tipo == TipoObjeto.OBSTACULO:
+            self.obstaculos = self.obstaculos | {(obj.x, obj.y)}
+            self._visibles.clear()
+
+    def mover(self, obj, x_ant, y_ant):
+        celda = self.ocupacion.get((x_ant, y_ant))
+        if celda is not None and obj in celda:
+            celda.remove(obj)
+            if not celda:
+                del self.ocupacion[(x_ant, y_ant)]
+        self.ocupacion.setdefault((obj.x, obj.y), []).append(obj)
+        if obj.tipo == TipoObjeto.OBSTACULO:
+            self.obstaculos = (self.obstaculos - {(x_ant, y_ant)}) | {(obj.x, obj.y)}
+            self._visibles.clear()
+
+    # Geometría
+    def celdas_en_radio(self, x, y, radio):
+        """Celdas dentro de la grilla a distancia <= radio (sin línea de visión)"""
+        clave = (x, y, radio)
+        celdas = self._celdas_radio.get(clave)
+        if celdas is None:
+            celdas = tuple((x + dx, y + dy) for dx, dy in tabla_desplazamientos(radio)
+                           if 0 <= x + dx < self.ancho and 0 <= y + dy < self.alto)
+            self._celdas_radio[clave] = celdas
+        return celdas
+
+    def visibles(self, x, y, radio):
+        """Celdas visibles desde (x, y) hasta el radio (en caché por celda)"""
+        clave = (x, y, radio)
+        celdas = self._visibles.get(clave)
+        if celdas is None:
+            visibles = {(x, y)}
+            for octante in OCTANTES:
+                self._proyectar(x, y, radio, 1, 1.0, 0.0, octante, visibles)
+            celdas = frozenset(visibles)
+            self._visibles[clave] = celdas
+        return celdas
+
+    def _proyectar(self, cx, cy, radio, fila, inicio, fin, octante, visibles):
+        if inicio < fin:
+            return
+        xx, xy, yx, yy = octante
+        radio2 = radio * radio
+        for j in range(fila, radio + 1):
+            dx, dy = -j - 1, -j
+            bloqueado = False
+            nuevo_inicio = inicio
+            while dx <= 0:
+                dx += 1
+                x = cx + dx * xx + dy * xy
+                y = cy + dx * yx + dy * yy
+                pendiente_izq = (dx - 0.5) / (dy + 0.5)
+                pendiente_der = (dx + 0.5) / (dy - 0.5)
+                if inicio < pendiente_der:
+                    continue
+                if fin > pendiente_izq:
+                    break
+                dentro = 0 <= x < self.ancho and 0 <= y < self.alto
+                if dentro and dx*dx + dy*dy <= radio2:
+                    visibles.add((x, y))
+                opaco = not dentro or (x, y) in self.obstaculos
+                if bloqueado:
+                    if opaco:
+                        nuevo_inicio = pendiente_der
+                        continue
+                    bloqueado = False
+                    inicio = nuevo_inicio
+                elif opaco and j < radio:
+                    bloqueado = True
+                    self._proyectar(cx, cy, radio, j + 1, inicio, pendiente_izq, octante, visibles)
+                    nuevo_inicio = pendiente_der
+            if bloqueado:
+                break
+
+    # Percepción
+    def percibir(self, gato):
+        """Objetos activos que el gato ve, huele u oye"""
+        ocupacion = self.ocupacion
+        percibidos = []
+        visibles = self.visibles(gato.x, gato.y, gato.rango_vision)
+        for celda in visibles:
+            for obj in ocupacion.get(celda, ()):
+                if obj.activo:
+                    percibidos.append(obj)
+
+        # Con campo de olor la comida no visible se sigue por el rastro (AgenteGato.cazar)
+        if gato.campo_olor is None:
+            for celda in self.celdas_en_radio(gato.x, gato.y, gato.rango_olfato):
+                if celda in visibles:
+                    continue
+                for obj in ocupacion.get(celda, ()):
+                    if obj.activo and obj.tipo in TIPOS_OLFATO:
+                        percibidos.append(obj)
+
+        for celda in self.celdas_en_radio(gato.x, gato.y, gato.rango_auditivo):
+            if celda in visibles:
+                continue
+            for obj in ocupacion.get(celda, ()):
+                if obj.activo and obj.tipo == TipoObjeto.DEPREDADOR:
+                    percibidos.append(obj)
+        return percibidos
@@ -0,0 +1,246 @@
+import argparse
+import time
+import numpy as np
+
+from simuOpti import TipoObjeto, GRID_SIZE, TipoEvento
+
+# Movimientos candidatos; quedarse quieto primero (índice 0)
+PASOS_X = np.array([0, 1, -1, 0, 0, 1, 1, -1, -1], dtype=np.int64)
+PASOS_Y = np.array([0, 0, 0, 1, -1, 1, -1, 1, -1], dtype=np.int64)
+
+TIPOS_MOVILES = (TipoObjeto.DEPREDADOR, TipoObjeto.PRESA)
+
+
+class Persecucion:
+    """Depredadores que persiguen a los gatos y presas que huyen, todos en arreglos
+
+    Un solo campo de distancias (BFS de 8 vecinos desde las celdas de los gatos, rodeando
+    los obstáculos y hasta `radio` pasos) guía a todos: dentro del radio cada depredador
+    elige la vecina más cercana a un gato con probabilidad `prob_persecucion` y cada presa
+    la más lejana con probabilidad `prob_huida`; fuera del radio caminan al azar
+    (`prob_paseo_depredador`, `prob_paseo_presa`). El campo se recalcula solo si los gatos
+    o los obstáculos cambiaron.
+
+    Colisiones: nadie entra en un obstáculo, en la celda de un gato ni en una celda ocupada
+    al empezar el tick por otro móvil; si varios eligen la misma celda libre, gana uno al
+    azar y el resto se queda. Así dos móviles nunca terminan en la misma celda (salvo los
+    que ya estaban juntos, p. ej. una presa que reaparece sobre otra). Todo el tick son
+    operaciones de arreglos, sin recorrer los móviles en Python.
+    """
+
+    def __init__(self, ancho=GRID_SIZE, alto=GRID_SIZE, radio=8, prob_persecucion=0.5,
+                 prob_huida=0.5, prob_paseo_depredador=0.3, prob_paseo_presa=0.1):
+        self.ancho = ancho
+        self.alto = alto
+        self.radio = radio
+        self.prob_persecucion = prob_persecucion
+        self.prob_huida = prob_huida
+        self.prob_paseo_depredador = prob_paseo_depredador
+        self.prob_paseo_presa = prob_paseo_presa
+
+        # Grillas con un borde de una celda (índice [x + 1, y + 1]); el borde no es libre
+        forma = (ancho + 2, alto + 2)
+        self.libre = np.zeros(forma, dtype=bool)
+        self.libre[1:-1, 1:-1] = True
+        self.distancia = np.full(forma, radio + 1, dtype=np.int32)
+        self._frontera = np.zeros(forma, dtype=bool)
+        self._siguiente = np.zeros(forma, dtype=bool)
+        self._fila = np.zeros(forma, dtype=bool)
+        self._visitado = np.zeros(forma, dtype=bool)
+        self._fuentes = None
+
+        self.objetos = []
+        self.x = np.zeros(0, dtype=np.int64)
+        self.y = np.zeros(0, dtype=np.int64)
+        self.es_depredador = np.zeros(0, dtype=bool)
+        self.activo = np.zeros(0, dtype=bool)
+        # Último tick: índices que se movieron y sus celdas anteriores
+        self.movidos = np.zeros(0, dtype=np.int64)
+        self.x_ant = np.zeros(0, dtype=np.int64)
+        self.y_ant = np.zeros(0, dtype=np.int64)
+
+    # Mundo
+    def reconstruir(self, objetos_entorno):
+        """Vuelve a indexar obstáculos y móviles (al generar o restaurar el entorno)"""
+        self.libre[1:-1, 1:-1] = True
+        moviles = []
+        for obj in objetos_entorno:
+            if obj.tipo == TipoObjeto.OBSTACULO and obj.activo:
+                self.libre[obj.x + 1, obj.y + 1] = False
+            elif obj.tipo in TIPOS_MOVILES:
+                moviles.append(obj)
+        self.objetos = moviles
+        self.x = np.array([obj.x for obj in moviles], dtype=np.int64)
+        self.y = np.array([obj.y for obj in moviles], dtype=np.int64)
+        self.es_depredador = np.array([obj.tipo == TipoObjeto.DEPREDADOR for obj in moviles],
+                                      dtype=bool)
+        self.activo = np.array([obj.activo for obj in moviles], dtype=bool)
+        self.movidos = np.zeros(0, dtype=np.int64)
+        self._fuentes = None
+
+    def agregar(self, obj):
+        if obj.tipo == TipoObjeto.OBSTACULO:
+            self.libre[obj.x + 1, obj.y + 1] = False
+            self._fuentes = None
+        elif obj.tipo in TIPOS_MOVILES:
+            self.objetos.append(obj)
+            self.x = np.append(self.x, obj.x)
+            self.y = np.append(self.y, obj.y)
+            self.es_depredador = np.append(self.es_depredador, obj.tipo == TipoObjeto.DEPREDADOR)
+            self.activo = np.append(self.activo, obj.activo)
+
+    # Campo de distancias
+    def campo_distancias(self, gatos_x, gatos_y):
+        """Pasos (8 vecinos) hasta el gato más cercano; radio + 1 más allá del radio"""
+        fuentes = (tuple(np.asarray(gatos_x).tolist()), tuple(np.asarray(gatos_y).tolist()))
+        if fuentes == self._fuentes:
+            return self.distancia
+        d = self.distancia
+        frontera, siguiente, fila, visitado = self._frontera, self._siguiente, self._fila, self._visitado
+        d.fill(self.radio + 1)
+        frontera.fill(False)
+        frontera[np.asarray(gatos_x) + 1, np.asarray(gatos_y) + 1] = True
+        np.copyto(visitado, frontera)
+        np.copyto(d, 0, where=frontera)
+        for paso in range(1, self.radio + 1):
+            # Dilatación de 8 vecinos separable: primero en x, después en y
+            np.copyto(fila, frontera)
+            fila[1:] |= frontera[:-1]
+            fila[:-1] |= frontera[1:]
+            np.copyto(siguiente, fila)
+            siguiente[:, 1:] |= fila[:, :-1]
+            siguiente[:, :-1] |= fila[:, 1:]
+            siguiente &= self.libre
+            np.greater(siguiente, visitado, out=siguiente)  # y no visitada
+            if not siguiente.any():
+                break
+            visitado |= siguiente
+            np.copyto(d, paso, where=siguiente)
+            frontera, siguiente = siguiente, frontera
+        self._frontera, self._siguiente = frontera, siguiente
+        self._fuentes = fuentes
+        return d
+
+    # Movimiento
+    def paso(self, gatos_x, gatos_y, rng):
+        """Mueve todos los móviles un tick; devuelve los índices de los que se movieron"""
+        n = len(self.x)
+        if n == 0:
+            self.movidos = np.zeros(0, dtype=np.int64)
+            return self.movidos
+        d = self.campo_distancias(gatos_x, gatos_y)
+        filas = np.arange(n)
+
+        cx = self.x[:, None] + PASOS_X
+        cy = self.y[:, None] + PASOS_Y
+        distancia = d[cx + 1, cy + 1]
+        posible = self.libre[cx + 1, cy + 1] & (distancia != 0)
+        posible[:, 0] = True
+
+        # Dirigido: la vecina posible más cerca (depredador) o más lejos (presa) del gato;
+        # el ruido menor que 1 desempata al azar
+        puntaje = np.where(self.es_depredador[:, None], distancia, -distancia) + rng.random((n, 9))
+        puntaje[~posible] = np.inf
+        dirigido = np.argmin(puntaje, axis=1)
+
+        # Paseo: una vecina al azar, o quedarse si no es posible
+        paseo = rng.integers(1, 9, n)
+        paseo = np.where(posible[filas, paseo], paseo, 0)
+
+        cerca = distancia[:, 0] <= self.radio
+        prob = np.where(self.es_depredador,
+                        np.where(cerca, self.prob_persecucion, self.prob_paseo_depredador),
+                        np.where(cerca, self.prob_huida, self.prob_paseo_presa))
+        eleccion = np.where(rng.random(n) < prob, np.where(cerca, dirigido, paseo), 0)
+        eleccion[~self.activo] = 0
+
+        # Colisiones: solo hacia celdas que nadie ocupa al empezar el tick, un ganador por celda
+        alto = self.alto + 2
+        ocupadas = np.zeros((self.ancho + 2) * alto, dtype=bool)
+        ocupadas[(self.x[self.activo] + 1) * alto + self.y[self.activo] + 1] = True
+        candidatos = np.flatnonzero(eleccion)
+        destino_x = cx[candidatos, eleccion[candidatos]]
+        destino_y = cy[candidatos, eleccion[candidatos]]
+        celdas = (destino_x + 1) * alto + destino_y + 1
+        libres = ~ocupadas[celdas]
+        candidatos, destino_x, destino_y, celdas = (candidatos[libres], destino_x[libres],
+                                                    destino_y[libres], celdas[libres])
+        orden = rng.permutation(len(candidatos))
+        _, primeros = np.unique(celdas[orden], return_index=True)
+        ganadores = orden[primeros]
+
+        self.movidos = candidatos[ganadores]
+        self.x_ant = self.x[self.movidos]
+        self.y_ant = self.y[self.movidos]
+        self.x[self.movidos] = destino_x[ganadores]
+        self.y[self.movidos] = destino_y[ganadores]
+        return self.movidos
+
+    def movio_cerca(self, x, y, alcance2):
+        """Algún móvil del último tick salió de o entró a distancia² <= alcance2 de (x, y)"""
+        m = self.movidos
+        if len(m) == 0:
+            return False
+        antes = (self.x_ant - x)**2 + (self.y_ant - y)**2 <= alcance2
+        despues = (self.x[m] - x)**2 + (self.y[m] - y)**2 <= alcance2
+        return bool((antes | despues).any())
+
+    def mover(self, sim):
+        """Un tick en la simulación: mueve los móviles y actualiza sus objetos"""
+        gato = sim.gato
+        movidos = self.paso([gato.x], [gato.y], sim.flujos.depredadores.generador)
+        # Los objetos del mundo se actualizan solo para los que se movieron
+        for i, x, y, x_ant, y_ant in zip(movidos.tolist(), self.x[movidos].tolist(),
+                                         self.y[movidos].tolist(), self.x_ant.tolist(),
+                                         self.y_ant.tolist()):
+            obj = self.objetos[i]
+            obj.x, obj.y = x, y
+            if sim.campo_vision is not None:
+                sim.campo_vision.mover(obj, x_ant, y_ant)
+            if sim.campo_olor is not None:
+                sim.campo_olor.mover(obj, x_ant, y_ant)
+            if sim.registrador is not None:
+                sim.registrador.registrar_evento(TipoEvento.MOVIMIENTO, obj, x_ant, y_ant)
+
+
+def mundo_aleatorio(ancho, alto, depredadores, presas, gatos, obstaculos, rng):
+    """Persecucion con móviles y obstáculos en celdas distintas al azar, y los gatos"""
+    n = depredadores + presas + gatos + obstaculos
+    celdas = rng.choice(ancho * alto, size=n, replace=False)
+    x, y = celdas // alto, celdas % alto
+    p = Persecucion(ancho, alto)
+    fin_moviles = depredadores + presas
+    p.libre[x[fin_moviles + gatos:] + 1, y[fin_moviles + gatos:] + 1] = False
+    p.x, p.y = x[:fin_moviles].astype(np.int64), y[:fin_moviles].astype(np.int64)
+    p.es_depredador = np.arange(fin_moviles) < depredadores
+    p.activo = np.ones(fin_moviles, dtype=bool)
+    return p, x[fin_moviles:fin_moviles + gatos], y[fin_moviles:fin_moviles + gatos]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tiempo por tick de la persecución vectorizada")
+    parser.add_argument("--ancho", type=int, default=512)
+    parser.add_argument("--alto", type=int, default=512)
+    parser.add_argument("--depredadores", type=int, default=2000)
+    parser.add_argument("--presas", type=int, default=2000)
+    parser.add_argument("--gatos", type=int, default=100)
+    parser.add_argument("--obstaculos", type=int, default=5000)
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semilla)
+    persecucion, gatos_x, gatos_y = mundo_aleatorio(args.ancho, args.alto, args.depredadores,
+                                                    args.presas, args.gatos, args.obstaculos, rng)
+    movidos = 0
+    inicio = time.perf_counter()
+    for _ in range(args.ticks):
+        # Los gatos se mueven cada tick, así que el campo se recalcula siempre
+        gatos_x = np.clip(gatos_x + rng.integers(-1, 2, len(gatos_x)), 0, args.ancho - 1)
+        gatos_y = np.clip(gatos_y + rng.integers(-1, 2, len(gatos_y)), 0, args.alto - 1)
+        movidos += len(persecucion.paso(gatos_x, gatos_y, rng))
+    duracion = time.perf_counter() - inicio
+    celdas = persecucion.x * args.alto + persecucion.y
+    print(f"{args.ticks} ticks con {len(persecucion.x)} móviles: "
+          f"{duracion / args.ticks * 1000:.2f} ms por tick, {movidos / args.ticks:.0f} movimientos "
+          f"por tick, {len(celdas) - len(np.unique(celdas))} celdas compartidas")
@@ -0,0 +1,336 @@
+import copy
+import math
+import time
+import numpy as np
+
+from simuOpti import EstadoMental, TipoObjeto, GRID_SIZE
+
+# Acciones del modelo: quedarse quieto y los 8 vecinos
+ACCIONES = np.array([(0, 0), (0, 1), (0, -1), (1, 0), (-1, 0),
+                     (1, 1), (1, -1), (-1, 1), (-1, -1)], dtype=np.int64)
+COSTO_ACCION = np.sqrt((ACCIONES ** 2).sum(axis=1))
+
+# Objetos que cambian las necesidades al estar al lado (como interactuar_con_objetos)
+TIPOS_RECURSO = (TipoObjeto.COMIDA, TipoObjeto.AGUA, TipoObjeto.REFUGIO,
+                 TipoObjeto.JUGUETE, TipoObjeto.HUMANO)
+CODIGO_RECURSO = {tipo: i for i, tipo in enumerate(TIPOS_RECURSO)}
+COMIDA, AGUA, REFUGIO, JUGUETE, HUMANO = range(len(TIPOS_RECURSO))
+
+# Estados en los que el planificador elige el movimiento en lugar de la regla reactiva
+ESTADOS_PLANIFICADOS = (EstadoMental.CAZANDO, EstadoMental.HUYENDO, EstadoMental.BUSCANDO_REFUGIO)
+
+PROB_MOVER_DEPREDADOR = 0.3
+
+# Celdas como índice x * GRID_SIZE + y; DESTINO[celda, acción] respeta los bordes
+CELDA_X, CELDA_Y = np.divmod(np.arange(GRID_SIZE * GRID_SIZE), GRID_SIZE)
+_NX = CELDA_X[:, None] + ACCIONES[:, 0]
+_NY = CELDA_Y[:, None] + ACCIONES[:, 1]
+DESTINO = np.where((_NX >= 0) & (_NX < GRID_SIZE) & (_NY >= 0) & (_NY < GRID_SIZE),
+                   _NX * GRID_SIZE + _NY, np.arange(GRID_SIZE * GRID_SIZE)[:, None])
+
+
+class ModeloMundo:
+    """Copia mínima, en arreglos, de lo que el gato percibe y recuerda
+
+    Los recursos salen de lo percibido y de la memoria; los depredadores, solo de lo
+    percibido. `simular` avanza muchas continuaciones a la vez (una por fila) con las
+    mismas reglas de necesidades e interacción que AgenteGato, simplificadas: a lo sumo un
+    consumo por tick y depredadores que caminan al azar.
+    """
+
+    def __init__(self, gato):
+        conocidos = {id(obj): obj for obj in gato.memoria.values() if obj.activo}
+        for obj in gato.objetos_percibidos:
+            conocidos[id(obj)] = obj
+        recursos = [obj for obj in conocidos.values() if obj.tipo in CODIGO_RECURSO]
+        depredadores = [obj for obj in gato.objetos_percibidos if obj.tipo == TipoObjeto.DEPREDADOR]
+
+        self.firma = frozenset(id(obj) for obj in recursos)
+        self.dep_x = np.array([obj.x for obj in depredadores], dtype=np.int64)
+        self.dep_y = np.array([obj.y for obj in depredadores], dtype=np.int64)
+
+        self.celda = gato.x * GRID_SIZE + gato.y
+        self.necesidades = (gato.energia, gato.hambre, gato.sed, gato.estres, gato.comodidad)
+        self.tasa_hambre = gato.tasa_hambre
+        self.tasa_sed = gato.tasa_sed
+        self.tasa_energia = gato.tasa_energia
+        self.umbrales = gato.umbrales
+        self.alcance_oido = max(gato.rango_vision, gato.rango_auditivo) ** 2
+
+        # Tablas por celda: los recursos no se mueven, así que "estar al lado" se precalcula
+        # y cada tick es una lectura por fila. Comida y agua se consumen (máscara por fila);
+        # refugios, juguetes y humanos no, y se resumen en un efecto fijo por celda.
+        rec_x = np.array([obj.x for obj in recursos], dtype=np.int64)
+        rec_y = np.array([obj.y for obj in recursos], dtype=np.int64)
+        tipo = np.array([CODIGO_RECURSO[obj.tipo] for obj in recursos], dtype=np.int64)
+        al_lado = ((np.abs(rec_x - CELDA_X[:, None]) <= 1)
+                   & (np.abs(rec_y - CELDA_Y[:, None]) <= 1))
+        self.comida_cerca = al_lado[:, tipo == COMIDA]
+        self.agua_cerca = al_lado[:, tipo == AGUA]
+        refugios = al_lado[:, tipo == REFUGIO].sum(axis=1)
+        juguetes = al_lado[:, tipo == JUGUETE].sum(axis=1)
+        self.mejora_comodidad = 5.0 * refugios + 2.0 * juguetes
+        self.alivio_estres = 3.0 * refugios + 2.0 * juguetes
+        self.humanos = 3.0 * al_lado[:, tipo == HUMANO].sum(axis=1)
+
+    def simular(self, acciones, rng, descuento):
+        """Supervivencia media descontada (0 a 1) de cada fila de `acciones` (filas x ticks)"""
+        filas, horizonte = acciones.shape
+        celda = np.full(filas, self.celda, dtype=np.int64)
+        energia, hambre, sed, estres, comodidad = (np.full(filas, float(v)) for v in self.necesidades)
+        comida = np.ones((filas, self.comida_cerca.shape[1]), dtype=bool)
+        agua = np.ones((filas, self.agua_cerca.shape[1]), dtype=bool)
+        hay_comida, hay_agua = comida.shape[1] > 0, agua.shape[1] > 0
+        dep_x = np.tile(self.dep_x, (filas, 1))
+        dep_y = np.tile(self.dep_y, (filas, 1))
+        todas = np.arange(filas)
+        tasa_energia = COSTO_ACCION * self.tasa_energia + self.tasa_energia
+
+        total = np.zeros(filas)
+        peso, pesos = 1.0, 0.0
+        for t in range(horizonte):
+            accion = acciones[:, t]
+            celda = DESTINO[celda, accion]
+            # Costo del movimiento y actualizar_necesidades
+            energia = np.maximum(0, energia - tasa_energia[accion])
+            hambre = np.minimum(100, hambre + self.tasa_hambre)
+            sed = np.minimum(100, sed + self.tasa_sed)
+
+            # interactuar_con_objetos
+            come = bebe = None
+            if hay_comida:
+                cerca = comida & self.comida_cerca[celda]
+                come = cerca.any(axis=1) & (hambre > self.umbrales.hambre_comer)
+                if come.any():
+                    comida[todas[come], cerca.argmax(axis=1)[come]] = False
+                    hambre = np.where(come, np.maximum(0, hambre - 30), hambre)
+                    energia = np.where(come, np.minimum(100, energia + 20), energia)
+            if hay_agua:
+                cerca = agua & self.agua_cerca[celda]
+                bebe = cerca.any(axis=1) & (sed > self.umbrales.sed_beber)
+                if come is not None:
+                    bebe &= ~come
+                if bebe.any():
+                    agua[todas[bebe], cerca.argmax(axis=1)[bebe]] = False
+                    sed = np.where(bebe, np.maximum(0, sed - 30), sed)
+            comodidad = np.minimum(100, comodidad + self.mejora_comodidad[celda]
+                                   + self.humanos[celda] * (estres < self.umbrales.estres_humano))
+            estres = np.maximum(0, estres - self.alivio_estres[celda])
+
+            # Depredadores: caminata al azar; oír uno hace huir (estrés como en huir)
+            if len(self.dep_x):
+                mueve = rng.random(dep_x.shape) < PROB_MOVER_DEPREDADOR
+                dep_x = np.clip(dep_x + mueve * rng.integers(-1, 2, dep_x.shape), 0, GRID_SIZE - 1)
+                dep_y = np.clip(dep_y + mueve * rng.integers(-1, 2, dep_y.shape), 0, GRID_SIZE - 1)
+                oido = ((dep_x - CELDA_X[celda, None]) ** 2 + (dep_y - CELDA_Y[celda, None]) ** 2
+                        <= self.alcance_oido).any(axis=1)
+                estres = np.where(oido, estres + 5, estres)
+
+            supervivencia = energia - hambre - sed + comodidad - estres
+            total += peso * supervivencia
+            pesos += peso
+            peso *= descuento
+        # (energia + (100 - hambre) + (100 - sed) + comodidad + (100 - estres)) / 5
+        return (total / pesos + 300) / 500
+
+
+class Nodo:
+    """Nodo de lazo abierto: estadísticas de una secuencia de acciones desde la raíz"""
+
+    def __init__(self):
+        self.hijos = {}
+        self.visitas = 0
+        self.valor = 0.0
+
+
+class PlanificadorMCTS:
+    """Política de AgenteGato por búsqueda de Monte Carlo en árbol (UCT) sobre ModeloMundo
+
+    Se conecta con `SimulacionGato(politica=...)` (o `gato.politica`) y elige el movimiento
+    en los `estados` dados; en los demás decide la regla reactiva. Cada iteración baja por
+    el árbol con UCT hasta `profundidad`, expande de una vez todas las acciones del nodo y
+    evalúa cada una con `rollouts` continuaciones al azar hasta `horizonte` ticks, todas en
+    un solo lote de NumPy. Itera hasta agotar `presupuesto_ms` por tick o, si se da
+    `iteraciones`, exactamente esa cantidad (corridas reproducibles). Sin `rng`, al
+    conectarse a una simulación sortea de un flujo derivado del flujo del gato, así que la
+    semilla de la simulación también fija los sorteos del planificador.
+
+    Después de decidir conserva el subárbol de la acción elegida y lo usa como raíz en el
+    tick siguiente si el gato llegó a la celda prevista y conoce los mismos recursos.
+    """
+
+    def __init__(self, presupuesto_ms=10.0, horizonte=20, profundidad=4, rollouts=16,
+                 exploracion=0.05, descuento=0.95, iteraciones=None,
+                 estados=ESTADOS_PLANIFICADOS, rng=None):
+        self.presupuesto_ms = presupuesto_ms
+        self.horizonte = max(horizonte, profundidad + 1)
+        self.profundidad = profundidad
+        self.rollouts = rollouts
+        self.exploracion = exploracion
+        self.descuento = descuento
+        self.iteraciones = iteraciones
+        self.estados = frozenset(estados)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.rng_propio = rng is not None
+
+        self.raiz = None
+        self._gato = None
+        self._esperado = None
+        self._firma = None
+        self.ultimas_iteraciones = 0
+        self.reutilizaciones = 0
+
+    def reiniciar(self):
+        self.raiz = None
+        self._gato = None
+
+    def conectar(self, flujos):
+        """Sin `rng` propio, toma un generador derivado del flujo del gato de `flujos`"""
+        if not self.rng_propio:
+            semilla = flujos.gato.generador.bit_generator.seed_seq.spawn(1)[0]
+            self.rng = np.random.Generator(np.random.Philox(semilla))
+
+    def copiar(self):
+        """Planificador independiente con los mismos parámetros y una copia del generador"""
+        copia = PlanificadorMCTS(self.presupuesto_ms, self.horizonte, self.profundidad,
+                                 self.rollouts, self.exploracion, self.descuento, self.iteraciones,
+                                 self.estados, copy.deepcopy(self.rng))
+        copia.rng_propio = self.rng_propio
+        return copia
+
+    # Puntos de control
+    def arbol(self):
+        """Subárbol guardado para el próximo tick, en preorden: (padre, acción, visitas, valor)"""
+        padres, acciones, visitas, valores = [], [], [], []
+        pila = [] if self.raiz is None else [(self.raiz, -1, -1)]
+        while pila:
+            nodo, padre, accion = pila.pop()
+            i = len(padres)
+            padres.append(padre)
+            acciones.append(accion)
+            visitas.append(nodo.visitas)
+            valores.append(nodo.valor)
+            # Al revés en la pila, para recorrer (y recrear) los hijos en su orden
+            pila.extend(reversed([(hijo, i, a) for a, hijo in nodo.hijos.items()]))
+        return (np.array(padres, dtype=np.int32), np.array(acciones, dtype=np.int8),
+                np.array(visitas, dtype=np.int64), np.array(valores, dtype=np.float64))
+
+    def cargar_arbol(self, padres, acciones, visitas, valores):
+        nodos = []
+        for padre, accion, n, valor in zip(padres.tolist(), acciones.tolist(),
+                                           visitas.tolist(), valores.tolist()):
+            nodo = Nodo()
+            nodo.visitas = n
+            nodo.valor = valor
+            if padre >= 0:
+                nodos[padre].hijos[accion] = nodo
+            nodos.append(nodo)
+        self.raiz = nodos[0] if nodos else None
+
+    def capturar(self, gato, indice):
+        """Estado del planificador como (metadatos, arreglos); `indice`: id(objeto) -> posición
+
+        Incluye el generador y, si se reutilizaría en el próximo tick, el subárbol con la
+        celda prevista y los recursos conocidos (como posiciones en el mundo).
+        """
+        meta = {"rng": self.rng.bit_generator.state, "rng_propio": self.rng_propio}
+        arreglos = {}
+        if (self.raiz is not None and self._gato is gato
+                and all(i in indice for i in self._firma)):
+            arreglos = dict(zip(("arbol_padre", "arbol_accion", "arbol_visitas", "arbol_valor"),
+                                self.arbol()))
+            arreglos["firma"] = np.array(sorted(indice[i] for i in self._firma), dtype=np.int32)
+            meta["esperado"] = list(self._esperado)
+        return meta, arreglos
+
+    def restaurar(self, meta, arreglos, gato, objetos):
+        # El generador capturado puede ser de otro tipo (un rng propio frente al de la simulación)
+        tipo = getattr(np.random, meta["rng"]["bit_generator"])
+        if not isinstance(self.rng.bit_generator, tipo):
+            self.rng = np.random.Generator(tipo())
+        self.rng.bit_generator.state = meta["rng"]
+        self.rng_propio = meta["rng_propio"]
+        self.reiniciar()
+        if "arbol_padre" in arreglos:
+            self.cargar_arbol(arreglos["arbol_padre"], arreglos["arbol_accion"],
+                              arreglos["arbol_visitas"], arreglos["arbol_valor"])
+            self._gato = gato
+            self._esperado = tuple(meta["esperado"])
+            self._firma = frozenset(id(objetos[i]) for i in arreglos["firma"].tolist())
+
+    def _raiz_para(self, gato, modelo):
+        if (self.raiz is not None and self._gato is gato and self._firma == modelo.firma
+                and self._esperado == (gato.x, gato.y)):
+            self.reutilizaciones += 1
+            return self.raiz
+        return Nodo()
+
+    def _uct(self, padre, hijo):
+        return (hijo.valor / hijo.visitas
+                + self.exploracion * math.sqrt(math.log(padre.visitas) / hijo.visitas))
+
+    def _iterar(self, raiz, modelo):
+        camino = [raiz]
+        prefijo = []
+        nodo = raiz
+        while len(nodo.hijos) == len(ACCIONES) and len(prefijo) < self.profundidad:
+            accion, nodo = max(nodo.hijos.items(), key=lambda par: self._uct(camino[-1], par[1]))
+            camino.append(nodo)
+            prefijo.append(accion)
+
+        nuevas = []
+        if len(prefijo) < self.profundidad:
+            nuevas = [a for a in range(len(ACCIONES)) if a not in nodo.hijos]
+        grupos = max(len(nuevas), 1)
+
+        acciones = self.rng.integers(0, len(ACCIONES), size=(grupos * self.rollouts, self.horizonte))
+        acciones[:, :len(prefijo)] = prefijo
+        if nuevas:
+            acciones[:, len(prefijo)] = np.repeat(nuevas, self.rollouts)
+        valores = modelo.simular(acciones, self.rng, self.descuento)
+        valores = valores.reshape(grupos, self.rollouts).mean(axis=1)
+
+        for accion, valor in zip(nuevas, valores.tolist()):
+            hijo = nodo.hijos[accion] = Nodo()
+            hijo.visitas = 1
+            hijo.valor = valor
+        suma = float(valores.sum())
+        for visitado in camino:
+            visitado.visitas += grupos
+            visitado.valor += suma
+
+    def decidir(self, gato):
+        """Movimiento (dx, dy) para el gato, o None si su estado no se planifica"""
+        if gato.estado not in self.estados:
+            return None
+        limite = time.perf_counter() + self.presupuesto_ms / 1000
+        modelo = ModeloMundo(gato)
+        raiz = self._raiz_para(gato, modelo)
+
+        n = 0
+        mas_lenta = 0.0
+        while True:
+            antes = time.perf_counter()
+            self._iterar(raiz, modelo)
+            n += 1
+            if self.iteraciones is not None:
+                if n >= self.iteraciones:
+                    break
+            else:
+                # No empezar una iteración que puede no terminar dentro del presupuesto
+                ahora = time.perf_counter()
+                mas_lenta = max(mas_lenta, ahora - antes)
+                if ahora + mas_lenta >= limite:
+                    break
+        self.ultimas_iteraciones = n
+
+        accion = max(raiz.hijos, key=lambda a: raiz.hijos[a].visitas)
+        dx, dy = (int(v) for v in ACCIONES[accion])
+        nx, ny = gato.x + dx, gato.y + dy
+        if not (0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE):
+            nx, ny = gato.x, gato.y
+        self.raiz = raiz.hijos[accion]
+        self._gato = gato
+        self._esperado = (nx, ny)
+        self._firma = modelo.firma
+        return (dx, dy)
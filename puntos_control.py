@@ -0,0 +1,321 @@
+import argparse
+import copy
+import io
+import json
+import os
+import struct
+import time
+from collections import deque
+import numpy as np
+
+from simuOpti import SimulacionGato, EstadoMental, TipoObjeto, ObjetoEntorno, Escenario, Umbrales
+from registro import CODIGO_OBJETO, TIPOS_OBJETO
+from aleatorio import FlujosSimulacion
+from percepcion import CampoVision
+from olfato import CampoOlor
+from persecucion import Persecucion
+from mapas import VistaMapa
+
+MAGIA = b"GATOSNAP"
+VERSION_PUNTO = 2
+
+# Cabecera: magia, versión, largo del JSON de metadatos y largo del .npz de arreglos
+CABECERA = struct.Struct("<8sIIQ")
+
+# Objetos del mundo en el orden de sim.objetos_entorno (las referencias se guardan como índices)
+REGISTRO_PUNTO_OBJETO = np.dtype([
+    ("x", "<i4"),
+    ("y", "<i4"),
+    ("objeto", "u1"),
+    ("valor_recurso", "<f8"),
+    ("activo", "u1"),
+])
+
+# Atributos escalares del gato que se copian tal cual (conservan int o float)
+ESCALARES_GATO = (
+    "x", "y", "energia", "hambre", "sed", "estres", "comodidad", "supervivencia",
+    "tiempo_en_estado", "planificar", "replanificaciones",
+    "rango_vision", "rango_olfato", "rango_auditivo", "velocidad", "puede_trepar",
+    "maullido_cooldown", "alpha", "gamma", "epsilon",
+    "recompensa_acumulada", "decisiones_eficientes", "decisiones_totales",
+    "tasa_hambre", "tasa_sed", "tasa_energia",
+)
+
+MAPAS_GATO = ("mapa_calor_recursos", "mapa_calor_peligros", "mapa_visitas")
+
+
+def _pares(pares, dtype=np.int32):
+    return np.array(list(pares), dtype=dtype).reshape(-1, 2)
+
+
+def _escenario_a_json(escenario):
+    return [escenario.nombre, [[tipo.name, n] for tipo, n in escenario.cantidades],
+            escenario.prob_depredador]
+
+
+def _escenario_desde_json(datos):
+    nombre, cantidades, prob_depredador = datos
+    return Escenario(nombre, tuple((TipoObjeto[tipo], n) for tipo, n in cantidades), prob_depredador)
+
+
+def _componentes(sim):
+    """Componentes opcionales activos: un punto de control solo se restaura con los mismos"""
+    mapa = sim.mapa
+    return {
+        "campo_vision": sim.campo_vision is not None,
+        "campo_olor": sim.campo_olor is not None,
+        "persecucion": sim.persecucion is not None,
+        "mapa": None if mapa is None else [mapa.archivo.ancho, mapa.archivo.alto, mapa.archivo.trozo],
+        "politica": None if sim.politica is None else type(sim.politica).__name__,
+    }
+
+
+def capturar(sim):
+    """Estado completo de la simulación como (metadatos JSON, arreglos de NumPy)
+
+    Los objetos del mundo van en un arreglo de registros; la memoria del gato, su objetivo
+    y lo percibido se guardan como índices en ese arreglo, así que al restaurar siguen
+    apuntando a los mismos objetos. Los arreglos son copias: el estado capturado no cambia
+    aunque la simulación siga avanzando.
+    """
+    gato = sim.gato
+    objetos = sim.objetos_entorno
+    indice = {id(obj): i for i, obj in enumerate(objetos)}
+
+    def indices(lista):
+        try:
+            return np.array([indice[id(obj)] for obj in lista], dtype=np.int32)
+        except KeyError:
+            raise ValueError("El gato referencia un objeto que no está en el mundo") from None
+
+    registros = np.zeros(len(objetos), dtype=REGISTRO_PUNTO_OBJETO)
+    if objetos:
+        registros[:] = [(obj.x, obj.y, CODIGO_OBJETO[obj.tipo], obj.valor_recurso, obj.activo)
+                        for obj in objetos]
+
+    claves = [tuple(int(v) for v in clave.split(",")) for clave in gato.memoria]
+    arreglos = {
+        "objetos": registros,
+        "memoria_celdas": _pares(claves),
+        "memoria_objetos": indices(gato.memoria.values()),
+        "percibidos": indices(gato.objetos_percibidos),
+        "objetivo": indices([] if gato.objetivo_actual is None else [gato.objetivo_actual]),
+        "historia": _pares(gato.historia_posiciones),
+        "plan": _pares(gato.plan),
+        "zonas_exploradas": _pares(sorted(gato.zonas_exploradas)),
+    }
+    for nombre in MAPAS_GATO:
+        arreglos[nombre] = getattr(gato, nombre).copy()
+    if sim.campo_olor is not None:
+        arreglos["olor"] = sim.campo_olor.olor.copy()
+    if sim.mapa is not None:
+        arreglos["mapa_trozos"], arreglos["mapa_objetos"] = sim.mapa.cambios()
+
+    meta = {
+        "tiempo_simulacion": sim.tiempo_simulacion,
+        "componentes": _componentes(sim),
+        "escenario": _escenario_a_json(sim.escenario),
+        "gato": {nombre: getattr(gato, nombre) for nombre in ESCALARES_GATO},
+        "estado": gato.estado.name,
+        "umbrales": list(gato.umbrales),
+        "destino_plan": None if gato.destino_plan is None else list(gato.destino_plan),
+        "azar": sim.flujos.estado(),
+    }
+    if sim.mapa is not None:
+        meta["mapa_origen"] = list(sim.mapa.origen)
+    # La política (p. ej. PlanificadorMCTS) guarda su generador y lo que reutiliza entre ticks
+    if hasattr(sim.politica, "capturar"):
+        meta["politica"], arreglos_politica = sim.politica.capturar(gato, indice)
+        for clave, arreglo in arreglos_politica.items():
+            arreglos[f"politica/{clave}"] = arreglo
+    meta["gato"]["historia_max"] = gato.historia_posiciones.maxlen
+    return meta, arreglos
+
+
+def restaurar(sim, meta, arreglos):
+    """Deja `sim` en el estado capturado (los registradores y el publicador se conservan)
+
+    `sim` debe tener los mismos componentes opcionales que la simulación capturada (visión,
+    olor, persecución, mapa y política); si no, ValueError.
+    """
+    actuales = _componentes(sim)
+    if meta["componentes"] != actuales:
+        diferencias = "; ".join(f"{nombre}: {valor!r} en el punto, {actuales[nombre]!r} en la simulación"
+                                for nombre, valor in meta["componentes"].items()
+                                if actuales.get(nombre) != valor)
+        raise ValueError(f"El punto de control no coincide con la simulación ({diferencias}): "
+                         f"hay que crearla con los mismos componentes")
+    sim.escenario = _escenario_desde_json(meta["escenario"])
+    sim.flujos.restaurar(meta["azar"])
+    sim.tiempo_simulacion = meta["tiempo_simulacion"]
+
+    sim.objetos_entorno = objetos = []
+    for x, y, codigo, valor, activo in arreglos["objetos"].tolist():
+        obj = ObjetoEntorno(x, y, TIPOS_OBJETO[codigo], valor)
+        obj.activo = bool(activo)
+        objetos.append(obj)
+    if sim.mapa is not None:
+        sim.mapa.restaurar(meta["mapa_origen"], arreglos["mapa_trozos"], arreglos["mapa_objetos"])
+    if sim.campo_vision is not None:
+        sim.campo_vision.reconstruir(objetos)
+    if sim.persecucion is not None:
+        sim.persecucion.reconstruir(objetos)
+    if sim.campo_olor is not None:
+        sim.campo_olor.reconstruir(objetos)
+        sim.campo_olor.olor[:] = arreglos["olor"]
+
+    gato = sim.gato = sim.crear_gato()
+    escalares = dict(meta["gato"])
+    gato.historia_posiciones = deque(map(tuple, arreglos["historia"].tolist()),
+                                     maxlen=escalares.pop("historia_max"))
+    for nombre, valor in escalares.items():
+        setattr(gato, nombre, valor)
+    gato.estado = EstadoMental[meta["estado"]]
+    gato.umbrales = Umbrales(*meta["umbrales"])
+    gato.memoria = {f"{cx},{cy}": objetos[i] for (cx, cy), i in
+                    zip(arreglos["memoria_celdas"].tolist(), arreglos["memoria_objetos"].tolist())}
+    gato.objetos_percibidos = [objetos[i] for i in arreglos["percibidos"].tolist()]
+    objetivo = arreglos["objetivo"].tolist()
+    gato.objetivo_actual = objetos[objetivo[0]] if objetivo else None
+    gato.plan = deque(map(tuple, arreglos["plan"].tolist()))
+    gato.destino_plan = None if meta["destino_plan"] is None else tuple(meta["destino_plan"])
+    gato.zonas_exploradas = set(map(tuple, arreglos["zonas_exploradas"].tolist()))
+    for nombre in MAPAS_GATO:
+        getattr(gato, nombre)[:] = arreglos[nombre]
+    if "politica" in meta and hasattr(sim.politica, "restaurar"):
+        prefijo = "politica/"
+        sim.politica.restaurar(meta["politica"],
+                               {clave[len(prefijo):]: arreglo for clave, arreglo in arreglos.items()
+                                if clave.startswith(prefijo)},
+                               gato, objetos)
+
+    if sim.registrador is not None:
+        sim.registrador.registrar_entorno(sim)
+    if sim.publicador is not None:
+        sim.publicador.publicar(sim)
+    return sim
+
+
+def bifurcar(sim, registrador=None, metricas=None, publicador=None):
+    """Copia independiente de `sim` en este proceso, sin pasar por disco ni por __init__
+
+    Sirve para abrir muchas continuaciones desde un mismo momento. La copia no tiene
+    pantalla ni telemetría y usa un CampoVision, un CampoOlor, una Persecucion, una VistaMapa y
+    una política propios si el original los usa; fuentes, capas y el archivo del mapa
+    se comparten con el original.
+    """
+    copia = copy.copy(sim)
+    copia.screen = None
+    copia.telemetria = None
+    copia.registrador = registrador
+    copia.metricas = metricas
+    copia.publicador = publicador
+    if sim.campo_vision is not None:
+        copia.campo_vision = CampoVision(sim.campo_vision.ancho, sim.campo_vision.alto)
+    if sim.campo_olor is not None:
+        o = sim.campo_olor
+        copia.campo_olor = CampoOlor(o.ancho, o.alto, o.difusion, o.decaimiento, o.intensidad,
+                                     o.subpasos, o.umbral)
+    if sim.persecucion is not None:
+        p = sim.persecucion
+        copia.persecucion = Persecucion(p.ancho, p.alto, p.radio, p.prob_persecucion, p.prob_huida,
+                                        p.prob_paseo_depredador, p.prob_paseo_presa)
+    if sim.mapa is not None:
+        m = sim.mapa
+        copia.mapa = VistaMapa(m.archivo, m.margen, m.capacidad, m.precarga)
+    if sim.politica is not None:
+        # Con la misma política, continuaciones corridas una tras otra se cambiarían los sorteos
+        copiar = getattr(sim.politica, "copiar", None)
+        copia.politica = copiar() if copiar is not None else copy.deepcopy(sim.politica)
+    # Flujos propios; su estado se reemplaza al restaurar
+    copia.flujos = FlujosSimulacion(sim.flujos.semilla)
+    meta, arreglos = capturar(sim)
+    return restaurar(copia, meta, arreglos)
+
+
+# Formato en disco: los arreglos del estado del azar van al .npz y en el JSON queda su clave
+def _separar(valor, clave, arreglos):
+    if isinstance(valor, np.ndarray):
+        arreglos[clave] = valor
+        return {"arreglo": clave}
+    if isinstance(valor, dict):
+        return {k: _separar(v, f"{clave}/{k}", arreglos) for k, v in valor.items()}
+    return valor
+
+
+def _unir(valor, arreglos):
+    if isinstance(valor, dict):
+        if set(valor) == {"arreglo"}:
+            return arreglos[valor["arreglo"]]
+        return {k: _unir(v, arreglos) for k, v in valor.items()}
+    return valor
+
+
+def guardar(sim, ruta, comprimir=True):
+    """Escribe un punto de control de `sim` en `ruta` (reemplaza el archivo de forma atómica)"""
+    meta, arreglos = capturar(sim)
+    meta["azar"] = _separar(meta["azar"], "azar", arreglos)
+    if "politica" in meta:
+        meta["politica"] = _separar(meta["politica"], "politica_meta", arreglos)
+    meta["version"] = VERSION_PUNTO
+
+    datos = io.BytesIO()
+    (np.savez_compressed if comprimir else np.savez)(datos, **arreglos)
+    texto = json.dumps(meta).encode("utf-8")
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(CABECERA.pack(MAGIA, VERSION_PUNTO, len(texto), datos.tell()))
+        archivo.write(texto)
+        archivo.write(datos.getbuffer())
+    os.replace(temporal, ruta)
+
+
+def leer(ruta):
+    """Lee un punto de control: (metadatos, arreglos)"""
+    with open(ruta, "rb") as archivo:
+        cabecera = archivo.read(CABECERA.size)
+        if len(cabecera) < CABECERA.size:
+            raise ValueError(f"{ruta} no es un punto de control de la simulación")
+        magia, version, largo_meta, largo_arreglos = CABECERA.unpack(cabecera)
+        if magia != MAGIA:
+            raise ValueError(f"{ruta} no es un punto de control de la simulación")
+        if version != VERSION_PUNTO:
+            raise ValueError(f"Versión de punto de control {version} no soportada "
+                             f"(se esperaba {VERSION_PUNTO})")
+        meta = json.loads(archivo.read(largo_meta))
+        with np.load(io.BytesIO(archivo.read(largo_arreglos))) as npz:
+            arreglos = {clave: npz[clave] for clave in npz.files}
+    meta["azar"] = _unir(meta["azar"], arreglos)
+    if "politica" in meta:
+        meta["politica"] = _unir(meta["politica"], arreglos)
+    return meta, arreglos
+
+
+def cargar(ruta, **opciones):
+    """Simulación nueva restaurada desde `ruta`; `opciones` van a SimulacionGato"""
+    meta, arreglos = leer(ruta)
+    opciones.setdefault("mostrar", False)
+    return restaurar(SimulacionGato(**opciones), meta, arreglos)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Corrida sin pantalla con puntos de control")
+    parser.add_argument("ruta", help="Archivo del punto de control")
+    parser.add_argument("--ticks", type=int, default=100_000)
+    parser.add_argument("--cada", type=int, default=10_000, help="Guardar cada N ticks")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--continuar", action="store_true",
+                        help="Retomar desde el punto de control existente")
+    args = parser.parse_args()
+
+    if args.continuar and os.path.exists(args.ruta):
+        sim = cargar(args.ruta)
+        print(f"Retomando en el tick {sim.tiempo_simulacion}")
+    else:
+        sim = SimulacionGato(mostrar=False, semilla=args.semilla)
+    while sim.tiempo_simulacion < args.ticks:
+        sim.ejecutar_sin_pantalla(min(args.cada, args.ticks - sim.tiempo_simulacion))
+        inicio = time.perf_counter()
+        guardar(sim, args.ruta)
+        print(f"Tick {sim.tiempo_simulacion}: punto de control en "
+              f"{(time.perf_counter() - inicio) * 1000:.1f} ms")
@@ -0,0 +1,235 @@
+import json
+import os
+import numpy as np
+
+from simuOpti import EstadoMental, TipoObjeto, TipoEvento
+
+# Versión del formato en disco
+VERSION_REGISTRO = 2
+
+# Códigos compactos (uint8) para los enums
+ESTADOS = list(EstadoMental)
+TIPOS_OBJETO = list(TipoObjeto)
+TIPOS_EVENTO = list(TipoEvento)
+CODIGO_ESTADO = {estado: i for i, estado in enumerate(ESTADOS)}
+CODIGO_OBJETO = {tipo: i for i, tipo in enumerate(TIPOS_OBJETO)}
+CODIGO_EVENTO = {tipo: i for i, tipo in enumerate(TIPOS_EVENTO)}
+
+# Registros de ancho fijo
+REGISTRO_TICK = np.dtype([
+    ("tick", "<u8"),  # tiempo_simulacion (vuelve a 0 al reiniciar)
+    ("x", "<i4"),
+    ("y", "<i4"),
+    ("estado", "u1"),
+    ("energia", "<f4"),
+    ("hambre", "<f4"),
+    ("sed", "<f4"),
+    ("estres", "<f4"),
+    ("comodidad", "<f4"),
+    ("supervivencia", "<f4"),
+])
+
+REGISTRO_EVENTO = np.dtype([
+    ("tick", "<u8"),  # fila de REGISTRO_TICK durante la que ocurrió el evento
+    ("evento", "u1"),
+    ("objeto", "u1"),
+    ("x", "<i4"),
+    ("y", "<i4"),
+    ("x_ant", "<i4"),
+    ("y_ant", "<i4"),
+])
+
+# Fotos clave del mundo: objetos activos en una fila de tick
+REGISTRO_OBJETO = np.dtype([
+    ("x", "<i4"),
+    ("y", "<i4"),
+    ("objeto", "u1"),
+])
+
+REGISTRO_FOTO = np.dtype([
+    ("tick", "<u8"),  # fila de REGISTRO_TICK que describe la foto
+    ("inicio", "<u8"),  # primer registro en objetos.bin
+    ("cantidad", "<u4"),
+])
+
+ARCHIVO_TICKS = "ticks.bin"
+ARCHIVO_EVENTOS = "eventos.bin"
+ARCHIVO_OBJETOS = "objetos.bin"
+ARCHIVO_FOTOS = "fotos.bin"
+ARCHIVO_META = "meta.json"
+
+
+class ArchivoCreciente:
+    """Arreglo de registros en un archivo mapeado en memoria que crece por bloques"""
+
+    def __init__(self, ruta, dtype, registros_por_bloque=1 << 16):
+        self.ruta = ruta
+        self.dtype = np.dtype(dtype)
+        self.registros_por_bloque = registros_por_bloque
+        self.n = 0
+        self.capacidad = 0
+        self.datos = None
+        open(self.ruta, "wb").close()
+        self._ampliar()
+
+    def _ampliar(self):
+        """Extiende el archivo un bloque y lo vuelve a mapear (sin copiar datos)"""
+        if self.datos is not None:
+            self.datos.flush()
+            self.datos = None
+        self.capacidad += self.registros_por_bloque
+        with open(self.ruta, "r+b") as f:
+            f.truncate(self.capacidad * self.dtype.itemsize)
+        self.datos = np.memmap(self.ruta, dtype=self.dtype, mode="r+",
+                               shape=(self.capacidad,))
+
+    def agregar(self, registro):
+        """Escribe un registro (tupla con los campos del dtype)"""
+        if self.n == self.capacidad:
+            self._ampliar()
+        self.datos[self.n] = registro
+        self.n += 1
+
+    def agregar_bloque(self, registros):
+        """Escribe un arreglo estructurado de registros"""
+        restantes = len(registros)
+        inicio = 0
+        while restantes:
+            if self.n == self.capacidad:
+                self._ampliar()
+            cantidad = min(restantes, self.capacidad - self.n)
+            self.datos[self.n:self.n + cantidad] = registros[inicio:inicio + cantidad]
+            self.n += cantidad
+            inicio += cantidad
+            restantes -= cantidad
+
+    def vaciar(self):
+        if self.datos is not None:
+            self.datos.flush()
+
+    def cerrar(self):
+        """Sincroniza y recorta el archivo a los registros escritos"""
+        if self.datos is None:
+            return
+        self.datos.flush()
+        self.datos = None
+        with open(self.ruta, "r+b") as f:
+            f.truncate(self.n * self.dtype.itemsize)
+
+
+class RegistradorTrayectoria:
+    """Graba por tick la posición, el estado y las necesidades del gato y los eventos del mundo"""
+
+    def __init__(self, directorio, registros_por_bloque=1 << 16, intervalo_fotos=1000):
+        os.makedirs(directorio, exist_ok=True)
+        self.directorio = directorio
+        self.intervalo_fotos = intervalo_fotos
+        self.ticks = ArchivoCreciente(os.path.join(directorio, ARCHIVO_TICKS),
+                                      REGISTRO_TICK, registros_por_bloque)
+        self.eventos = ArchivoCreciente(os.path.join(directorio, ARCHIVO_EVENTOS),
+                                        REGISTRO_EVENTO, max(1024, registros_por_bloque // 16))
+        self.objetos = ArchivoCreciente(os.path.join(directorio, ARCHIVO_OBJETOS),
+                                        REGISTRO_OBJETO, max(1024, registros_por_bloque // 16))
+        self.fotos = ArchivoCreciente(os.path.join(directorio, ARCHIVO_FOTOS),
+                                      REGISTRO_FOTO, 1024)
+        self._escribir_meta()
+
+    def registrar(self, sim):
+        """Guarda el estado del gato al final del tick actual"""
+        gato = sim.gato
+        fila = self.ticks.n
+        self.ticks.agregar((sim.tiempo_simulacion, gato.x, gato.y,
+                            CODIGO_ESTADO[gato.estado],
+                            gato.energia, gato.hambre, gato.sed,
+                            gato.estres, gato.comodidad, gato.supervivencia))
+        if fila % self.intervalo_fotos == 0:
+            self.registrar_foto(fila, sim.objetos_entorno)
+
+    def registrar_foto(self, fila, objetos_entorno):
+        """Guarda los objetos activos para poder saltar a esta fila sin repetir la corrida"""
+        inicio = self.objetos.n
+        for obj in objetos_entorno:
+            if obj.activo:
+                self.objetos.agregar((obj.x, obj.y, CODIGO_OBJETO[obj.tipo]))
+        self.fotos.agregar((fila, inicio, self.objetos.n - inicio))
+
+    def registrar_evento(self, tipo_evento, obj, x_ant=-1, y_ant=-1):
+        """Guarda un evento del mundo asociado a un objeto"""
+        # Los eventos se indexan por fila de tick (monótona aunque la simulación se reinicie)
+        self.eventos.agregar((self.ticks.n, CODIGO_EVENTO[tipo_evento],
+                              CODIGO_OBJETO[obj.tipo], obj.x, obj.y, x_ant, y_ant))
+
+    def registrar_entorno(self, sim):
+        """Marca un (re)inicio y registra cada objeto activo como aparición"""
+        self.eventos.agregar((self.ticks.n, CODIGO_EVENTO[TipoEvento.REINICIO], 0,
+                              sim.gato.x, sim.gato.y, -1, -1))
+        for obj in sim.objetos_entorno:
+            if obj.activo:
+                self.registrar_evento(TipoEvento.APARICION, obj)
+
+    def _escribir_meta(self):
+        meta = {
+            "version": VERSION_REGISTRO,
+            "ticks": self.ticks.n,
+            "eventos": self.eventos.n,
+            "objetos_fotos": self.objetos.n,
+            "fotos": self.fotos.n,
+            "intervalo_fotos": self.intervalo_fotos,
+            "estados": [e.value for e in ESTADOS],
+            "objetos": [t.value for t in TIPOS_OBJETO],
+            "tipos_evento": [t.value for t in TIPOS_EVENTO],
+        }
+        with open(os.path.join(self.directorio, ARCHIVO_META), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    def vaciar(self):
+        """Sincroniza los datos y actualiza la cantidad de registros en el encabezado"""
+        for archivo in (self.ticks, self.eventos, self.objetos, self.fotos):
+            archivo.vaciar()
+        self._escribir_meta()
+
+    def cerrar(self):
+        for archivo in (self.ticks, self.eventos, self.objetos, self.fotos):
+            archivo.cerrar()
+        self._escribir_meta()
+
+
+class Registro:
+    """Lectura sin copia de una corrida grabada"""
+
+    def __init__(self, directorio):
+        with open(os.path.join(directorio, ARCHIVO_META), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta["version"] != VERSION_REGISTRO:
+            raise ValueError(f"Versión de registro no soportada: {self.meta['version']}")
+        self.directorio = directorio
+        self.ticks = self._mapear(ARCHIVO_TICKS, REGISTRO_TICK, self.meta["ticks"])
+        self.eventos = self._mapear(ARCHIVO_EVENTOS, REGISTRO_EVENTO, self.meta["eventos"])
+        self.objetos = self._mapear(ARCHIVO_OBJETOS, REGISTRO_OBJETO, self.meta["objetos_fotos"])
+        self.fotos = self._mapear(ARCHIVO_FOTOS, REGISTRO_FOTO, self.meta["fotos"])
+        self.intervalo_fotos = self.meta["intervalo_fotos"]
+
+    def _mapear(self, nombre, dtype, n):
+        if n == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(os.path.join(self.directorio, nombre), dtype=dtype,
+                         mode="r", shape=(n,))
+
+    def estados(self):
+        """Estados mentales como enums (decodifica la columna de códigos)"""
+        return [ESTADOS[c] for c in self.ticks["estado"]]
+
+    def foto_anterior(self, fila):
+        """Índice de la última foto clave en o antes de la fila (acceso O(1))"""
+        i = min(fila // self.intervalo_fotos, len(self.fotos) - 1)
+        # Las fotos se toman cada intervalo_fotos filas; el ajuste cubre corridas truncadas
+        while i > 0 and self.fotos["tick"][i] > fila:
+            i -= 1
+        return i
+
+    def eventos_entre(self, desde, hasta):
+        """Eventos con fila en (desde, hasta]"""
+        ticks = self.eventos["tick"]
+        inicio = np.searchsorted(ticks, desde, side="right")
+        fin = np.searchsorted(ticks, hasta, side="right")
+        return self.eventos[inicio:fin]
@@ -0,0 +1,195 @@
+import argparse
+import pygame
+
+from simuOpti import (SimulacionGato, AgenteGato, ObjetoEntorno, TipoEvento,
+                      WINDOW_WIDTH, WINDOW_HEIGHT, INFO_PANEL_WIDTH, GRID_SIZE,
+                      WHITE, GRAY, YELLOW)
+from registro import Registro, ESTADOS, TIPOS_OBJETO, CODIGO_EVENTO
+
+EVENTO_APARICION = CODIGO_EVENTO[TipoEvento.APARICION]
+EVENTO_CONSUMO = CODIGO_EVENTO[TipoEvento.CONSUMO]
+EVENTO_MOVIMIENTO = CODIGO_EVENTO[TipoEvento.MOVIMIENTO]
+EVENTO_REINICIO = CODIGO_EVENTO[TipoEvento.REINICIO]
+
+VELOCIDADES = [0.25, 0.5, 1, 2, 5, 10, 50, 100, 1000, 10000]
+
+
+class ReproductorGato(SimulacionGato):
+    """Reproduce una corrida grabada reutilizando el dibujo de la simulación"""
+
+    def __init__(self, registro):
+        # Una corrida cortada antes del primer tick no tiene nada que mostrar
+        if len(registro.ticks) == 0:
+            raise ValueError(f"grabación vacía: {registro.directorio}")
+        self.screen = pygame.display.set_mode((WINDOW_WIDTH + INFO_PANEL_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption("Reproducción: Agente Gato Doméstico")
+        self.clock = pygame.time.Clock()
+        self.font = pygame.font.Font(None, 24)
+        self.small_font = pygame.font.Font(None, 18)
+        # La grabación no tiene los mapas de calor del gato: sin capas
+        self.capas = []
+
+        self.registro = registro
+        self.registrador = None
+        self.gato = AgenteGato(GRID_SIZE//2, GRID_SIZE//2)
+        self.objetos_entorno = []
+        self.tiempo_simulacion = 0
+
+        self.running = True
+        self.paused = False
+        self.indice_velocidad = VELOCIDADES.index(1)
+        self.arrastrando = False
+
+        # Fila mostrada (entera) y posición fraccional para velocidades < 1
+        self.fila = -1
+        self.posicion = 0.0
+        self.ir_a(0)
+
+    @property
+    def total_filas(self):
+        return len(self.registro.ticks)
+
+    def ir_a(self, fila):
+        """Reconstruye el mundo en la fila indicada"""
+        fila = max(0, min(self.total_filas - 1, int(fila)))
+        registro = self.registro
+        if 0 <= self.fila <= fila < self.fila + registro.intervalo_fotos:
+            # Avance corto: aplicar solo los eventos nuevos
+            self._aplicar_eventos(registro.eventos_entre(self.fila, fila))
+        else:
+            # Salto: partir de la foto clave anterior
+            i = registro.foto_anterior(fila)
+            foto = registro.fotos[i]
+            inicio = int(foto["inicio"])
+            objetos = registro.objetos[inicio:inicio + int(foto["cantidad"])]
+            self.objetos_entorno = [ObjetoEntorno(int(o["x"]), int(o["y"]), TIPOS_OBJETO[o["objeto"]])
+                                    for o in objetos]
+            self._aplicar_eventos(registro.eventos_entre(int(foto["tick"]), fila))
+        self.fila = fila
+        self.posicion = float(fila)
+        self._actualizar_gato(registro.ticks[fila])
+
+    def _buscar(self, tipo, x, y):
+        for i, obj in enumerate(self.objetos_entorno):
+            if obj.tipo == tipo and obj.x == x and obj.y == y:
+                return i
+        return None
+
+    def _aplicar_eventos(self, eventos):
+        for evento in eventos:
+            codigo = evento["evento"]
+            tipo = TIPOS_OBJETO[evento["objeto"]]
+            x, y = int(evento["x"]), int(evento["y"])
+            if codigo == EVENTO_APARICION:
+                self.objetos_entorno.append(ObjetoEntorno(x, y, tipo))
+            elif codigo == EVENTO_CONSUMO:
+                i = self._buscar(tipo, x, y)
+                if i is not None:
+                    self.objetos_entorno.pop(i)
+            elif codigo == EVENTO_MOVIMIENTO:
+                i = self._buscar(tipo, int(evento["x_ant"]), int(evento["y_ant"]))
+                if i is not None:
+                    self.objetos_entorno[i].x = x
+                    self.objetos_entorno[i].y = y
+            elif codigo == EVENTO_REINICIO:
+                self.objetos_entorno = []
+
+    def _actualizar_gato(self, fila):
+        gato = self.gato
+        gato.x, gato.y = int(fila["x"]), int(fila["y"])
+        gato.estado = ESTADOS[fila["estado"]]
+        gato.energia = float(fila["energia"])
+        gato.hambre = float(fila["hambre"])
+        gato.sed = float(fila["sed"])
+        gato.estres = float(fila["estres"])
+        gato.comodidad = float(fila["comodidad"])
+        gato.supervivencia = float(fila["supervivencia"])
+        # Percepciones para el panel (la memoria de la corrida original no se graba)
+        gato.memoria = {}
+        gato.percibir_entorno(self.objetos_entorno)
+        self.tiempo_simulacion = int(fila["tick"])
+
+    def dibujar_linea_tiempo(self):
+        """Barra para desplazarse por la corrida con el ratón"""
+        x, y, ancho, alto = self._rect_linea_tiempo()
+        pygame.draw.rect(self.screen, GRAY, (x, y, ancho, alto))
+        if self.total_filas > 1:
+            marca = x + int(ancho * self.fila / (self.total_filas - 1))
+            pygame.draw.rect(self.screen, YELLOW, (marca - 2, y - 3, 5, alto + 6))
+        velocidad = VELOCIDADES[self.indice_velocidad]
+        estado = "Pausa" if self.paused else f"x{velocidad:g}"
+        text = self.small_font.render(f"Tick {self.fila}/{self.total_filas - 1}  {estado}  "
+                                      "(Flechas: paso | +/-: velocidad)", True, WHITE)
+        self.screen.blit(text, (x, y - 20))
+
+    def _rect_linea_tiempo(self):
+        return (10, WINDOW_HEIGHT - 30, WINDOW_WIDTH - 20, 10)
+
+    def _fila_en(self, pos_x):
+        x, _, ancho, _ = self._rect_linea_tiempo()
+        fraccion = max(0.0, min(1.0, (pos_x - x) / ancho))
+        return int(round(fraccion * (self.total_filas - 1)))
+
+    def manejar_eventos(self):
+        """Controles de reproducción"""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                salto = self.registro.intervalo_fotos if event.mod & pygame.KMOD_SHIFT else 1
+                if event.key == pygame.K_SPACE:
+                    self.paused = not self.paused
+                elif event.key == pygame.K_ESCAPE:
+                    self.running = False
+                elif event.key == pygame.K_RIGHT:
+                    self.ir_a(self.fila + salto)
+                elif event.key == pygame.K_LEFT:
+                    self.ir_a(self.fila - salto)
+                elif event.key == pygame.K_HOME:
+                    self.ir_a(0)
+                elif event.key == pygame.K_END:
+                    self.ir_a(self.total_filas - 1)
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    self.indice_velocidad = min(len(VELOCIDADES) - 1, self.indice_velocidad + 1)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    self.indice_velocidad = max(0, self.indice_velocidad - 1)
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                x, y, ancho, alto = self._rect_linea_tiempo()
+                if y - 5 <= event.pos[1] <= y + alto + 5:
+                    self.arrastrando = True
+                    self.ir_a(self._fila_en(event.pos[0]))
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                self.arrastrando = False
+            elif event.type == pygame.MOUSEMOTION and self.arrastrando:
+                self.ir_a(self._fila_en(event.pos[0]))
+
+    def ejecutar(self):
+        """Bucle de reproducción"""
+        while self.running:
+            self.manejar_eventos()
+
+            if not self.paused and not self.arrastrando and self.fila < self.total_filas - 1:
+                self.posicion += VELOCIDADES[self.indice_velocidad]
+                if int(self.posicion) != self.fila:
+                    posicion = self.posicion
+                    self.ir_a(int(posicion))
+                    self.posicion = posicion
+
+            self.dibujar()
+            self.dibujar_linea_tiempo()
+            pygame.display.flip()
+
+            self.clock.tick(10)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reproduce una corrida grabada con registro.py")
+    parser.add_argument("directorio", help="Directorio de la corrida")
+    args = parser.parse_args()
+
+    try:
+        reproductor = ReproductorGato(Registro(args.directorio))
+    except ValueError as e:
+        parser.error(str(e))
+    reproductor.ejecutar()
+    pygame.quit()
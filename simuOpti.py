@@ -1,10 +1,14 @@
 import pygame
 import random
 import math
+import time
 from enum import Enum
-from collections import deque
+from collections import deque, namedtuple
+from functools import lru_cache
 import numpy as np
 
+from aleatorio import FlujosSimulacion
+
 # Inicialización de Pygame
 pygame.init()
 
@@ -14,6 +18,7 @@ WINDOW_HEIGHT = 700
 GRID_SIZE = 20
 CELL_SIZE = WINDOW_WIDTH // (GRID_SIZE * 2)
 INFO_PANEL_WIDTH = 300
+ESPERA_PAUSA = 0.5  # Segundos bloqueado por evento en pausa (ver SimulacionGato.ejecutar)
 
 # Colores
 BLACK = (0, 0, 0)
@@ -48,6 +53,110 @@ class TipoObjeto(Enum):
     PRESA = "Presa"
     OBSTACULO = "Obstáculo"
 
+class TipoEvento(Enum):
+    """Eventos del mundo que se registran durante una corrida"""
+    APARICION = "Aparición"
+    CONSUMO = "Consumo"
+    MOVIMIENTO = "Movimiento"
+    REINICIO = "Reinicio"
+
+ESTADOS_MENTALES = list(EstadoMental)
+TIPOS_OBJETO = list(TipoObjeto)
+
+# Umbrales de las reglas de evaluar_estado e interactuar_con_objetos (ver optimizador.py)
+Umbrales = namedtuple("Umbrales", [
+    "energia_refugio",        # energía < umbral: buscar refugio
+    "supervivencia_refugio",  # supervivencia < umbral: buscar refugio
+    "hambre_caza",            # hambre > umbral: cazar comida o presas
+    "sed_caza",               # sed > umbral: cazar agua
+    "estres_refugio",         # estrés > umbral: buscar refugio
+    "comodidad_descanso",     # comodidad < umbral: descansar
+    "hambre_comer",           # hambre > umbral: comer la comida de al lado
+    "sed_beber",              # sed > umbral: beber el agua de al lado
+    "estres_humano",          # estrés < umbral: el humano da comodidad
+])
+
+UMBRALES_BASE = Umbrales(20, 30, 70, 70, 70, 30, 50, 50, 50)
+
+def evaluar_estados_vectorizado(energia, hambre, sed, estres, comodidad, supervivencia,
+                                hay_depredador, umbrales=UMBRALES_BASE):
+    """Reglas de AgenteGato.evaluar_estado sobre arreglos (índices de ESTADOS_MENTALES)"""
+    u = umbrales
+    condiciones = [
+        (energia < u.energia_refugio) | (supervivencia < u.supervivencia_refugio),
+        hay_depredador,
+        hambre > u.hambre_caza,
+        sed > u.sed_caza,
+        estres > u.estres_refugio,
+        comodidad < u.comodidad_descanso,
+    ]
+    estados = [EstadoMental.BUSCANDO_REFUGIO, EstadoMental.HUYENDO, EstadoMental.CAZANDO,
+               EstadoMental.CAZANDO, EstadoMental.BUSCANDO_REFUGIO, EstadoMental.DESCANSANDO]
+    return np.select(condiciones, [ESTADOS_MENTALES.index(e) for e in estados],
+                     default=ESTADOS_MENTALES.index(EstadoMental.EXPLORANDO)).astype(np.uint8)
+
+def serie_acotada(valor, ganancia, perdida, n):
+    """Valores tras 1..n ticks de v -> max(0, min(100, v + ganancia) - perdida)
+    
+    Con ganancia o pérdida nulas se omite el tope correspondiente, igual que en el código
+    del agente (p. ej. el estrés puede superar 100 al huir y solo se acota en 0).
+    """
+    if ganancia:
+        valor = min(100, valor + ganancia)
+    if perdida:
+        valor = max(0, valor - perdida)
+    neto = ganancia - perdida
+    serie = valor + neto * np.arange(n, dtype=np.float64)
+    if neto > 0:
+        serie = np.minimum(serie, 100 - perdida)
+    elif neto < 0:
+        serie = np.maximum(serie, 0)
+    return serie
+
+COLORES_OBJETO = {
+    TipoObjeto.COMIDA: GREEN,
+    TipoObjeto.AGUA: BLUE,
+    TipoObjeto.REFUGIO: BROWN,
+    TipoObjeto.JUGUETE: YELLOW,
+    TipoObjeto.HUMANO: PINK,
+    TipoObjeto.DEPREDADOR: RED,
+    TipoObjeto.PRESA: ORANGE,
+    TipoObjeto.OBSTACULO: GRAY
+}
+
+SIMBOLOS_OBJETO = {
+    TipoObjeto.COMIDA: "F",
+    TipoObjeto.AGUA: "W",
+    TipoObjeto.REFUGIO: "H",
+    TipoObjeto.JUGUETE: "T",
+    TipoObjeto.HUMANO: "P",
+    TipoObjeto.DEPREDADOR: "D",
+    TipoObjeto.PRESA: "M",
+    TipoObjeto.OBSTACULO: "X"
+}
+
+_sprites_objeto = {}
+
+def sprite_objeto(tipo):
+    """Cuadro de color con el símbolo del tipo, dibujado una sola vez por tipo"""
+    sprite = _sprites_objeto.get(tipo)
+    if sprite is None:
+        sprite = pygame.Surface((CELL_SIZE-2, CELL_SIZE-2))
+        sprite.fill(COLORES_OBJETO.get(tipo, WHITE))
+        font = pygame.font.Font(None, 20)
+        text = font.render(SIMBOLOS_OBJETO.get(tipo, "?"), True, BLACK)
+        sprite.blit(text, (5, 5))
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert()
+        _sprites_objeto[tipo] = sprite
+    return sprite
+
+def dibujar_objetos(screen, objetos, offset_x=0):
+    """Dibuja los objetos activos con una sola llamada a Surface.blits"""
+    sprites = {tipo: sprite_objeto(tipo) for tipo in TipoObjeto}
+    screen.blits([(sprites[obj.tipo], (offset_x + obj.x * CELL_SIZE, obj.y * CELL_SIZE))
+                  for obj in objetos if obj.activo], doreturn=False)
+
 class ObjetoEntorno:
     """Representa un objeto en el entorno del gato"""
     def __init__(self, x, y, tipo, valor_recurso=10):
@@ -60,38 +169,52 @@ class ObjetoEntorno:
     def dibujar(self, screen, offset_x):
         if not self.activo:
             return
-            
-        x_pos = offset_x + self.x * CELL_SIZE
-        y_pos = self.y * CELL_SIZE
-        
-        colors = {
-            TipoObjeto.COMIDA: GREEN,
-            TipoObjeto.AGUA: BLUE,
-            TipoObjeto.REFUGIO: BROWN,
-            TipoObjeto.JUGUETE: YELLOW,
-            TipoObjeto.HUMANO: PINK,
-            TipoObjeto.DEPREDADOR: RED,
-            TipoObjeto.PRESA: ORANGE,
-            TipoObjeto.OBSTACULO: GRAY
-        }
-        
-        color = colors.get(self.tipo, WHITE)
-        pygame.draw.rect(screen, color, (x_pos, y_pos, CELL_SIZE-2, CELL_SIZE-2))
-        
-        # Dibujar símbolo
-        font = pygame.font.Font(None, 20)
-        symbols = {
-            TipoObjeto.COMIDA: "F",
-            TipoObjeto.AGUA: "W",
-            TipoObjeto.REFUGIO: "H",
-            TipoObjeto.JUGUETE: "T",
-            TipoObjeto.HUMANO: "P",
-            TipoObjeto.DEPREDADOR: "D",
-            TipoObjeto.PRESA: "M",
-            TipoObjeto.OBSTACULO: "X"
-        }
-        text = font.render(symbols.get(self.tipo, "?"), True, BLACK)
-        screen.blit(text, (x_pos + 5, y_pos + 5))
+        screen.blit(sprite_objeto(self.tipo), (offset_x + self.x * CELL_SIZE, self.y * CELL_SIZE))
+
+# Mundo inicial: cantidad de objetos por tipo y probabilidad de que haya un depredador
+Escenario = namedtuple("Escenario", ["nombre", "cantidades", "prob_depredador"])
+
+ESCENARIO_CLASICO = Escenario("clasico", (
+    (TipoObjeto.OBSTACULO, 10),
+    (TipoObjeto.COMIDA, 8),
+    (TipoObjeto.AGUA, 5),
+    (TipoObjeto.REFUGIO, 3),
+    (TipoObjeto.JUGUETE, 4),
+    (TipoObjeto.PRESA, 3),
+    (TipoObjeto.HUMANO, 1),
+), 0.3)
+
+ESCENARIOS = {ESCENARIO_CLASICO.nombre: ESCENARIO_CLASICO}
+
+@lru_cache(maxsize=1 << 16)
+def generar_escenario(escenario, semilla, excluida=None):
+    """Objetos iniciales del escenario como arreglos (x, y, índice en TIPOS_OBJETO)
+    
+    Todos los objetos caen en celdas distintas y ninguno en la celda `excluida` (la del
+    gato): las celdas se sortean de una sola vez sin reemplazo. El resultado queda en
+    caché por (escenario, semilla, excluida) y los arreglos son de solo lectura.
+    """
+    rng = np.random.default_rng(semilla)
+    tipos = []
+    for tipo, n in escenario.cantidades:
+        tipos += [TIPOS_OBJETO.index(tipo)] * n
+    if rng.random() < escenario.prob_depredador:
+        tipos.append(TIPOS_OBJETO.index(TipoObjeto.DEPREDADOR))
+    
+    libres = GRID_SIZE * GRID_SIZE
+    if excluida is not None:
+        libres -= 1
+    celdas = rng.choice(libres, size=len(tipos), replace=False)
+    if excluida is not None:
+        # Saltar la celda excluida: las celdas desde ella en adelante se corren una posición
+        celdas = celdas + (celdas >= excluida[0] * GRID_SIZE + excluida[1])
+    
+    x = (celdas // GRID_SIZE).astype(np.int16)
+    y = (celdas % GRID_SIZE).astype(np.int16)
+    tipos = np.array(tipos, dtype=np.uint8)
+    for arreglo in (x, y, tipos):
+        arreglo.flags.writeable = False
+    return x, y, tipos
 
 class AgenteGato:
     """Agente inteligente que simula un gato doméstico con aprendizaje"""
@@ -116,6 +239,17 @@ class AgenteGato:
         self.objetivo_actual = None
         self.tiempo_en_estado = 0
         
+        # Objetivo persistente: con planificar=True el gato se compromete con un objetivo
+        # y un camino que solo se recalculan cuando dejan de ser válidos
+        self.planificar = False
+        self.plan = deque()
+        self.destino_plan = None
+        self.replanificaciones = 0
+        
+        # Política opcional (p. ej. planificador_mcts.PlanificadorMCTS): elige el movimiento
+        # en los estados que planifica; None o un estado no planificado usan las reglas
+        self.politica = None
+        
         # Sensores
         self.rango_vision = 5
         self.rango_olfato = 3
@@ -129,6 +263,8 @@ class AgenteGato:
         # Modelo del entorno
         self.mapa_conocido = {}
         self.objetos_percibidos = []
+        self.campo_vision = None  # Percepción con línea de visión (percepcion.CampoVision)
+        self.campo_olor = None  # Rastro de olor a comida (olfato.CampoOlor)
         
         # Aprendizaje por refuerzo
         self.q_table = {}
@@ -139,6 +275,7 @@ class AgenteGato:
         # Memoria espacial
         self.mapa_calor_recursos = np.zeros((GRID_SIZE, GRID_SIZE))
         self.mapa_calor_peligros = np.zeros((GRID_SIZE, GRID_SIZE))
+        self.mapa_visitas = np.zeros((GRID_SIZE, GRID_SIZE))
         self.zonas_exploradas = set()
         
         # Historial de experiencias
@@ -152,8 +289,23 @@ class AgenteGato:
         self.tasa_sed = 0.7
         self.tasa_energia = 0.3
         
+        # Umbrales de decisión (UMBRALES_BASE salvo que se ajusten, p. ej. con optimizador.py)
+        self.umbrales = UMBRALES_BASE
+        
+        # Notificación opcional de objetos consumidos (usada por el registrador)
+        self.al_consumir = None
+        
+        # Fuente de azar: el módulo random o un FlujoAleatorio de la simulación
+        self.aleatorio = random
+        
     def percibir_entorno(self, objetos_entorno):
         """Sensores: percibe el entorno circundante"""
+        if self.campo_vision is not None:
+            self.objetos_percibidos = self.campo_vision.percibir(self)
+            for obj in self.objetos_percibidos:
+                self.memoria[f"{obj.x},{obj.y}"] = obj
+            return
+        
         self.objetos_percibidos = []
         
         for obj in objetos_entorno:
@@ -165,7 +317,9 @@ class AgenteGato:
             # Diferentes rangos según el tipo de sensor
             rango_percepcion = self.rango_vision
             if obj.tipo in [TipoObjeto.COMIDA, TipoObjeto.PRESA]:
-                rango_percepcion = max(self.rango_vision, self.rango_olfato)
+                # Con campo de olor la comida no visible se sigue por el rastro (cazar)
+                if self.campo_olor is None:
+                    rango_percepcion = max(self.rango_vision, self.rango_olfato)
             elif obj.tipo == TipoObjeto.DEPREDADOR:
                 rango_percepcion = max(self.rango_vision, self.rango_auditivo)
             
@@ -176,8 +330,9 @@ class AgenteGato:
     
     def evaluar_estado(self):
         """Evalúa el estado interno y decide el comportamiento"""
+        u = self.umbrales
         # Prioridades basadas en supervivencia
-        if self.energia < 20 or self.supervivencia < 30:
+        if self.energia < u.energia_refugio or self.supervivencia < u.supervivencia_refugio:
             return EstadoMental.BUSCANDO_REFUGIO
         
         # Detectar amenazas
@@ -186,13 +341,13 @@ class AgenteGato:
                 return EstadoMental.HUYENDO
         
         # Necesidades básicas
-        if self.hambre > 70:
+        if self.hambre > u.hambre_caza:
             return EstadoMental.CAZANDO
-        elif self.sed > 70:
+        elif self.sed > u.sed_caza:
             return EstadoMental.CAZANDO  # Buscar agua
-        elif self.estres > 70:
+        elif self.estres > u.estres_refugio:
             return EstadoMental.BUSCANDO_REFUGIO
-        elif self.comodidad < 30:
+        elif self.comodidad < u.comodidad_descanso:
             return EstadoMental.DESCANSANDO
         
         # Comportamiento exploratorio
@@ -203,6 +358,17 @@ class AgenteGato:
         self.estado = self.evaluar_estado()
         self.tiempo_en_estado += 1
         
+        # Un estado de mayor prioridad (p. ej. HUYENDO) interrumpe el objetivo en curso
+        if self.objetivo_actual is not None and self.estado != EstadoMental.CAZANDO:
+            self.abandonar_objetivo()
+        
+        if self.politica is not None:
+            movimiento = self.politica.decidir(self)
+            if movimiento is not None:
+                if self.estado == EstadoMental.HUYENDO:
+                    self.estres += 5
+                return movimiento
+        
         # Decisiones basadas en el estado
         if self.estado == EstadoMental.HUYENDO:
             return self.huir()
@@ -242,24 +408,125 @@ class AgenteGato:
     
     def cazar(self):
         """Acción: buscar comida o agua"""
+        if self.planificar:
+            return self.cazar_con_plan()
+        
+        objetivo = self.buscar_objetivo()
+        if objetivo:
+            self.objetivo_actual = objetivo
+            return self.mover_hacia(objetivo.x, objetivo.y)
+        
+        # Si no hay objetivo visible, seguir el olor o explorar basándose en memoria
+        return self.buscar_sin_objetivo()
+    
+    def buscar_sin_objetivo(self):
+        """Sigue el rastro de comida si lo hay; si no, explora con la memoria"""
+        rastro = self.rastro_comida()
+        if rastro is not None:
+            return rastro
+        return self.explorar_con_memoria()
+    
+    def rastro_comida(self):
+        """Movimiento hacia donde sube el olor a comida (campo_olor), o None si no hay rastro"""
+        if self.campo_olor is None or self.hambre <= self.umbrales.hambre_caza:
+            return None
+        return self.campo_olor.direccion(self.x, self.y)
+    
+    def buscar_objetivo(self):
+        """Recurso percibido más cercano según la necesidad actual"""
         objetivo = None
         distancia_min = float('inf')
         
         # Buscar el recurso más cercano
         for obj in self.objetos_percibidos:
-            if (self.hambre > 70 and obj.tipo in [TipoObjeto.COMIDA, TipoObjeto.PRESA]) or \
-               (self.sed > 70 and obj.tipo == TipoObjeto.AGUA):
+            if self.objetivo_util(obj):
                 dist = math.sqrt((obj.x - self.x)**2 + (obj.y - self.y)**2)
                 if dist < distancia_min:
                     distancia_min = dist
                     objetivo = obj
-        
-        if objetivo:
+        return objetivo
+    
+    def objetivo_util(self, obj):
+        """El objeto satisface el hambre o la sed actuales"""
+        u = self.umbrales
+        return (self.hambre > u.hambre_caza and obj.tipo in [TipoObjeto.COMIDA, TipoObjeto.PRESA]) or \
+               (self.sed > u.sed_caza and obj.tipo == TipoObjeto.AGUA)
+    
+    def cazar_con_plan(self):
+        """Acción: seguir el camino hacia el objetivo comprometido, replanificando solo si se invalida"""
+        if not self.plan_valido():
+            self.abandonar_objetivo()
+            objetivo = self.buscar_objetivo()
+            if objetivo is None:
+                return self.buscar_sin_objetivo()
             self.objetivo_actual = objetivo
-            return self.mover_hacia(objetivo.x, objetivo.y)
-        
-        # Si no hay objetivo visible, explorar basándose en memoria
-        return self.explorar_con_memoria()
+            self.destino_plan = (objetivo.x, objetivo.y)
+            self.plan = self.calcular_camino(objetivo.x, objetivo.y)
+            self.replanificaciones += 1
+        
+        if not self.plan:
+            return (0, 0)  # Ya está junto al objetivo
+        dx, dy = self.plan.popleft()
+        return (dx, dy)
+    
+    def plan_valido(self):
+        """El objetivo sigue activo, en su lugar, útil y con el camino libre"""
+        objetivo = self.objetivo_actual
+        if objetivo is None or not objetivo.activo:
+            return False
+        if (objetivo.x, objetivo.y) != self.destino_plan or not self.objetivo_util(objetivo):
+            return False
+        if self.plan:
+            # Camino bloqueado por un obstáculo descubierto después de planificar
+            dx, dy = self.plan[0]
+            siguiente = self.memoria.get(f"{self.x + dx},{self.y + dy}")
+            if siguiente is not None and siguiente.activo and siguiente.tipo == TipoObjeto.OBSTACULO:
+                return False
+        elif (self.x, self.y) != self.destino_plan:
+            return False
+        return True
+    
+    def abandonar_objetivo(self):
+        self.objetivo_actual = None
+        self.destino_plan = None
+        self.plan.clear()
+    
+    def calcular_camino(self, destino_x, destino_y):
+        """Camino más corto (8 vecinos) evitando los obstáculos recordados"""
+        bloqueadas = set()
+        for obj in self.memoria.values():
+            if obj.activo and obj.tipo == TipoObjeto.OBSTACULO:
+                bloqueadas.add((obj.x, obj.y))
+        bloqueadas.discard((destino_x, destino_y))
+        
+        inicio = (self.x, self.y)
+        destino = (destino_x, destino_y)
+        anterior = {inicio: None}
+        frontera = deque([inicio])
+        while frontera:
+            celda = frontera.popleft()
+            if celda == destino:
+                break
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    vecina = (celda[0] + dx, celda[1] + dy)
+                    if vecina in anterior or vecina in bloqueadas:
+                        continue
+                    if 0 <= vecina[0] < GRID_SIZE and 0 <= vecina[1] < GRID_SIZE:
+                        anterior[vecina] = celda
+                        frontera.append(vecina)
+        
+        if destino not in anterior:
+            # Inalcanzable con lo que se recuerda: avanzar en línea recta
+            return deque([self.mover_hacia(destino_x, destino_y)])
+        
+        camino = deque()
+        celda = destino
+        while anterior[celda] is not None:
+            previa = anterior[celda]
+            camino.appendleft((celda[0] - previa[0], celda[1] - previa[1]))
+            celda = previa
+        return camino
     
     def buscar_refugio(self):
         """Acción: buscar lugar seguro"""
@@ -297,9 +564,9 @@ class AgenteGato:
                 mejores_movimientos.append((dx, dy))
         
         if mejores_movimientos:
-            return random.choice(mejores_movimientos)
+            return self.aleatorio.choice(mejores_movimientos)
         
-        return random.choice(movimientos)
+        return self.aleatorio.choice(movimientos)
     
     def explorar_con_memoria(self):
         """Explora usando la memoria de objetos conocidos"""
@@ -320,10 +587,14 @@ class AgenteGato:
                     self.hambre = max(0, self.hambre - 30)
                     self.energia = min(100, self.energia + 20)
                     obj.activo = False
+                    if self.al_consumir is not None:
+                        self.al_consumir(obj)
                     return (0, 0)
                 elif obj.tipo == TipoObjeto.AGUA:
                     self.sed = max(0, self.sed - 30)
                     obj.activo = False
+                    if self.al_consumir is not None:
+                        self.al_consumir(obj)
                     return (0, 0)
         
         return self.explorar()
@@ -340,10 +611,11 @@ class AgenteGato:
         
         return (int(dx), int(dy))
     
-    def actualizar(self, objetos_entorno):
+    def actualizar(self, objetos_entorno, percibir=True):
         """Ciclo principal del agente con gestión de energía mejorada"""
-        # Percibir
-        self.percibir_entorno(objetos_entorno)
+        # Percibir (percibir=False si ya se percibió en este tick)
+        if percibir:
+            self.percibir_entorno(objetos_entorno)
         
         # Decidir
         dx, dy = self.tomar_decision()
@@ -364,12 +636,23 @@ class AgenteGato:
         # Actualizar necesidades
         self.actualizar_necesidades()
         self.interactuar_con_objetos()
+        self.actualizar_mapas()
+    
+    def actualizar_mapas(self, ticks=1):
+        """Memoria espacial: recursos y peligros percibidos, celdas visitadas"""
+        for obj in self.objetos_percibidos:
+            if obj.tipo in [TipoObjeto.COMIDA, TipoObjeto.AGUA, TipoObjeto.PRESA]:
+                self.mapa_calor_recursos[obj.x, obj.y] += ticks
+            elif obj.tipo == TipoObjeto.DEPREDADOR:
+                self.mapa_calor_peligros[obj.x, obj.y] += ticks
+        self.mapa_visitas[self.x, self.y] += ticks
+        self.zonas_exploradas.add((self.x, self.y))
     
     def actualizar_necesidades(self):
         """Actualiza las necesidades del gato con el tiempo"""
-        self.hambre = min(100, self.hambre + 0.5)
-        self.sed = min(100, self.sed + 0.7)
-        self.energia = max(0, self.energia - 0.3)
+        self.hambre = min(100, self.hambre + self.tasa_hambre)
+        self.sed = min(100, self.sed + self.tasa_sed)
+        self.energia = max(0, self.energia - self.tasa_energia)
         
         if self.estado == EstadoMental.EXPLORANDO:
             self.estres = max(0, self.estres - 0.2)
@@ -378,14 +661,125 @@ class AgenteGato:
         self.supervivencia = (self.energia + (100 - self.hambre) + (100 - self.sed) + 
                             self.comodidad + (100 - self.estres)) / 5
     
+    def efectos_estacionarios(self, estado):
+        """Efectos por tick de interactuar_con_objetos si el gato se queda quieto sin eventos
+        
+        Devuelve (mejora de comodidad, alivio de estrés), o None si en este estado el gato
+        se mueve, sortea, consume algo, puede cambiar de objetivo o percibe un depredador.
+        """
+        mejora_comodidad = 0
+        alivio_estres = 0
+        refugio = None
+        for obj in self.objetos_percibidos:
+            if obj.tipo == TipoObjeto.DEPREDADOR:
+                return None
+            if estado == EstadoMental.CAZANDO and obj.tipo in [TipoObjeto.COMIDA, TipoObjeto.AGUA,
+                                                               TipoObjeto.PRESA]:
+                return None
+            if obj.tipo == TipoObjeto.REFUGIO and refugio is None:
+                refugio = obj
+            if abs(obj.x - self.x) <= 1 and abs(obj.y - self.y) <= 1:
+                if obj.tipo in [TipoObjeto.COMIDA, TipoObjeto.AGUA, TipoObjeto.HUMANO]:
+                    return None
+                elif obj.tipo == TipoObjeto.REFUGIO:
+                    mejora_comodidad += 5
+                    alivio_estres += 3
+                elif obj.tipo == TipoObjeto.JUGUETE:
+                    mejora_comodidad += 2
+                    alivio_estres += 2
+        
+        en_refugio = refugio is not None and (refugio.x, refugio.y) == (self.x, self.y)
+        if estado == EstadoMental.DESCANSANDO:
+            quieto = refugio is None or en_refugio
+        elif estado == EstadoMental.BUSCANDO_REFUGIO:
+            quieto = en_refugio
+        elif estado == EstadoMental.CAZANDO:
+            if self.rastro_comida() is not None:
+                return None
+            # explorar_con_memoria: quieto si el primer recurso recordado está en su celda
+            quieto = False
+            for pos, obj in self.memoria.items():
+                if obj.tipo in [TipoObjeto.COMIDA, TipoObjeto.AGUA]:
+                    quieto = pos == f"{self.x},{self.y}"
+                    break
+        else:
+            quieto = False
+        return (mejora_comodidad, alivio_estres) if quieto else None
+    
+    def trayectoria_estable(self, n_max):
+        """Necesidades en forma cerrada para los próximos ticks sin eventos
+        
+        Vale cuando la acción del estado actual es quedarse quieto sin azar ni consumos
+        (descansar, buscar refugio estando en él, o cazar con el recurso recordado en su
+        celda) y lo percibido no cambia. Devuelve (estado, n, trayectoria), donde
+        trayectoria[nombre][k] es el valor tras k+1 ticks y n es cuántos ticks se mantiene
+        el estado según las reglas de evaluar_estado; None si el gato no está en un tramo
+        así. Coincide con avanzar tick a tick salvo por el redondeo de coma flotante.
+        """
+        estado = self.evaluar_estado()
+        if self.politica is not None and estado in self.politica.estados:
+            return None
+        efectos = self.efectos_estacionarios(estado)
+        if efectos is None:
+            return None
+        mejora_comodidad, alivio_estres = efectos
+        descanso = 1 if estado == EstadoMental.DESCANSANDO else 0
+        
+        # Ventana creciente: la mayoría de los tramos son cortos
+        ventana = min(n_max, 32)
+        while True:
+            trayectoria = {
+                "energia": serie_acotada(self.energia, 2 * descanso, self.tasa_energia, ventana),
+                "hambre": serie_acotada(self.hambre, self.tasa_hambre, 0, ventana),
+                "sed": serie_acotada(self.sed, self.tasa_sed, 0, ventana),
+                "comodidad": serie_acotada(self.comodidad, 3 * descanso + mejora_comodidad, 0, ventana),
+                "estres": serie_acotada(self.estres, 0, 2 * descanso + alivio_estres, ventana),
+            }
+            # La supervivencia se calcula antes de interactuar_con_objetos en cada tick
+            comodidad = np.concatenate(([self.comodidad], trayectoria["comodidad"][:-1]))
+            estres = np.concatenate(([self.estres], trayectoria["estres"][:-1]))
+            if descanso:
+                comodidad = np.minimum(100, comodidad + 3)
+                estres = np.maximum(0, estres - 2)
+            trayectoria["supervivencia"] = (trayectoria["energia"] + (100 - trayectoria["hambre"]) +
+                                            (100 - trayectoria["sed"]) + comodidad +
+                                            (100 - estres)) / 5
+            
+            siguientes = evaluar_estados_vectorizado(
+                trayectoria["energia"], trayectoria["hambre"], trayectoria["sed"],
+                trayectoria["estres"], trayectoria["comodidad"], trayectoria["supervivencia"],
+                np.zeros(ventana, dtype=bool), self.umbrales)
+            cambia = np.flatnonzero(siguientes != ESTADOS_MENTALES.index(estado))
+            if len(cambia) or ventana == n_max:
+                break
+            ventana = min(n_max, ventana * 8)
+        # El tick k+1 se decide con los valores tras k ticks
+        n = ventana if len(cambia) == 0 else int(cambia[0]) + 1
+        return estado, n, trayectoria
+    
+    def cargar_necesidades(self, trayectoria, k):
+        """Copia las necesidades tras k ticks de la trayectoria (k >= 1)"""
+        for nombre, valores in trayectoria.items():
+            setattr(self, nombre, float(valores[k - 1]))
+    
+    def aplicar_trayectoria(self, estado, trayectoria, k):
+        """Deja al gato como tras k ticks de la trayectoria (k >= 1)"""
+        self.cargar_necesidades(trayectoria, k)
+        if self.objetivo_actual is not None:
+            self.abandonar_objetivo()
+        self.estado = estado
+        self.tiempo_en_estado += k
+        self.historia_posiciones.extend([(self.x, self.y)] * min(k, self.historia_posiciones.maxlen))
+        self.actualizar_mapas(k)
+    
     def interactuar_con_objetos(self):
         """Interactúa con objetos cercanos"""
         for obj in self.objetos_percibidos:
             if abs(obj.x - self.x) <= 1 and abs(obj.y - self.y) <= 1:
-                if obj.tipo == TipoObjeto.COMIDA and self.hambre > 50:
+                if obj.tipo == TipoObjeto.COMIDA and self.hambre > self.umbrales.hambre_comer:
                     self.estado = EstadoMental.COMIENDO
                     self.comer()
-                elif obj.tipo == TipoObjeto.AGUA and self.sed > 50:
+                elif obj.tipo == TipoObjeto.AGUA and self.sed > self.umbrales.sed_beber:
                     self.estado = EstadoMental.COMIENDO
                     self.comer()
                 elif obj.tipo == TipoObjeto.REFUGIO:
@@ -395,7 +789,7 @@ class AgenteGato:
                     self.estres = max(0, self.estres - 2)
                     self.comodidad = min(100, self.comodidad + 2)
                 elif obj.tipo == TipoObjeto.HUMANO:
-                    if self.estres < 50:
+                    if self.estres < self.umbrales.estres_humano:
                         self.comodidad = min(100, self.comodidad + 3)
                         self.estado = EstadoMental.COMUNICANDO
     
@@ -434,64 +828,221 @@ class AgenteGato:
                              (x_pos + CELL_SIZE//2, y_pos + CELL_SIZE//2), 
                              self.rango_vision * CELL_SIZE, 1)
 
+def paleta(*puntos):
+    """Paleta de 256 colores interpolada entre (posición 0..1, color)
+
+    El índice 0 es negro y el resto nunca lo es: el negro es el color transparente de las
+    capas de calor.
+    """
+    t = np.linspace(0, 1, 256)
+    posiciones = [posicion for posicion, _ in puntos]
+    colores = np.array([color for _, color in puntos], dtype=float)
+    tabla = np.stack([np.interp(t, posiciones, colores[:, i]) for i in range(3)], axis=1)
+    tabla = np.maximum(tabla, 1).astype(np.uint8)
+    tabla[0] = BLACK
+    return tabla
+
+PALETA_RECURSOS = paleta((0, (0, 60, 0)), (1, (120, 255, 120)))
+PALETA_PELIGROS = paleta((0, (80, 0, 0)), (0.5, (230, 40, 0)), (1, (255, 240, 80)))
+PALETA_PERCEPCION = paleta((0, (255, 255, 0)), (1, (255, 255, 0)))
+PALETA_EXPLORADO = paleta((0, (70, 70, 160)), (1, (70, 70, 160)))
+PALETA_VISITAS = paleta((0, (20, 20, 120)), (0.5, (160, 40, 200)), (1, (255, 200, 255)))
+PALETA_OLOR = paleta((0, (60, 40, 0)), (1, (255, 190, 60)))
+
+class CapaCalor:
+    """Capa superpuesta que dibuja una grilla de NumPy (GRID_SIZE x GRID_SIZE, índice [x, y])
+    
+    Los valores se normalizan a 0..255 y se colorean con la paleta en un solo paso de
+    NumPy; surfarray los copia a una superficie de una celda por píxel, que se escala una
+    vez al tamaño del tablero y se dibuja con un único blit. Las celdas en 0 no se pintan.
+    """
+    
+    def __init__(self, nombre, tecla, obtener, paleta, alfa=140, logaritmica=False):
+        self.nombre = nombre
+        self.tecla = tecla
+        self.obtener = obtener  # gato -> grilla de valores
+        self.paleta = paleta
+        self.logaritmica = logaritmica
+        self.visible = False
+        self._celdas = pygame.Surface((GRID_SIZE, GRID_SIZE))
+        self._tablero = pygame.Surface((GRID_SIZE * CELL_SIZE, GRID_SIZE * CELL_SIZE))
+        self._tablero.set_colorkey(BLACK)
+        self._tablero.set_alpha(alfa)
+    
+    def dibujar(self, screen, gato, offset_x=0):
+        valores = np.asarray(self.obtener(gato), dtype=float)
+        if self.logaritmica:
+            valores = np.log1p(np.maximum(valores, 0))
+        maximo = valores.max()
+        if maximo <= 0:
+            return
+        indices = np.ceil(np.clip(valores, 0, None) * (255 / maximo)).astype(np.uint8)
+        pygame.surfarray.blit_array(self._celdas, self.paleta[indices])
+        pygame.transform.scale(self._celdas, self._tablero.get_size(), self._tablero)
+        screen.blit(self._tablero, (offset_x, 0))
+
+def mascara_percepcion(gato):
+    """Celdas dentro del mayor rango de los sensores"""
+    rango = max(gato.rango_vision, gato.rango_olfato, gato.rango_auditivo)
+    x, y = np.ogrid[:GRID_SIZE, :GRID_SIZE]
+    distancia2 = (x - gato.x)**2 + (y - gato.y)**2
+    return np.where(distancia2 <= gato.rango_vision**2, 2.0,
+                    np.where(distancia2 <= rango**2, 1.0, 0.0))
+
+def mascara_explorada(gato):
+    mascara = np.zeros((GRID_SIZE, GRID_SIZE))
+    if gato.zonas_exploradas:
+        xs, ys = zip(*gato.zonas_exploradas)
+        mascara[list(xs), list(ys)] = 1
+    return mascara
+
+def mapa_olor(gato):
+    if gato.campo_olor is None:
+        return np.zeros((GRID_SIZE, GRID_SIZE))
+    return gato.campo_olor.olor
+
+def crear_capas():
+    """Capas de calor disponibles (teclas 1 a 6)"""
+    return [
+        CapaCalor("recursos", pygame.K_1, lambda gato: gato.mapa_calor_recursos, PALETA_RECURSOS),
+        CapaCalor("peligros", pygame.K_2, lambda gato: gato.mapa_calor_peligros, PALETA_PELIGROS),
+        CapaCalor("percepcion", pygame.K_3, mascara_percepcion, PALETA_PERCEPCION, alfa=60),
+        CapaCalor("explorado", pygame.K_4, mascara_explorada, PALETA_EXPLORADO, alfa=90),
+        CapaCalor("visitas", pygame.K_5, lambda gato: gato.mapa_visitas, PALETA_VISITAS,
+                  logaritmica=True),
+        CapaCalor("olor", pygame.K_6, mapa_olor, PALETA_OLOR, alfa=110, logaritmica=True),
+    ]
+
 class SimulacionGato:
     """Clase principal para la simulación"""
     
-    def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH + INFO_PANEL_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("Simulación IA: Agente Gato Doméstico")
-        self.clock = pygame.time.Clock()
+    def __init__(self, mostrar=True, registrador=None, metricas=None, telemetria=None,
+                 campo_vision=None, planificar=False, publicador=None,
+                 escenario=ESCENARIO_CLASICO, semilla=None, politica=None, campo_olor=None,
+                 persecucion=None, mapa=None):
+        # Sin pantalla (mostrar=False) la simulación puede avanzarse con paso()
+        self.screen = None
+        if mostrar:
+            self.screen = pygame.display.set_mode((WINDOW_WIDTH + INFO_PANEL_WIDTH, WINDOW_HEIGHT))
+            pygame.display.set_caption("Simulación IA: Agente Gato Doméstico")
         self.font = pygame.font.Font(None, 24)
         self.small_font = pygame.font.Font(None, 18)
-        
-        self.gato = AgenteGato(GRID_SIZE//2, GRID_SIZE//2)
+        self.capas = crear_capas()
+        
+        self.registrador = registrador
+        self.metricas = metricas
+        self.telemetria = telemetria
+        self.publicador = publicador
+        self.campo_vision = campo_vision
+        self.campo_olor = campo_olor
+        self.persecucion = persecucion
+        # Vista sobre un mapa grande en disco (mapas.VistaMapa) en lugar del escenario al azar
+        self.mapa = mapa
+        self.planificar = planificar
+        self.politica = politica
+        self.escenario = escenario
+        # Un flujo de azar por fuente, todos derivados de `semilla` (reproducible)
+        self.flujos = FlujosSimulacion(semilla)
+        # Una política sin generador propio sortea de los flujos (p. ej. PlanificadorMCTS)
+        if hasattr(politica, "conectar"):
+            politica.conectar(self.flujos)
+        self.gato = self.crear_gato()
         self.objetos_entorno = []
         self.generar_entorno()
         
         self.running = True
         self.paused = False
+        self.fps = 10  # 10 FPS para que sea fluido pero no muy rápido
         self.tiempo_simulacion = 0
-
-    def generar_entorno(self):
-        """Genera objetos aleatorios en el entorno"""
-        self.objetos_entorno = []
-        
-        # Generar obstáculos
-        for _ in range(10):
-            x, y = random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1)
-            if (x, y) != (self.gato.x, self.gato.y):
-                self.objetos_entorno.append(ObjetoEntorno(x, y, TipoObjeto.OBSTACULO))
-        
-        # Generar recursos
-        tipos_recursos = [
-            (TipoObjeto.COMIDA, 8),
-            (TipoObjeto.AGUA, 5),
-            (TipoObjeto.REFUGIO, 3),
-            (TipoObjeto.JUGUETE, 4),
-            (TipoObjeto.PRESA, 3)
-        ]
-        
-        for tipo, cantidad in tipos_recursos:
-            for _ in range(cantidad):
-                x, y = random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1)
-                if (x, y) != (self.gato.x, self.gato.y):
-                    self.objetos_entorno.append(ObjetoEntorno(x, y, tipo))
+        self.sucio = True  # Hay que redibujar (ver ejecutar)
         
-        # Agregar humano
-        x, y = random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1)
-        self.objetos_entorno.append(ObjetoEntorno(x, y, TipoObjeto.HUMANO))
-        
-        # Agregar depredador ocasional
-        if random.random() > 0.7:
-            x, y = random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1)
-            self.objetos_entorno.append(ObjetoEntorno(x, y, TipoObjeto.DEPREDADOR))
+        if self.registrador is not None:
+            self.registrador.registrar_entorno(self)
+        if self.publicador is not None:
+            self.publicador.publicar(self)
+
+    def crear_gato(self):
+        """Crea el agente en el centro de la grilla"""
+        gato = AgenteGato(GRID_SIZE//2, GRID_SIZE//2)
+        gato.campo_vision = self.campo_vision
+        gato.campo_olor = self.campo_olor
+        gato.planificar = self.planificar
+        gato.politica = self.politica
+        gato.aleatorio = self.flujos.gato
+        if self.registrador is not None or self.campo_olor is not None:
+            gato.al_consumir = self._al_consumir
+        return gato
+
+    def _al_consumir(self, obj):
+        if self.campo_olor is not None:
+            self.campo_olor.quitar(obj)
+        if self.registrador is not None:
+            self.registrador.registrar_evento(TipoEvento.CONSUMO, obj)
+
+    def generar_entorno(self, semilla=None):
+        """Genera los objetos del escenario (sin semilla se sortea una) o los carga del mapa"""
+        if self.mapa is not None:
+            self.objetos_entorno = self.mapa.cargar(self.gato)
+        else:
+            if semilla is None:
+                semilla = self.flujos.entorno.getrandbits(32)
+            x, y, tipos = generar_escenario(self.escenario, semilla, (self.gato.x, self.gato.y))
+            self.objetos_entorno = [ObjetoEntorno(ox, oy, TIPOS_OBJETO[tipo])
+                                    for ox, oy, tipo in zip(x.tolist(), y.tolist(), tipos.tolist())]
+        
+        if self.campo_vision is not None:
+            self.campo_vision.reconstruir(self.objetos_entorno)
+        if self.campo_olor is not None:
+            self.campo_olor.reconstruir(self.objetos_entorno)
+        if self.persecucion is not None:
+            self.persecucion.reconstruir(self.objetos_entorno)
     
     def regenerar_recursos(self):
         """Regenera recursos consumidos ocasionalmente"""
-        if random.random() < 0.02:  # 2% de probabilidad por frame
-            tipo = random.choice([TipoObjeto.COMIDA, TipoObjeto.AGUA, TipoObjeto.PRESA])
-            x, y = random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1)
-            self.objetos_entorno.append(ObjetoEntorno(x, y, tipo))
+        azar = self.flujos.regeneracion
+        if azar.random() < 0.02:  # 2% de probabilidad por frame
+            tipo = azar.choice([TipoObjeto.COMIDA, TipoObjeto.AGUA, TipoObjeto.PRESA])
+            if self.mapa is not None:
+                # Solo en las zonas de aparición del mapa
+                celda = self.mapa.celda_aparicion(azar)
+                if celda is None:
+                    return
+                x, y = celda
+            else:
+                x, y = azar.randint(0, GRID_SIZE-1), azar.randint(0, GRID_SIZE-1)
+            obj = ObjetoEntorno(x, y, tipo)
+            self.objetos_entorno.append(obj)
+            if self.campo_vision is not None:
+                self.campo_vision.agregar(obj)
+            if self.campo_olor is not None:
+                self.campo_olor.agregar(obj)
+            if self.persecucion is not None:
+                self.persecucion.agregar(obj)
+            if self.registrador is not None:
+                self.registrador.registrar_evento(TipoEvento.APARICION, obj)
+    
+    def mover_animales(self):
+        """Depredadores al azar o, con `persecucion`, depredadores que persiguen y presas que huyen"""
+        if self.persecucion is not None:
+            self.persecucion.mover(self)
+        else:
+            self.mover_depredadores()
+    
+    def mover_depredadores(self):
+        """Mueve los depredadores (comportamiento simple)"""
+        azar = self.flujos.depredadores
+        for obj in self.objetos_entorno:
+            if obj.tipo == TipoObjeto.DEPREDADOR and azar.random() < 0.3:
+                x_ant, y_ant = obj.x, obj.y
+                obj.x = max(0, min(GRID_SIZE-1, obj.x + azar.randint(-1, 1)))
+                obj.y = max(0, min(GRID_SIZE-1, obj.y + azar.randint(-1, 1)))
+                if (obj.x, obj.y) != (x_ant, y_ant):
+                    if self.campo_vision is not None:
+                        self.campo_vision.mover(obj, x_ant, y_ant)
+                    if self.campo_olor is not None:
+                        self.campo_olor.mover(obj, x_ant, y_ant)
+                    if self.registrador is not None:
+                        self.registrador.registrar_evento(TipoEvento.MOVIMIENTO, obj, x_ant, y_ant)
     
     def dibujar_grilla(self):
         """Dibuja la grilla del juego"""
@@ -585,7 +1136,11 @@ class SimulacionGato:
             self.screen.blit(text, (panel_x + 10, y_offset))
             y_offset += 20
         
-        # Controles
+        # Controles (las vistas sin capas de calor no las anuncian)
+        if self.capas:
+            capas = " ".join(capa.nombre[:4] if capa.visible else "-" for capa in self.capas)
+            text = self.small_font.render(f"1-{len(self.capas)}: Capas [{capas}]", True, WHITE)
+            self.screen.blit(text, (panel_x + 10, WINDOW_HEIGHT - 190))
         y_offset = WINDOW_HEIGHT - 40
         controls = self.small_font.render("ESPACIO: Pausar | R: Reiniciar | ESC: Salir", 
                                          True, WHITE)
@@ -612,67 +1167,243 @@ class SimulacionGato:
             self.screen.blit(text, (x_offset + 20, leyenda_y))
             x_offset += 120
     
-    def manejar_eventos(self):
-        """Maneja los eventos del usuario"""
-        for event in pygame.event.get():
+    def manejar_eventos(self, eventos=None):
+        """Maneja los eventos del usuario (los pendientes, o la lista `eventos`)"""
+        for event in pygame.event.get() if eventos is None else eventos:
+            # Salvo el movimiento del ratón, cualquier evento (teclas, ventana expuesta o
+            # redimensionada) puede cambiar lo que se ve
+            if event.type != pygame.MOUSEMOTION:
+                self.sucio = True
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
-                    self.paused = not self.paused
+                    self.aplicar_comando("pausa")
                 elif event.key == pygame.K_r:
-                    self.reiniciar()
+                    self.aplicar_comando("reiniciar")
                 elif event.key == pygame.K_ESCAPE:
-                    self.running = False
+                    self.aplicar_comando("salir")
+                else:
+                    for capa in self.capas:
+                        if event.key == capa.tecla:
+                            self.aplicar_comando("capa", capa.nombre)
     
-    def reiniciar(self):
-        """Reinicia la simulación"""
-        self.gato = AgenteGato(GRID_SIZE//2, GRID_SIZE//2)
-        self.generar_entorno()
+    def aplicar_comando(self, comando, argumento=None):
+        """Aplica un comando de control (teclado o telemetría)"""
+        self.sucio = True
+        if comando == "pausa":
+            self.paused = not self.paused
+        elif comando == "reanudar":
+            self.paused = False
+        elif comando == "reiniciar":
+            self.reiniciar()
+        elif comando == "velocidad":
+            try:
+                self.fps = max(1, min(1000, int(argumento)))
+            except (TypeError, ValueError):
+                pass
+        elif comando == "salir":
+            self.running = False
+        elif comando == "capa":
+            for capa in self.capas:
+                if capa.nombre == argumento:
+                    capa.visible = not capa.visible
+    
+    def atender_telemetria(self):
+        """Aplica los comandos remotos pendientes y publica el estado actual"""
+        for comando, argumento in self.telemetria.comandos_pendientes():
+            self.aplicar_comando(comando, argumento)
+        self.telemetria.publicar(self)
+    
+    def reiniciar(self, semilla=None):
+        """Reinicia la simulación (con `semilla`, en ese mundo inicial del escenario)"""
+        self.gato = self.crear_gato()
+        self.generar_entorno(semilla)
         self.tiempo_simulacion = 0
+        if self.registrador is not None:
+            self.registrador.registrar_entorno(self)
+        if self.metricas is not None:
+            self.metricas.nueva_corrida()
+        if self.publicador is not None:
+            self.publicador.publicar(self)
+    
+    def paso(self, percibir=True):
+        """Avanza la simulación un tick"""
+        # Actualizar agente
+        self.gato.actualizar(self.objetos_entorno, percibir)
+        
+        # Con mapa, la vista sigue al gato
+        if self.mapa is not None:
+            self.mapa.seguir(self)
+        
+        # Regenerar recursos ocasionalmente
+        self.regenerar_recursos()
+        
+        # Mover depredadores (y presas)
+        self.mover_animales()
+        
+        # Difundir el olor
+        if self.campo_olor is not None:
+            self.campo_olor.avanzar()
+        
+        if self.registrador is not None:
+            self.registrador.registrar(self)
+        if self.metricas is not None:
+            self.metricas.registrar(self)
+        
+        self.tiempo_simulacion += 1
+        if self.publicador is not None:
+            self.publicador.publicar(self)
+    
+    def avanzar_rapido(self, max_ticks):
+        """Salta en un solo paso un tramo sin eventos del gato; devuelve los ticks avanzados
+        
+        Las necesidades se calculan en forma cerrada (AgenteGato.trayectoria_estable); el
+        mundo (regeneración, depredadores, presas y olor) se sigue avanzando tick a tick con los mismos
+        sorteos, y el salto se corta en cuanto algo entra en el alcance de los sensores.
+        Si el gato no está en un tramo estable se da un paso normal.
+        """
+        gato = self.gato
+        gato.percibir_entorno(self.objetos_entorno)
+        tramo = gato.trayectoria_estable(max_ticks) if max_ticks > 1 else None
+        # El último tick del tramo se da con paso() para no depender del redondeo en el umbral
+        if tramo is None or tramo[1] < 2:
+            self.paso(percibir=False)
+            return 1
+        estado, n, trayectoria = tramo
+        n -= 1
+        
+        alcance = max(gato.rango_vision, gato.rango_olfato, gato.rango_auditivo) ** 2
+        persecucion = self.persecucion
+        depredadores = [] if persecucion is not None else [
+            obj for obj in self.objetos_entorno if obj.tipo == TipoObjeto.DEPREDADOR and obj.activo]
+        registrar = self.registrador is not None or self.metricas is not None
+        # Cazando, el tramo también termina cuando al gato le llega un rastro de comida
+        olor = self.campo_olor if estado == EstadoMental.CAZANDO else None
+        k = 0
+        while k < n:
+            k += 1
+            cantidad = len(self.objetos_entorno)
+            self.regenerar_recursos()
+            self.mover_animales()
+            if self.campo_olor is not None:
+                self.campo_olor.avanzar()
+            if registrar:
+                gato.cargar_necesidades(trayectoria, k)
+                gato.estado = estado
+                if self.registrador is not None:
+                    self.registrador.registrar(self)
+                if self.metricas is not None:
+                    self.metricas.registrar(self)
+            self.tiempo_simulacion += 1
+            
+            nuevos = self.objetos_entorno[cantidad:]
+            if any((obj.x - gato.x)**2 + (obj.y - gato.y)**2 <= alcance
+                   for obj in depredadores + nuevos):
+                break
+            # Con persecución también se mueven las presas: basta que un móvil entre, salga
+            # o se mueva dentro del alcance
+            if persecucion is not None and persecucion.movio_cerca(gato.x, gato.y, alcance):
+                break
+            if (olor is not None and trayectoria["hambre"][k - 1] > gato.umbrales.hambre_caza
+                    and olor.direccion(gato.x, gato.y) is not None):
+                break
+        
+        gato.aplicar_trayectoria(estado, trayectoria, k)
+        if self.publicador is not None:
+            self.publicador.publicar(self)
+        return k
+    
+    def ejecutar_sin_pantalla(self, ticks, avance_rapido=False):
+        """Avanza la simulación sin dibujar (corridas largas)"""
+        if avance_rapido and self.telemetria is None:
+            restantes = ticks
+            while restantes > 0:
+                restantes -= self.avanzar_rapido(min(restantes, 4096))
+            return
+        for _ in range(ticks):
+            if self.telemetria is not None:
+                self.atender_telemetria()
+                while self.paused and self.running:
+                    time.sleep(0.05)
+                    self.atender_telemetria()
+                if not self.running:
+                    break
+            self.paso()
+    
+    def dibujar(self):
+        """Dibuja la grilla, los objetos, el gato, el panel y la leyenda"""
+        self.screen.fill(BLACK)
+        self.dibujar_grilla()
+        
+        # Capas de calor activas (debajo de los objetos)
+        for capa in self.capas:
+            if capa.visible:
+                capa.dibujar(self.screen, self.gato)
+        
+        # Dibujar objetos del entorno
+        dibujar_objetos(self.screen, self.objetos_entorno)
+        
+        # Dibujar agente (el gato)
+        self.gato.dibujar(self.screen, 0)
+        
+        # Dibujar panel de información
+        self.dibujar_panel_info()
+        
+        # Dibujar leyenda
+        self.dibujar_leyenda()
+    
+    def esperar_eventos(self, espera):
+        """Bloquea hasta `espera` segundos o hasta el primer evento; devuelve los eventos"""
+        eventos = []
+        milisegundos = int(espera * 1000)
+        # pygame.event.wait(0) esperaría sin límite
+        if milisegundos > 0:
+            evento = pygame.event.wait(milisegundos)
+            if evento.type != pygame.NOEVENT:
+                eventos.append(evento)
+        eventos.extend(pygame.event.get())
+        return eventos
     
     def ejecutar(self):
-        """Bucle principal de la simulación"""
+        """Bucle principal de la simulación
+        
+        La entrada se atiende en cuanto llega: entre ticks el bucle queda bloqueado en
+        pygame.event.wait hasta el próximo tick (cada 1/fps s) o el primer evento. La
+        pantalla se redibuja solo si algo cambió (un tick, un comando, la ventana). En
+        pausa no hay ticks y la espera dura ESPERA_PAUSA segundos (el intervalo de la
+        telemetría si la hay, para atender sus comandos), así que el proceso casi no usa
+        CPU.
+        """
+        proximo_tick = time.perf_counter()
         while self.running:
-            self.manejar_eventos()
-            
-            if not self.paused:
-                # Actualizar agente
-                self.gato.actualizar(self.objetos_entorno)
-                
-                # Regenerar recursos ocasionalmente
-                self.regenerar_recursos()
-                
-                # Mover depredador (comportamiento simple)
-                for obj in self.objetos_entorno:
-                    if obj.tipo == TipoObjeto.DEPREDADOR and random.random() < 0.3:
-                        obj.x = max(0, min(GRID_SIZE-1, obj.x + random.randint(-1, 1)))
-                        obj.y = max(0, min(GRID_SIZE-1, obj.y + random.randint(-1, 1)))
-                
-                self.tiempo_simulacion += 1
-            
-            # Dibujar todo
-            self.screen.fill(BLACK)
-            self.dibujar_grilla()
-            
-            # Dibujar objetos del entorno
-            for obj in self.objetos_entorno:
-                obj.dibujar(self.screen, 0)
-            
-            # Dibujar agente (el gato)
-            self.gato.dibujar(self.screen, 0)
-            
-            # Dibujar panel de información
-            self.dibujar_panel_info()
-            
-            # Dibujar leyenda
-            self.dibujar_leyenda()
+            if self.paused:
+                espera = ESPERA_PAUSA
+                if self.telemetria is not None:
+                    espera = min(espera, self.telemetria.intervalo)
+            else:
+                espera = proximo_tick - time.perf_counter()
+            self.manejar_eventos(self.esperar_eventos(espera))
+            if self.telemetria is not None:
+                self.atender_telemetria()
+            if not self.running:
+                break
             
-            # Actualizar pantalla
-            pygame.display.flip()
+            ahora = time.perf_counter()
+            if self.paused:
+                proximo_tick = ahora
+            elif ahora >= proximo_tick:
+                self.paso()
+                self.sucio = True
+                # Si el tick se atrasó más de un período no se intenta recuperar
+                periodo = 1 / self.fps
+                proximo_tick = max(proximo_tick + periodo, ahora - periodo)
             
-            # Controlar FPS
-            self.clock.tick(10)  # 10 FPS para que sea fluido pero no muy rápido
+            if self.sucio:
+                self.dibujar()
+                pygame.display.flip()
+                self.sucio = False
+
 if __name__ == "__main__":
     simulacion = SimulacionGato()
     simulacion.ejecutar()
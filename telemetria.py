@@ -0,0 +1,156 @@
+import asyncio
+import json
+import math
+import queue
+import threading
+import time
+from collections import Counter
+
+# Comandos aceptados (equivalentes a las teclas de manejar_eventos)
+COMANDOS = {"pausa", "reanudar", "reiniciar", "velocidad", "salir", "capa"}
+
+
+def instantanea_telemetria(sim):
+    """Resumen serializable del gato y del mundo"""
+    gato = sim.gato
+    percibidos = [
+        {"tipo": obj.tipo.value, "x": obj.x, "y": obj.y,
+         "distancia": round(math.sqrt((obj.x - gato.x)**2 + (obj.y - gato.y)**2), 2)}
+        for obj in gato.objetos_percibidos
+    ]
+    conteos = Counter(obj.tipo.value for obj in sim.objetos_entorno if obj.activo)
+    return {
+        "tick": sim.tiempo_simulacion,
+        "pausado": sim.paused,
+        "fps": sim.fps,
+        "estado": gato.estado.value,
+        "posicion": [gato.x, gato.y],
+        "necesidades": {
+            "energia": gato.energia,
+            "hambre": gato.hambre,
+            "sed": gato.sed,
+            "estres": gato.estres,
+            "comodidad": gato.comodidad,
+            "supervivencia": gato.supervivencia,
+        },
+        "percibidos": percibidos,
+        "objetos": dict(conteos),
+    }
+
+
+class ServidorTelemetria:
+    """Servidor TCP local (líneas JSON) que corre en su propio hilo y bucle asyncio
+
+    Cada cliente recibe instantáneas a través de una cola acotada: si no la consume a
+    tiempo se descarta la instantánea más vieja, por lo que un cliente lento nunca frena
+    la simulación. Los clientes envían comandos de una línea (``pausa``, ``reanudar``,
+    ``reiniciar``, ``velocidad <fps>``, ``capa <nombre>``, ``salir``) que la simulación aplica entre ticks.
+    """
+
+    def __init__(self, host="127.0.0.1", puerto=8765, tamano_cola=8, intervalo=0.1):
+        self.host = host
+        self.puerto = puerto
+        self.tamano_cola = tamano_cola
+        self.intervalo = intervalo
+        self.comandos = queue.SimpleQueue()
+        self._clientes = set()
+        self._loop = None
+        self._servidor = None
+        self._hilo = None
+        self._listo = threading.Event()
+        self._ultima_publicacion = 0.0
+
+    def iniciar(self):
+        self._hilo = threading.Thread(target=self._correr, name="telemetria", daemon=True)
+        self._hilo.start()
+        self._listo.wait()
+        return self
+
+    def detener(self):
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._hilo.join()
+        self._loop = None
+
+    def _correr(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._servidor = self._loop.run_until_complete(
+            asyncio.start_server(self._atender_cliente, self.host, self.puerto))
+        # Con puerto=0 el sistema asigna uno libre
+        self.puerto = self._servidor.sockets[0].getsockname()[1]
+        self._listo.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._servidor.close()
+            self._loop.run_until_complete(self._servidor.wait_closed())
+            for tarea in asyncio.all_tasks(self._loop):
+                tarea.cancel()
+            self._loop.run_until_complete(asyncio.sleep(0))
+            self._loop.close()
+
+    async def _atender_cliente(self, reader, writer):
+        cola = asyncio.Queue(maxsize=self.tamano_cola)
+        self._clientes.add(cola)
+        envio = asyncio.ensure_future(self._enviar(cola, writer))
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                self._recibir_comando(linea.decode("utf-8", "replace"))
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._clientes.discard(cola)
+            envio.cancel()
+            writer.close()
+
+    async def _enviar(self, cola, writer):
+        try:
+            while True:
+                datos = await cola.get()
+                writer.write(datos)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    def _recibir_comando(self, linea):
+        partes = linea.strip().split()
+        if not partes or partes[0] not in COMANDOS:
+            return
+        argumento = partes[1] if len(partes) > 1 else None
+        self.comandos.put((partes[0], argumento))
+
+    def _difundir(self, datos):
+        """Corre en el bucle del servidor: encola sin bloquear en cada cliente"""
+        for cola in self._clientes:
+            if cola.full():
+                cola.get_nowait()
+            cola.put_nowait(datos)
+
+    @property
+    def hay_clientes(self):
+        return bool(self._clientes)
+
+    def publicar(self, sim):
+        """Publica una instantánea (como mucho una cada `intervalo` segundos)"""
+        if not self._clientes or self._loop is None:
+            return
+        ahora = time.monotonic()
+        if ahora - self._ultima_publicacion < self.intervalo:
+            return
+        self._ultima_publicacion = ahora
+        datos = (json.dumps(instantanea_telemetria(sim), ensure_ascii=False) + "\n").encode("utf-8")
+        self._loop.call_soon_threadsafe(self._difundir, datos)
+
+    def comandos_pendientes(self):
+        """Vacía la cola de comandos recibidos (llamado desde el hilo de la simulación)"""
+        pendientes = []
+        while True:
+            try:
+                pendientes.append(self.comandos.get_nowait())
+            except queue.Empty:
+                return pendientes